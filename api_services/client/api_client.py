@@ -0,0 +1,369 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+import requests
+from urllib3.exceptions import MaxRetryError, TimeoutError as Urllib3TimeoutError
+from urllib3.util.retry import Retry
+from api_services.client.cassette import Cassette, CassetteMode
+from api_services.client.compression import (CompressionSettings, MeteredHTTPAdapter, TimedMeteredHTTPAdapter,
+                                             TransferRecorder)
+from api_services.client.fingerprint import request_fingerprint
+from api_services.client.rate_limiter import RateLimitedRetry, RateLimiter
+from api_services.client.request_log import RequestLog
+from api_services.client.response_cache import ResponseCache
+from api_services.client.single_flight import SingleFlight
+from api_services.client.tail_latency import TailLatencyPolicy
+from api_services.client.timing import TimingRecorder, adopt_timing
+
+if TYPE_CHECKING:
+    # Built by the caller when the cache is shared between processes: sqlite3 is only imported then
+    from api_services.client.shared_cache import SharedResponseCache
+
+
+@dataclass
+class PoolSettings:
+    """
+    A data class to hold the connection pool, keep-alive and retry settings
+    of the APIClient transport.
+    """
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    keep_alive: bool = True
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds the settings from a config.ini section, falling back to the defaults for missing keys.
+
+        :param config: The config.ini section of the target environment.
+        """
+        return cls(
+            pool_connections=config.getint('pool_connections', fallback=cls.pool_connections),
+            pool_maxsize=config.getint('pool_maxsize', fallback=cls.pool_maxsize),
+            keep_alive=config.getboolean('keep_alive', fallback=cls.keep_alive),
+            max_retries=config.getint('max_retries', fallback=cls.max_retries),
+            backoff_factor=config.getfloat('backoff_factor', fallback=cls.backoff_factor),
+        )
+
+
+class APIClient:
+    """Responsible for making requests to the API, handling URL construction."""
+
+    # Transient statuses that are safe to retry for idempotent GET requests
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, base_url, api_version, access_key, pool_settings: PoolSettings | None = None,
+                 cache: ResponseCache | None = None, cassette: Cassette | None = None,
+                 rate_limiter: RateLimiter | None = None, timings: TimingRecorder | None = None,
+                 single_flight: SingleFlight | None = None, shared_cache: "SharedResponseCache | None" = None,
+                 tail_latency: TailLatencyPolicy | None = None, compression: CompressionSettings | None = None,
+                 transfers: TransferRecorder | None = None, request_log: RequestLog | None = None,
+                 log_requests: bool = True):
+        """
+        Initializes the APIClient.
+
+        :param base_url: The base URL for the API (e.g., https://api.marketstack.com).
+        :param api_version: The version of the API to use (e.g., /v1/).
+        :param access_key: The API access key for authentication.
+        :param pool_settings: Connection pool, keep-alive and retry settings (defaults are used if omitted).
+        :param cache: Optional cache for successful responses. Caching is disabled if omitted.
+        :param cassette: Optional cassette to record responses to, or to replay them from without network access.
+        :param rate_limiter: Optional rate limiter and quota budget applied to the requests sent to the API.
+        :param timings: Optional recorder of the DNS/connect/TLS/TTFB/download phases of the requests sent to the API.
+        :param single_flight: Optional deduplication of identical requests in flight (not applied to streamed ones).
+        :param shared_cache: Optional cache of successful responses shared with the other pytest-xdist workers,
+            where only one worker fetches a given response (consulted after the in-process cache).
+        :param tail_latency: Optional policy setting the timeout of every request from the observed response times
+            of its endpoint, and hedging slow (non-streamed) requests with a duplicate if enabled.
+            Requests have no timeout if omitted.
+        :param compression: Optional content encodings to accept (requests' default Accept-Encoding if omitted).
+        :param transfers: Optional recorder of the body bytes of the responses, on the wire and decoded.
+        :param request_log: Optional log of the requests made by every test (cached ones included).
+        :param log_requests: Whether to print the URL of every request (disabled e.g. for load tests).
+        """
+        self.base_url = base_url
+        self.api_version = api_version
+        self.access_key = access_key
+        self.pool_settings = pool_settings or PoolSettings()
+        self.cache = cache
+        self.cassette = cassette
+        self.rate_limiter = rate_limiter
+        self.timings = timings
+        self.single_flight = single_flight
+        self.shared_cache = shared_cache
+        self.tail_latency = tail_latency
+        self.compression = compression
+        self.transfers = transfers
+        self.request_log = request_log
+        self.log_requests = log_requests
+        self.session = self._create_session()
+        # Sends the requests that may be hedged, so the caller can send a duplicate while the first one is pending
+        self._hedge_executor = None
+        if tail_latency is not None and tail_latency.settings.hedge_enabled:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=2 * self.pool_settings.pool_maxsize,
+                                                      thread_name_prefix="api-client-hedge")
+        self._final_pool_stats = None
+
+    def _create_session(self):
+        """Creates a requests.Session whose connections are pooled and reused between calls."""
+        settings = self.pool_settings
+        retry_options = dict(
+            total=settings.max_retries,
+            backoff_factor=settings.backoff_factor,
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        if self.rate_limiter is not None:
+            # Every retry reaches the API, so it is throttled and counted in the budget like the first attempt
+            retry = RateLimitedRetry(**retry_options, rate_limiter=self.rate_limiter,
+                                     path_prefix=urlsplit(self.base_url).path.rstrip("/") + self.api_version)
+        else:
+            retry = Retry(**retry_options)
+        adapter_class = TimedMeteredHTTPAdapter if self.timings is not None else MeteredHTTPAdapter
+        adapter = adapter_class(
+            pool_connections=settings.pool_connections,
+            pool_maxsize=settings.pool_maxsize,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not settings.keep_alive:
+            session.headers['Connection'] = 'close'
+        if self.compression is not None:
+            session.headers['Accept-Encoding'] = self.compression.accept_encoding()
+        return session
+
+    def get(self, endpoint, params=None, stream=False):
+        """
+        Makes a GET request. The access_key is added automatically.
+        If a cache is configured, a still valid cached response is returned instead of calling the API.
+        In cassette replay mode the response is served from the cassette, otherwise it is recorded if requested.
+        With single-flight, a request identical to one in flight waits for it and gets the same response object.
+
+        :param endpoint: The API endpoint (e.g., /eod).
+        :param params: A dictionary of query parameters.
+        :param stream: Whether to return as soon as the headers are received, leaving the body to be read from the
+            response (e.g., with iter_content). Streamed responses are not cached; recording reads the whole body.
+        :return: The response object from requests.
+        """
+        if params is None:
+            params = {}
+
+        url = f"{self.base_url}{self.api_version}{endpoint}"
+        if self.request_log is not None:
+            self.request_log.record(endpoint, params, stream)
+        if self.cache is not None:
+            cached_response = self.cache.get(endpoint, params)
+            if cached_response is not None:
+                self._log("Request URL (cached):", url)
+                return cached_response
+
+        if self.single_flight is not None and not stream:
+            # Identical requests already in flight share its response (or error) instead of calling the API again
+            return self.single_flight.do(request_fingerprint(endpoint, params),
+                                         lambda: self._fetch(endpoint, params, url, stream))
+        return self._fetch(endpoint, params, url, stream)
+
+    def _fetch(self, endpoint, params, url, stream):
+        """Gets the response through the shared cache if configured, and stores it in the response cache."""
+        if self.shared_cache is not None and not stream:
+            with self.shared_cache.fetch_lock(endpoint, params):
+                # Another worker may have fetched the response while this one was waiting for the lock
+                response = self.shared_cache.get(endpoint, params)
+                if response is not None:
+                    self._log("Request URL (shared cache):", url)
+                    # Recorded by the worker that fetched it too: the cassette then has every response this worker used
+                    if self.cassette is not None and self.cassette.mode == CassetteMode.RECORD:
+                        self.cassette.record(endpoint, params, response)
+                else:
+                    response = self._send(endpoint, params, url, stream)
+                    if response.ok:
+                        self.shared_cache.put(endpoint, params, response, url)
+        else:
+            response = self._send(endpoint, params, url, stream)
+
+        if self.cache is not None and response.ok and not stream:
+            self.cache.put(endpoint, params, response)
+        return response
+
+    def _send(self, endpoint, params, url, stream):
+        """Gets the response from the cassette or the API (recording it as configured)."""
+        if self.cassette is not None and self.cassette.mode == CassetteMode.REPLAY:
+            self._log("Request URL (replayed):", url)
+            response = self.cassette.replay(endpoint, params, url)
+        else:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+
+            # Automatically add the access key to every request
+            params['access_key'] = self.access_key
+
+            self._log("Request URL:", url)
+            response = self._get_from_api(endpoint, url, params, stream)
+            if self.cassette is not None:
+                self.cassette.record(endpoint, params, response)
+        return response
+
+    def _get_from_api(self, endpoint, url, params, stream):
+        """Sends the request with the timeout of the tail latency policy, hedging it if it is slower than usual."""
+        if self.tail_latency is None:
+            return self._timed_get(endpoint, url, params, stream, None)
+
+        timeout = self.tail_latency.timeout_for(endpoint)
+        hedge_delay = None if stream else self.tail_latency.hedge_delay(endpoint)
+        if hedge_delay is None:
+            return self._timed_get(endpoint, url, params, stream, timeout)
+
+        primary = self._hedge_executor.submit(self._timed_get, endpoint, url, dict(params), stream, timeout)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done or not self.tail_latency.try_fire_hedge():
+            response = primary.result()
+        else:
+            self._log("Request URL (hedged):", url)
+            hedge = self._hedge_executor.submit(self._send_hedge, endpoint, url, dict(params), timeout)
+            response = self._first_response(primary, hedge)
+        # The request was timed in an executor thread: the deserialize phase is timed in this one
+        adopt_timing(response)
+        return response
+
+    def _send_hedge(self, endpoint, url, params, timeout):
+        """Sends the duplicate of a slow request (it counts against the rate limit like any request)."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(endpoint)
+        return self._timed_get(endpoint, url, params, False, timeout)
+
+    def _first_response(self, primary, hedge):
+        """
+        Returns the first response of the request and its hedge (or raises the error of the last one to fail).
+        The response arriving second is closed, to release its connection.
+        """
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            # The original request wins a tie
+            for future in sorted(done, key=lambda future: future is not primary):
+                if future.exception() is None:
+                    if future is hedge:
+                        self.tail_latency.record_hedge_won()
+                    for loser in pending:
+                        loser.add_done_callback(self._close_response)
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    @staticmethod
+    def _close_response(future):
+        """Closes the response of a finished request whose result is not used."""
+        if future.exception() is None:
+            future.result().close()
+
+    def _timed_get(self, endpoint, url, params, stream, timeout):
+        """Sends the request, recording its phases and its response time (or timeout) if configured."""
+        started = self.timings.start() if self.timings is not None else None
+        try:
+            response = self.session.get(url, params=params, stream=stream, timeout=timeout)
+        except requests.RequestException as error:
+            if self.tail_latency is not None and self._is_timeout(error):
+                self.tail_latency.record_timeout()
+            raise
+        if self.tail_latency is not None:
+            self.tail_latency.observe(endpoint, response.elapsed.total_seconds())
+        if self.timings is not None:
+            self.timings.record(endpoint, response, started, stream=stream)
+        if self.transfers is not None:
+            self.transfers.record(endpoint, response)
+        return response
+
+    @staticmethod
+    def _is_timeout(error) -> bool:
+        """Returns whether a request failed by timing out (requests reports it as a ConnectionError after retries)."""
+        if isinstance(error, requests.Timeout):
+            return True
+        reason = error.args[0] if error.args else None
+        return isinstance(reason, MaxRetryError) and isinstance(reason.reason, Urllib3TimeoutError)
+
+    def _log(self, *values):
+        """Prints the values if request logging is enabled."""
+        if self.log_requests:
+            print(*values)
+
+    def pool_stats(self) -> dict:
+        """
+        Returns how many connections were opened and how many requests reused an already open connection.
+        """
+        if self._final_pool_stats is not None:
+            return dict(self._final_pool_stats)
+
+        opened = sent = 0
+        for adapter in set(self.session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools[key]
+                opened += pool.num_connections
+                sent += pool.num_requests
+        return {
+            "connections_opened": opened,
+            "requests_sent": sent,
+            "connections_reused": max(sent - opened, 0),
+        }
+
+    def summary_lines(self) -> list[str]:
+        """Returns human-readable lines describing the client activity, used in the pytest terminal summary."""
+        stats = self.pool_stats()
+        lines = [
+            f"Connection pool: {stats['requests_sent']} requests, "
+            f"{stats['connections_opened']} connections opened, {stats['connections_reused']} reused",
+        ]
+        if self.cache is not None:
+            cache_stats = self.cache.stats()
+            lines.append(f"Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                         f"{cache_stats['evictions']} evictions")
+        if self.shared_cache is not None:
+            shared_stats = self.shared_cache.stats()
+            lines.append(f"Shared cache: {shared_stats['hits']} hits, {shared_stats['misses']} misses, "
+                         f"{shared_stats['stores']} stored, {shared_stats['lock_waits']} waited for another worker")
+        if self.cassette is not None:
+            cassette_stats = self.cassette.stats()
+            lines.append(f"Cassette ({self.cassette.mode.value}): {cassette_stats['recorded']} recorded, "
+                         f"{cassette_stats['replayed']} replayed, {cassette_stats['misses']} misses")
+        if self.rate_limiter is not None:
+            limiter_stats = self.rate_limiter.stats()
+            budget = limiter_stats['request_budget'] or "unlimited"
+            lines.append(f"Rate limiter: {limiter_stats['requests']} requests, {limiter_stats['waits']} throttled, "
+                         f"{limiter_stats['wait_seconds']:.2f}s waiting (max {limiter_stats['max_wait_seconds']:.2f}s), "
+                         f"quota used {limiter_stats['quota_used']:g} of {budget}")
+            if self.rate_limiter.usage_path is not None:
+                monthly_quota = limiter_stats['monthly_quota'] or "unlimited"
+                lines.append(f"Monthly quota: {limiter_stats['monthly_used']:g} of {monthly_quota} used "
+                             f"(after the last request of this worker)")
+        if self.single_flight is not None:
+            flight_stats = self.single_flight.stats()
+            lines.append(f"Single-flight: {flight_stats['calls']} requests, "
+                         f"{flight_stats['shared']} shared an identical in-flight request (calls saved)")
+        if self.tail_latency is not None:
+            lines.extend(self.tail_latency.summary_lines())
+        if self.transfers is not None:
+            lines.extend(self.transfers.summary_lines())
+        if self.timings is not None:
+            lines.extend(self.timings.summary_lines())
+        return lines
+
+    def close(self):
+        """Closes all pooled connections (and the cassette). Pool stats remain available after closing."""
+        if self._final_pool_stats is None:
+            self._final_pool_stats = self.pool_stats()
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=True)
+            self.session.close()
+            if self.cassette is not None:
+                self.cassette.close()
+            if self.rate_limiter is not None:
+                self.rate_limiter.close()
+            if self.shared_cache is not None:
+                self.shared_cache.close()
@@ -0,0 +1,76 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from api_services.client.fingerprint import request_fingerprint
+
+
+class AsyncAPIClient:
+    """
+    Asyncio-based counterpart of APIClient, used to fan out many requests at once.
+
+    Requests are delegated to the wrapped APIClient on a bounded worker pool, so they share its connection pool
+    and settings, while at most `max_concurrency` of them are in flight at the same time.
+    """
+
+    def __init__(self, api_client, max_concurrency: int = 10):
+        """
+        Initializes the AsyncAPIClient.
+
+        :param api_client: Instance of APIClient that performs the actual HTTP requests.
+        :param max_concurrency: Maximum number of requests in flight at the same time.
+        """
+        self.api_client = api_client
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="async-api-client")
+        # (event loop, request fingerprint) -> future of the request in flight
+        self._in_flight = {}
+
+    async def get(self, endpoint, params=None):
+        """
+        Makes a GET request without blocking the event loop. The access_key is added automatically.
+        If the APIClient has single-flight enabled, a request identical to one in flight on the same event loop awaits
+        it instead of taking a worker (so duplicates never count against max_concurrency).
+
+        :param endpoint: The API endpoint (e.g., /eod).
+        :param params: A dictionary of query parameters.
+        :return: The response object from requests.
+        """
+        single_flight = self.api_client.single_flight
+        if single_flight is None:
+            return await self.call(self.api_client.get, endpoint, params)
+
+        key = (asyncio.get_running_loop(), request_fingerprint(endpoint, params))
+        future = self._in_flight.get(key)
+        if future is None:
+            future = self._in_flight[key] = asyncio.ensure_future(self.call(self.api_client.get, endpoint, params))
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            single_flight.record_shared()
+        # A cancelled waiter must not cancel the request shared with the others
+        return await asyncio.shield(future)
+
+    async def call(self, function, *args):
+        """
+        Runs a blocking function (e.g., a controller call built on the APIClient) on the worker pool,
+        without blocking the event loop.
+
+        :return: The result of the function.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(function, *args))
+
+    def run_concurrently(self, *coroutines) -> list:
+        """
+        Runs the given request coroutines concurrently and waits for all of them.
+
+        :param coroutines: Coroutines created by this client (or an async controller using it).
+        :return: The results in the same order as the coroutines were given.
+        """
+        async def gather():
+            return await asyncio.gather(*coroutines)
+
+        return asyncio.run(gather())
+
+    def close(self):
+        """Waits for the in-flight requests and releases the worker pool."""
+        self._executor.shutdown(wait=True)
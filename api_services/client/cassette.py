@@ -0,0 +1,182 @@
+import json
+import mmap
+import os
+import shutil
+import threading
+from enum import Enum
+from pathlib import Path
+from api_services.client.fingerprint import request_fingerprint
+from api_services.client.stored_response import build_response, stored_headers
+
+
+class CassetteMode(Enum):
+    LIVE = "live"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request was never recorded in the cassette."""
+
+
+class Cassette:
+    """
+    On-disk store of recorded responses, indexed by request fingerprint.
+
+    The store is a directory with two files:
+    - `responses.bin`: the response bodies, appended one after another.
+    - `index.json`: fingerprint -> offset/length of the body, status code, headers, etc.
+
+    In record mode, bodies are appended as responses arrive and the index is written on close().
+    In replay mode, the body file is memory-mapped on first use, so only the bodies actually requested are read.
+
+    Processes recording at the same time (pytest-xdist workers) must not share these files: each one records a part
+    (`parts/<name>.bin` and `parts/<name>.json`), and merge_parts() then assembles the parts into the cassette.
+    """
+
+    BODY_FILE = "responses.bin"
+    INDEX_FILE = "index.json"
+    PARTS_DIR = "parts"
+
+    def __init__(self, path, mode: CassetteMode, part: str | None = None):
+        """
+        Initializes the Cassette.
+
+        :param path: Directory of the cassette store.
+        :param mode: CassetteMode.RECORD to write a new cassette or CassetteMode.REPLAY to serve from it.
+        :param part: In record mode, the name of the part to record instead of the cassette itself
+            (e.g., 'gw0' for a pytest-xdist worker), to merge with merge_parts().
+        """
+        self.path = Path(path)
+        self.mode = mode
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._index = {}
+        self._lock = threading.Lock()
+        self._body_file = None
+        self._mmap = None
+
+        if part is None:
+            self._body_path, self._index_path = self.path / self.BODY_FILE, self.path / self.INDEX_FILE
+        else:
+            self._body_path = self.path / self.PARTS_DIR / f"{part}.bin"
+            self._index_path = self._body_path.with_suffix(".json")
+
+        if mode == CassetteMode.RECORD:
+            self._body_path.parent.mkdir(parents=True, exist_ok=True)
+            self._body_file = open(self._body_path, "wb")
+        elif mode == CassetteMode.REPLAY:
+            index_path = self.path / self.INDEX_FILE
+            if not index_path.exists():
+                raise FileNotFoundError(
+                    f"No cassette found at: {self.path}. Record one first with --cassette-mode=record.")
+            self._index = json.loads(index_path.read_text())
+        else:
+            raise ValueError(f"A cassette can only be opened in record or replay mode, not '{mode.value}'.")
+
+    def record(self, endpoint, params, response):
+        """
+        Appends the response body to the store and indexes it under the request fingerprint.
+        """
+        body = response.content
+        entry = {
+            "status_code": response.status_code,
+            "reason": response.reason,
+            "encoding": response.encoding,
+            "headers": stored_headers(response),
+            "length": len(body),
+        }
+        with self._lock:
+            entry["offset"] = self._body_file.tell()
+            self._body_file.write(body)
+            self._index[request_fingerprint(endpoint, params)] = entry
+            self.recorded += 1
+
+    def replay(self, endpoint, params, url):
+        """
+        Returns the recorded response for the request.
+
+        :raises CassetteMissError: If the request was never recorded.
+        """
+        fingerprint = request_fingerprint(endpoint, params)
+        entry = self._index.get(fingerprint)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            raise CassetteMissError(
+                f"No recorded response for 'GET {fingerprint}' in the cassette at: {self.path}.\n"
+                f"Re-record the cassette with --cassette-mode=record against a live environment.")
+
+        with self._lock:
+            body = bytes(self._body_view()[entry["offset"]:entry["offset"] + entry["length"]])
+            self.replayed += 1
+
+        return build_response(entry["status_code"], entry["reason"], entry["encoding"], entry["headers"], url, body)
+
+    def _body_view(self):
+        """Memory-maps the body file on first use."""
+        if self._mmap is None:
+            body_path = self.path / self.BODY_FILE
+            if os.path.getsize(body_path) == 0:
+                return b""
+            with open(body_path, "rb") as body_file:
+                self._mmap = mmap.mmap(body_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def stats(self) -> dict:
+        """Returns the recorded/replayed/missed counters."""
+        return {"recorded": self.recorded, "replayed": self.replayed, "misses": self.misses}
+
+    def close(self):
+        """Writes the index of a recorded cassette, and releases the open files."""
+        with self._lock:
+            if self._body_file is not None:
+                self._body_file.close()
+                self._body_file = None
+                _write_index(self._index_path, self._index)
+            if self._mmap is not None:
+                self._mmap.close()
+                self._mmap = None
+
+    @classmethod
+    def discard_parts(cls, path):
+        """Deletes the parts left by an interrupted recording, so that merge_parts() only finds the new ones."""
+        shutil.rmtree(Path(path) / cls.PARTS_DIR, ignore_errors=True)
+
+    @classmethod
+    def merge_parts(cls, path) -> int:
+        """
+        Replaces the cassette with the recorded parts (e.g., those of the pytest-xdist workers of a run), and deletes
+        them. A request recorded by several parts keeps the response of the first part.
+
+        :param path: Directory of the cassette store.
+        :return: The number of parts merged (0 if there were none: the cassette is then left as it is).
+        """
+        path = Path(path)
+        index_paths = sorted((path / cls.PARTS_DIR).glob("*.json"))
+        if not index_paths:
+            return 0
+
+        index = {}
+        body_path = path / cls.BODY_FILE
+        tmp_body_path = body_path.with_suffix(".tmp")
+        with open(tmp_body_path, "wb") as body_file:
+            for index_path in index_paths:
+                part_body_path = index_path.with_suffix(".bin")
+                offset = body_file.tell()
+                with open(part_body_path, "rb") as part_body_file:
+                    shutil.copyfileobj(part_body_file, body_file)
+                for fingerprint, entry in json.loads(index_path.read_text()).items():
+                    index.setdefault(fingerprint, dict(entry, offset=entry["offset"] + offset))
+        os.replace(tmp_body_path, body_path)
+        _write_index(path / cls.INDEX_FILE, index)
+
+        cls.discard_parts(path)
+        return len(index_paths)
+
+
+def _write_index(index_path: Path, index: dict):
+    tmp_path = index_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(index, indent=1, sort_keys=True))
+    os.replace(tmp_path, index_path)
@@ -0,0 +1,204 @@
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+from urllib3.util.request import ACCEPT_ENCODING
+from api_services.client.timing import TimedHTTPAdapter, current_node_id
+
+# Content encodings urllib3 can decode here: gzip and deflate always, br and zstd when brotli/zstandard are installed
+SUPPORTED_ENCODINGS = tuple(encoding.strip() for encoding in ACCEPT_ENCODING.split(","))
+
+
+@dataclass
+class CompressionSettings:
+    """
+    A data class to hold the response compression settings of the APIClient.
+    """
+    enabled: bool = True
+    # Encodings to accept, by preference. Those without an installed decoder are left out; empty = all supported
+    encodings: str = "zstd, br, gzip, deflate"
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds the settings from a config.ini section, falling back to the defaults for missing keys.
+
+        :param config: The config.ini section of the target environment.
+        """
+        return cls(
+            enabled=config.getboolean('compression_enabled', fallback=cls.enabled),
+            encodings=config.get('compression_encodings', fallback=cls.encodings),
+        )
+
+    def accept_encoding(self) -> str:
+        """Returns the Accept-Encoding header to send ('identity' when compression is disabled)."""
+        if not self.enabled:
+            return "identity"
+        requested = [encoding.strip() for encoding in self.encodings.split(",") if encoding.strip()]
+        accepted = [encoding for encoding in requested or SUPPORTED_ENCODINGS if encoding in SUPPORTED_ENCODINGS]
+        # Later encodings get a lower quality value, so the server picks the first one it supports
+        return ", ".join(encoding if number == 0 else f"{encoding};q={1 - number / 10:.1f}"
+                         for number, encoding in enumerate(accepted)) or "identity"
+
+
+class MeteredHTTPResponse(HTTPResponse):
+    """
+    urllib3 response counting the body bytes received (still encoded) and decoded, and the time spent decoding.
+    Responses become metered in MeteredHTTPAdapter.build_response(), before their body is read.
+    """
+
+    def start_metering(self):
+        """Resets the counters (called once, when the response is received)."""
+        self.encoded_bytes = 0
+        self.decoded_bytes = 0
+        self.decode_seconds = 0.0
+        self._complete_callbacks = []
+        self._completed = False
+        self._released = False
+
+    def _decode(self, data, *args, **kwargs):
+        started = time.perf_counter()
+        decoded = super()._decode(data, *args, **kwargs)
+        self.decode_seconds += time.perf_counter() - started
+        self.encoded_bytes += len(data)
+        self.decoded_bytes += len(decoded)
+        return decoded
+
+    def when_complete(self, callback):
+        """Calls callback() once the body has been read (or the response closed), or now if it already has."""
+        if self._completed:
+            callback()
+        else:
+            self._complete_callbacks.append(callback)
+
+    def _complete(self):
+        if not self._completed:
+            self._completed = True
+            for callback in self._complete_callbacks:
+                callback()
+            self._complete_callbacks = []
+
+    def read(self, *args, **kwargs):
+        data = super().read(*args, **kwargs)
+        # The connection is released as soon as the end of the body is received, which may not be decoded yet
+        if self._released and not len(self._decoded_buffer) and not (
+                self._decoder and self._decoder.has_unconsumed_tail):
+            self._complete()
+        return data
+
+    def release_conn(self):
+        super().release_conn()
+        self._released = True
+
+    def close(self):
+        super().close()
+        self._complete()
+
+
+class MeteredHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose responses count their encoded and decoded body bytes (see MeteredHTTPResponse)."""
+
+    def build_response(self, req, resp):
+        # urllib3 builds the response itself, so it is metered by switching its class before the body is read
+        resp.__class__ = MeteredHTTPResponse
+        resp.start_metering()
+        return super().build_response(req, resp)
+
+
+@dataclass(slots=True)
+class TransferRecord:
+    """A data class to hold the body sizes (in bytes) and decode time (in seconds) of one API response."""
+    endpoint: str
+    node_id: str
+    encoding: str
+    encoded_bytes: int
+    decoded_bytes: int
+    decode_seconds: float
+
+
+class TransferRecorder:
+    """
+    Collects the bytes transferred by the APIClient: per response, the body size on the wire (compressed) and
+    decoded, and the time spent decompressing it, tagged with the endpoint and the node id of the running test.
+    Streamed responses are recorded once their body has been read. Cached and replayed responses are not recorded.
+    """
+
+    def __init__(self):
+        self.records: list[TransferRecord] = []
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, response):
+        """
+        Records the transfer of a response sent by the APIClient (when its body has been read, if streamed).
+
+        :param endpoint: The API endpoint (e.g., /eod).
+        :param response: The response returned by requests.
+        """
+        raw = response.raw
+        if not isinstance(raw, MeteredHTTPResponse):
+            return
+        node_id = current_node_id()
+        encoding = response.headers.get("Content-Encoding", "identity").lower()
+
+        def add_record():
+            with self._lock:
+                self.records.append(TransferRecord(endpoint, node_id, encoding, raw.encoded_bytes,
+                                                   raw.decoded_bytes, raw.decode_seconds))
+
+        raw.when_complete(add_record)
+
+    def report(self) -> dict:
+        """
+        Returns the totals per endpoint (responses, encoded and decoded bytes, compression ratio, decode ms,
+        responses per encoding) and the bytes on the wire of the tests that transferred the most.
+        """
+        with self._lock:
+            records = list(self.records)
+        groups = defaultdict(list)
+        per_test = defaultdict(int)
+        for record in records:
+            groups[record.endpoint].append(record)
+            per_test[record.node_id] += record.encoded_bytes
+
+        report = {"endpoints": {endpoint: self._totals(group) for endpoint, group in sorted(groups.items())},
+                  "total": self._totals(records)}
+        report["top_tests_encoded_bytes"] = dict(sorted(per_test.items(), key=lambda item: item[1],
+                                                        reverse=True)[:10])
+        return report
+
+    @staticmethod
+    def _totals(records) -> dict:
+        encoded = sum(record.encoded_bytes for record in records)
+        decoded = sum(record.decoded_bytes for record in records)
+        encodings = defaultdict(int)
+        for record in records:
+            encodings[record.encoding] += 1
+        return {
+            "responses": len(records),
+            "encoded_bytes": encoded,
+            "decoded_bytes": decoded,
+            "compression_ratio": round(decoded / encoded, 2) if encoded else None,
+            "decode_ms": round(sum(record.decode_seconds for record in records) * 1000, 2),
+            "encodings": dict(encodings),
+        }
+
+    def summary_lines(self) -> list[str]:
+        """Returns human-readable lines with the transfer totals, used in the pytest terminal summary."""
+        report = self.report()
+        if not report["total"]["responses"]:
+            return []
+        lines = []
+        for name, totals in [("Transfer", report["total"])] + [
+                (f"  {endpoint}", totals) for endpoint, totals in report["endpoints"].items()]:
+            encodings = ", ".join(f"{encoding} {count}" for encoding, count in totals["encodings"].items())
+            ratio = f"x{totals['compression_ratio']:g}" if totals["compression_ratio"] else "-"
+            lines.append(f"{name}: {totals['responses']} responses, {totals['encoded_bytes'] / 1024:.1f} KB on the "
+                         f"wire, {totals['decoded_bytes'] / 1024:.1f} KB decoded ({ratio}), "
+                         f"decode {totals['decode_ms']:.1f} ms [{encodings}]")
+        return lines
+
+
+class TimedMeteredHTTPAdapter(TimedHTTPAdapter, MeteredHTTPAdapter):
+    """MeteredHTTPAdapter whose connections also report their DNS/connect/TLS phases to the TimingRecorder."""
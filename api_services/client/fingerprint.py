@@ -0,0 +1,13 @@
+from urllib.parse import urlencode
+
+
+def request_fingerprint(endpoint, params=None) -> str:
+    """
+    Returns a stable key identifying a GET request, built from the endpoint and its normalized query parameters.
+    The access_key is excluded, so the key does not depend on (or leak) the credentials.
+
+    :param endpoint: The API endpoint (e.g., /eod).
+    :param params: A dictionary of query parameters (e.g., the result of EodFilters.serialize()).
+    """
+    normalized = sorted((key, str(value)) for key, value in (params or {}).items() if key != 'access_key')
+    return f"{endpoint}?{urlencode(normalized)}"
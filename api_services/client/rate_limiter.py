@@ -0,0 +1,259 @@
+import json
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlsplit
+from urllib3.util.retry import Retry
+from utils.config_values import parse_endpoint_values
+from utils.run_context import is_xdist_worker, run_id
+
+try:
+    import fcntl
+except ImportError:  # Windows: the limiter is then shared by threads only
+    fcntl = None
+
+
+@dataclass
+class RateLimitSettings:
+    """
+    A data class to hold the client-side rate limit and quota budget settings of the APIClient.
+    """
+    enabled: bool = False
+    requests_per_second: float = 5.0
+    burst: float = 5.0
+    # Maximum (weighted) number of requests for the whole run, 0 = unlimited
+    request_budget: float = 0
+    # Maximum (weighted) number of requests per calendar month (UTC) across runs, 0 = unlimited
+    monthly_quota: float = 0
+    # File counting the requests of the current month across runs, relative to the project root (empty = no count)
+    monthly_usage_path: str = ""
+    # Cost of a request per endpoint, in tokens (e.g., {"/eod": 2}). Endpoints not listed cost 1
+    endpoint_weights: dict = field(default_factory=dict)
+    # Directory of the state file shared by the processes of a run
+    state_dir: str = tempfile.gettempdir()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds the settings from a config.ini section, falling back to the defaults for missing keys.
+
+        :param config: The config.ini section of the target environment.
+        """
+        return cls(
+            enabled=config.getboolean('rate_limit_enabled', fallback=cls.enabled),
+            requests_per_second=config.getfloat('rate_limit_per_second', fallback=cls.requests_per_second),
+            burst=config.getfloat('rate_limit_burst', fallback=cls.burst),
+            request_budget=config.getfloat('request_budget', fallback=cls.request_budget),
+            monthly_quota=config.getfloat('monthly_quota', fallback=cls.monthly_quota),
+            monthly_usage_path=config.get('monthly_usage_path', fallback=cls.monthly_usage_path),
+            endpoint_weights=parse_endpoint_values(config.get('rate_limit_weights', fallback='')),
+            state_dir=config.get('rate_limit_state_dir', fallback=cls.state_dir),
+        )
+
+
+class QuotaExceededError(RuntimeError):
+    """Raised when a request would exceed the request budget of the run."""
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with a request budget for the run.
+
+    The bucket state (tokens, last refill time, quota used) lives in a small JSON file locked with fcntl.flock,
+    so it is shared by all threads (and so asyncio tasks of the AsyncAPIClient) and by all the pytest-xdist workers
+    of the run on this host. A request waits until its weight in tokens is available, and fails fast with
+    QuotaExceededError if it would exceed the request budget. A request heavier than the burst waits for a full
+    bucket and then takes its whole weight: the bucket goes negative (token debt), so the next requests wait longer.
+    The requests are also counted per calendar month (UTC) in a file kept across runs, if one is set, and a request
+    that would exceed the monthly quota fails fast too (the API plans limit the requests per month).
+    """
+
+    # State files of runs older than this are removed when a new limiter is created
+    STALE_AFTER = 24 * 3600
+
+    def __init__(self, settings: RateLimitSettings, state_path=None, clock=time.time, sleep=time.sleep,
+                 usage_path=None):
+        """
+        Initializes the RateLimiter.
+
+        :param settings: The rate, burst, budget and endpoint weight settings.
+        :param state_path: Path of the shared state file (defaults to one per run in settings.state_dir).
+        :param clock: Function returning the current (wall clock) time in seconds, shared across processes.
+        :param sleep: Function used to wait for tokens (overridable in tests).
+        :param usage_path: Path of the monthly usage file (defaults to settings.monthly_usage_path; none if empty).
+        """
+        self.settings = settings
+        self.state_path = Path(state_path or Path(settings.state_dir) / f"marketstack-rate-limit-{run_id()}.json")
+        usage_path = usage_path or settings.monthly_usage_path
+        self.usage_path = Path(usage_path) if usage_path else None
+        self.clock = clock
+        self.sleep = sleep
+        self.requests = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.quota_used = 0.0
+        self.monthly_used = 0.0
+        self._lock = threading.Lock()
+        self._remove_stale_states()
+
+    def _remove_stale_states(self):
+        """Removes the state files left behind by old runs (no xdist worker knows when the last one is done)."""
+        cutoff = time.time() - self.STALE_AFTER
+        for stale_path in self.state_path.parent.glob("marketstack-rate-limit-*.json"):
+            try:
+                if stale_path != self.state_path and stale_path.stat().st_mtime < cutoff:
+                    stale_path.unlink()
+            except OSError:
+                pass
+
+    def weight_of(self, endpoint) -> float:
+        """Returns the number of tokens (and quota) a request to the endpoint costs."""
+        return self.settings.endpoint_weights.get(endpoint, 1.0)
+
+    def acquire(self, endpoint) -> float:
+        """
+        Blocks until a request to the endpoint is allowed, and counts it in the quota.
+
+        :return: The number of seconds spent waiting.
+        :raises QuotaExceededError: If the request would exceed the request budget of the run or the monthly quota.
+        """
+        weight = self.weight_of(endpoint)
+        # A request heavier than the bucket can hold waits for a full bucket, then leaves it in debt
+        needed = min(weight, self.settings.burst)
+        waited = 0.0
+        while True:
+            with self._shared_state() as state:
+                budget = self.settings.request_budget
+                if budget and state["used"] + weight > budget:
+                    raise QuotaExceededError(
+                        f"The request budget of the run is exhausted: {state['used']:g} of {budget:g} used, "
+                        f"and 'GET {endpoint}' costs {weight:g}. Raise 'request_budget' in config.ini "
+                        f"or run fewer tests.")
+
+                now = self.clock()
+                state["tokens"] = min(self.settings.burst,
+                                      state["tokens"] + (now - state["updated"]) * self.settings.requests_per_second)
+                state["updated"] = now
+                if state["tokens"] >= needed:
+                    monthly_used = self._charge_month(endpoint, weight, now)
+                    state["tokens"] -= weight
+                    state["used"] += weight
+                    quota_used = state["used"]
+                    break
+                delay = (needed - state["tokens"]) / self.settings.requests_per_second
+
+            self.sleep(delay)
+            waited += delay
+
+        with self._lock:
+            self.requests += 1
+            self.quota_used = quota_used
+            if monthly_used is not None:
+                self.monthly_used = monthly_used
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+            if waited:
+                self.waits += 1
+        return waited
+
+    def _charge_month(self, endpoint, weight, now) -> float | None:
+        """
+        Counts a request in the usage of the current month, if a usage file is set (called under the state lock).
+
+        :return: The usage of the month, including the request (None without usage file).
+        :raises QuotaExceededError: If the request would exceed the monthly quota.
+        """
+        if self.usage_path is None:
+            return None
+        month = time.strftime("%Y-%m", time.gmtime(now))
+        self.usage_path.parent.mkdir(parents=True, exist_ok=True)
+        with _locked_json(self.usage_path, {"month": month, "used": 0.0}) as usage:
+            if usage["month"] != month:
+                usage.update(month=month, used=0.0)
+            quota = self.settings.monthly_quota
+            if quota and usage["used"] + weight > quota:
+                raise QuotaExceededError(
+                    f"The monthly quota is exhausted: {usage['used']:g} of {quota:g} used in {month}, "
+                    f"and 'GET {endpoint}' costs {weight:g}. Raise 'monthly_quota' in config.ini "
+                    f"if the API plan allows more requests.")
+            usage["used"] += weight
+            return usage["used"]
+
+    @contextmanager
+    def _shared_state(self):
+        """Yields the bucket state for update, holding the thread lock and the cross-process file lock."""
+        with self._lock, _locked_json(self.state_path, {
+                "tokens": self.settings.burst, "updated": self.clock(), "used": 0.0}) as state:
+            yield state
+
+    def stats(self) -> dict:
+        """Returns the request, wait and quota counters of this process (quota_used is for the whole run)."""
+        with self._lock:
+            return {"requests": self.requests, "waits": self.waits, "wait_seconds": self.wait_seconds,
+                    "max_wait_seconds": self.max_wait_seconds, "quota_used": self.quota_used,
+                    "request_budget": self.settings.request_budget, "monthly_used": self.monthly_used,
+                    "monthly_quota": self.settings.monthly_quota}
+
+    def close(self):
+        """Removes the state file, unless it is shared with other pytest-xdist workers."""
+        if not is_xdist_worker():
+            self.state_path.unlink(missing_ok=True)
+
+
+class RateLimitedRetry(Retry):
+    """
+    urllib3 Retry that charges every resent request to the RateLimiter (tokens, run budget and monthly quota), as
+    the API counts the retries of a request (e.g., after a 429) like any request. The limiter is acquired after the
+    backoff of each retry, for the endpoint of the request URL.
+    """
+
+    def __init__(self, *args, rate_limiter: RateLimiter | None = None, path_prefix: str = "", **kwargs):
+        """
+        Initializes the RateLimitedRetry.
+
+        :param rate_limiter: The RateLimiter charged for every retry.
+        :param path_prefix: The URL path before the endpoint (e.g., /v2), removed to get the endpoint of a request.
+        The other arguments are those of Retry.
+        """
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+        self.path_prefix = path_prefix
+        self.endpoint = None
+
+    def new(self, **kwargs):
+        retry = super().new(**kwargs)
+        retry.rate_limiter = self.rate_limiter
+        retry.path_prefix = self.path_prefix
+        return retry
+
+    def increment(self, method=None, url=None, *args, **kwargs):
+        retry = super().increment(method, url, *args, **kwargs)
+        path = urlsplit(url or "").path
+        retry.endpoint = path[len(self.path_prefix):] if path.startswith(self.path_prefix) else path
+        return retry
+
+    def sleep(self, response=None):
+        super().sleep(response)
+        # Called before every resend only (after the request is known to be retried)
+        if self.rate_limiter is not None and self.endpoint is not None:
+            self.rate_limiter.acquire(self.endpoint)
+
+
+@contextmanager
+def _locked_json(path: Path, default: dict):
+    """Yields the JSON content of a file (default if empty) for update, holding an exclusive lock of the file."""
+    with open(path, "a+") as json_file:
+        if fcntl is not None:
+            fcntl.flock(json_file, fcntl.LOCK_EX)
+        json_file.seek(0)
+        content = json_file.read()
+        state = json.loads(content) if content else default
+        yield state
+        json_file.seek(0)
+        json_file.truncate()
+        json_file.write(json.dumps(state))
+        json_file.flush()
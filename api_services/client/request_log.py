@@ -0,0 +1,37 @@
+import threading
+from collections import defaultdict
+from api_services.client.fingerprint import request_fingerprint
+from api_services.client.timing import current_node_id
+
+
+class RequestLog:
+    """
+    Collects the requests made through the APIClient by every test (including those answered by a cache), keyed by
+    the node id of the running test: how many, and the fingerprints of the cacheable (non-streamed) ones.
+    Used to record the cost of the tests and the requests they share, for the cost-balanced test scheduling.
+    """
+
+    def __init__(self):
+        self._requests = defaultdict(int)
+        self._fingerprints = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, params=None, stream=False):
+        """
+        Records a request of the running test.
+
+        :param endpoint: The API endpoint (e.g., /eod).
+        :param params: A dictionary of query parameters.
+        :param stream: Whether the response is streamed (it is then never cached, so not fingerprinted).
+        """
+        node_id = current_node_id()
+        fingerprint = None if stream else request_fingerprint(endpoint, params)
+        with self._lock:
+            self._requests[node_id] += 1
+            if fingerprint is not None:
+                self._fingerprints[node_id].add(fingerprint)
+
+    def pop(self, node_id) -> tuple[int, list[str]]:
+        """Returns the number of requests of a test and the sorted fingerprints of its cacheable ones, and forgets them."""
+        with self._lock:
+            return self._requests.pop(node_id, 0), sorted(self._fingerprints.pop(node_id, ()))
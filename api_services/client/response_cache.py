@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from api_services.client.fingerprint import request_fingerprint
+from utils.config_values import parse_endpoint_values
+
+
+@dataclass
+class CacheSettings:
+    """
+    A data class to hold the settings of the opt-in response cache of the APIClient.
+    """
+    enabled: bool = False
+    # Also share the responses between the pytest-xdist workers of the run (see SharedResponseCache)
+    shared: bool = False
+    max_entries: int = 256
+    default_ttl: float = 300.0
+    # Time-to-live in seconds per endpoint, overriding the default_ttl (e.g., {"/timezones": 3600})
+    endpoint_ttls: dict = field(default_factory=dict)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds the settings from a config.ini section, falling back to the defaults for missing keys.
+
+        :param config: The config.ini section of the target environment.
+        """
+        return cls(
+            enabled=config.getboolean('cache_enabled', fallback=cls.enabled),
+            shared=config.getboolean('cache_shared', fallback=cls.shared),
+            max_entries=config.getint('cache_max_entries', fallback=cls.max_entries),
+            default_ttl=config.getfloat('cache_ttl', fallback=cls.default_ttl),
+            endpoint_ttls=parse_endpoint_values(config.get('cache_endpoint_ttls', fallback='')),
+        )
+
+    def ttl_for(self, endpoint) -> float:
+        """Returns the time-to-live in seconds for responses of the given endpoint."""
+        return self.endpoint_ttls.get(endpoint, self.default_ttl)
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache of successful GET responses, with a time-to-live per endpoint.
+    Entries are keyed on the request fingerprint (endpoint + normalized params, without the access_key).
+    """
+
+    def __init__(self, settings: CacheSettings, clock=time.monotonic):
+        """
+        Initializes the ResponseCache.
+
+        :param settings: The cache size and TTL settings.
+        :param clock: Function returning the current time in seconds (overridable in tests).
+        """
+        self.settings = settings
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def ttl_for(self, endpoint) -> float:
+        """Returns the time-to-live in seconds for responses of the given endpoint."""
+        return self.settings.ttl_for(endpoint)
+
+    def get(self, endpoint, params=None):
+        """
+        Returns the cached response for the request, or None if it is missing or expired.
+        """
+        key = request_fingerprint(endpoint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self.clock():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, endpoint, params, response):
+        """
+        Stores the response of the request, evicting the least recently used entries above max_entries.
+        """
+        ttl = self.ttl_for(endpoint)
+        if ttl <= 0:
+            return
+
+        key = request_fingerprint(endpoint, params)
+        with self._lock:
+            self._entries[key] = (self.clock() + ttl, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.settings.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Removes all cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Returns the hit/miss/eviction counters and the current number of entries."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
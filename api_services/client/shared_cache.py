@@ -0,0 +1,139 @@
+import hashlib
+import json
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from api_services.client.fingerprint import request_fingerprint
+from api_services.client.response_cache import CacheSettings
+from api_services.client.stored_response import build_response, stored_headers
+from utils.run_context import run_id
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent fetches of the same response are then not serialized
+    fcntl = None
+
+
+class SharedResponseCache:
+    """
+    Cache of successful GET responses shared by all the pytest-xdist workers of a run on this host.
+
+    Responses are stored in a SQLite database (WAL mode, so reads do not block) keyed on the request fingerprint,
+    with the time-to-live of the CacheSettings. Fetching a response is serialized per fingerprint with a lock file
+    (fcntl.flock), so when several workers need the same response at once, one of them fetches it and the others
+    read it from the cache once the lock is released.
+    """
+
+    # Cache files of runs older than this are removed when a new cache is opened
+    STALE_AFTER = 24 * 3600
+
+    def __init__(self, settings: CacheSettings, path=None, clock=time.time):
+        """
+        Initializes the SharedResponseCache.
+
+        :param settings: The TTL settings of the cache.
+        :param path: Path of the database (defaults to one per run in the temp directory).
+        :param clock: Function returning the current (wall clock) time in seconds, shared across processes.
+        """
+        self.settings = settings
+        self.clock = clock
+        self.path = Path(path or Path(tempfile.gettempdir()) / f"marketstack-cache-{run_id()}.sqlite")
+        self.lock_dir = self.path.with_suffix(".locks")
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.lock_waits = 0
+        self._lock = threading.Lock()
+        self._remove_stale_caches()
+
+        self._connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires REAL, status_code INTEGER, "
+            "reason TEXT, encoding TEXT, headers TEXT, url TEXT, body BLOB)")
+
+    def _remove_stale_caches(self):
+        """Removes the cache files left behind by old runs (no process knows when the last worker is done)."""
+        cutoff = time.time() - self.STALE_AFTER
+        for stale_path in self.path.parent.glob("marketstack-cache-*"):
+            try:
+                if not stale_path.name.startswith(self.path.stem) and stale_path.stat().st_mtime < cutoff:
+                    if stale_path.is_dir():
+                        shutil.rmtree(stale_path)
+                    else:
+                        stale_path.unlink()
+            except OSError:
+                pass
+
+    def get(self, endpoint, params=None):
+        """
+        Returns the cached response for the request, or None if it is missing or expired.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status_code, reason, encoding, headers, url, body FROM responses "
+                "WHERE key = ? AND expires > ?", (request_fingerprint(endpoint, params), self.clock())).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        status_code, reason, encoding, headers, url, body = row
+        return build_response(status_code, reason, encoding, json.loads(headers), url, body)
+
+    def put(self, endpoint, params, response, url=None):
+        """
+        Stores the (already read) response of the request for the TTL of the endpoint.
+
+        :param url: URL stored with the response; it must not contain the access_key (defaults to the endpoint).
+        """
+        ttl = self.settings.ttl_for(endpoint)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (request_fingerprint(endpoint, params), self.clock() + ttl, response.status_code, response.reason,
+                 response.encoding, json.dumps(stored_headers(response)), url or endpoint, response.content))
+            self.stores += 1
+
+    @contextmanager
+    def fetch_lock(self, endpoint, params=None):
+        """
+        Holds the lock of the request (across the threads and processes of the run) while it is fetched.
+        """
+        key = request_fingerprint(endpoint, params)
+        lock_path = self.lock_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.lock"
+        with open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    with self._lock:
+                        self.lock_waits += 1
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def clear(self):
+        """Removes all cached responses (of all the workers)."""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+
+    def stats(self) -> dict:
+        """Returns the hit/miss/store counters of this process, and how often it waited for another fetch."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "stores": self.stores, "lock_waits": self.lock_waits}
+
+    def close(self):
+        """Closes the database (the file stays for the other workers of the run)."""
+        with self._lock:
+            self._connection.close()
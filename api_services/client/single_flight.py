@@ -0,0 +1,63 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """
+    Deduplicates identical in-flight calls: while a call for a key is running, the other calls for the same key
+    wait for it and get its result (or its error) instead of running again.
+    Used by the APIClient with the request fingerprint (endpoint + normalized params, without the access_key) as key.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function):
+        """
+        Runs function() unless a call for the same key is already in flight, in which case its outcome is shared.
+
+        :param key: The key identifying identical calls.
+        :param function: The function to run (without arguments).
+        :return: The result of the (possibly shared) call.
+        :raises: The error of the (possibly shared) call.
+        """
+        with self._lock:
+            self.calls += 1
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = function()
+        except BaseException as error:
+            self._done(key)
+            future.set_exception(error)
+            raise
+        self._done(key)
+        future.set_result(result)
+        return result
+
+    def record_shared(self):
+        """Counts a call deduplicated before reaching do() (e.g., by the AsyncAPIClient)."""
+        with self._lock:
+            self.calls += 1
+            self.shared += 1
+
+    def _done(self, key):
+        """Removes the finished call, so the next call for the key runs again."""
+        with self._lock:
+            del self._in_flight[key]
+
+    def stats(self) -> dict:
+        """Returns the number of calls, and how many of them shared an in-flight call (calls saved)."""
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._in_flight)}
@@ -0,0 +1,23 @@
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Headers describing the wire format of the body, which no longer apply to the stored (decoded) body
+SKIPPED_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+
+def stored_headers(response) -> dict:
+    """Returns the headers of the response that still apply to its decoded body."""
+    return {key: value for key, value in response.headers.items() if key.lower() not in SKIPPED_HEADERS}
+
+
+def build_response(status_code, reason, encoding, headers, url, body) -> requests.Response:
+    """Rebuilds an already read requests.Response from its stored parts."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = reason
+    response.encoding = encoding
+    response.headers = CaseInsensitiveDict(headers)
+    response.url = url
+    response._content = body
+    response._content_consumed = True
+    return response
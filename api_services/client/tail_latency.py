@@ -0,0 +1,164 @@
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from api_services.client.timing import percentile
+
+
+@dataclass
+class TailLatencySettings:
+    """
+    A data class to hold the timeout and hedging settings of the APIClient.
+    Durations are in seconds, except the hedge delay floor (in milliseconds).
+    """
+    timeout_enabled: bool = True
+    # Timeout to open a connection
+    connect_timeout: float = 5.0
+    # Read timeout until enough responses of the endpoint have been observed
+    default_timeout: float = 30.0
+    # Afterwards: percentile of the observed response times times the multiplier, within [min_timeout, max_timeout]
+    timeout_percentile: float = 99.0
+    timeout_multiplier: float = 3.0
+    min_timeout: float = 2.0
+    max_timeout: float = 60.0
+    # Responses of an endpoint to observe before its timeout and hedge delay adapt to them
+    min_samples: int = 20
+    # Responses of an endpoint kept to compute its percentiles
+    window: int = 200
+    hedge_enabled: bool = False
+    # Send a duplicate GET when no response has arrived after this percentile of the observed response times
+    hedge_percentile: float = 95.0
+    hedge_min_delay_ms: float = 50.0
+    # Maximum share of the requests that may be hedged, so a slow API does not get twice the load
+    hedge_max_ratio: float = 0.1
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds the settings from a config.ini section, falling back to the defaults for missing keys.
+
+        :param config: The config.ini section of the target environment.
+        """
+        return cls(
+            timeout_enabled=config.getboolean('timeout_enabled', fallback=cls.timeout_enabled),
+            connect_timeout=config.getfloat('timeout_connect_s', fallback=cls.connect_timeout),
+            default_timeout=config.getfloat('timeout_default_s', fallback=cls.default_timeout),
+            timeout_percentile=config.getfloat('timeout_percentile', fallback=cls.timeout_percentile),
+            timeout_multiplier=config.getfloat('timeout_multiplier', fallback=cls.timeout_multiplier),
+            min_timeout=config.getfloat('timeout_min_s', fallback=cls.min_timeout),
+            max_timeout=config.getfloat('timeout_max_s', fallback=cls.max_timeout),
+            min_samples=config.getint('latency_min_samples', fallback=cls.min_samples),
+            window=config.getint('latency_window', fallback=cls.window),
+            hedge_enabled=config.getboolean('hedge_enabled', fallback=cls.hedge_enabled),
+            hedge_percentile=config.getfloat('hedge_percentile', fallback=cls.hedge_percentile),
+            hedge_min_delay_ms=config.getfloat('hedge_min_delay_ms', fallback=cls.hedge_min_delay_ms),
+            hedge_max_ratio=config.getfloat('hedge_max_ratio', fallback=cls.hedge_max_ratio),
+        )
+
+
+class TailLatencyPolicy:
+    """
+    Derives per-endpoint request timeouts and hedge delays from the response times observed by the APIClient.
+
+    The response time of a request is the time until its headers arrived (requests' `elapsed`, which includes
+    opening the connection). The read timeout of an endpoint is a high percentile of its recent response times
+    times a safety multiplier; the hedge delay is the p95 (by default): a request still unanswered by then is
+    in the tail, and a duplicate sent on another connection is likely to answer first.
+    """
+
+    def __init__(self, settings: TailLatencySettings | None = None):
+        """
+        Initializes the TailLatencyPolicy.
+
+        :param settings: The timeout and hedging settings (defaults are used if omitted).
+        """
+        self.settings = settings or TailLatencySettings()
+        self.requests = 0
+        self.timeouts = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.hedges_skipped = 0
+        self._samples = defaultdict(lambda: deque(maxlen=self.settings.window))
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint, seconds: float):
+        """Adds the response time of a request to the endpoint."""
+        with self._lock:
+            self.requests += 1
+            self._samples[endpoint].append(seconds)
+
+    def record_timeout(self):
+        """Counts a request that timed out (or failed to connect)."""
+        with self._lock:
+            self.requests += 1
+            self.timeouts += 1
+
+    def _percentile(self, endpoint, pct) -> float | None:
+        """Returns the percentile of the recent response times of the endpoint, or None without enough samples."""
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if not samples or len(samples) < self.settings.min_samples:
+                return None
+            values = sorted(samples)
+        return percentile(values, pct)
+
+    def timeout_for(self, endpoint) -> tuple[float, float] | None:
+        """
+        Returns the (connect, read) timeout of a request to the endpoint, in seconds, or None if timeouts are disabled.
+        """
+        settings = self.settings
+        if not settings.timeout_enabled:
+            return None
+        observed = self._percentile(endpoint, settings.timeout_percentile)
+        if observed is None:
+            return settings.connect_timeout, settings.default_timeout
+        read_timeout = min(max(observed * settings.timeout_multiplier, settings.min_timeout), settings.max_timeout)
+        return settings.connect_timeout, read_timeout
+
+    def hedge_delay(self, endpoint) -> float | None:
+        """
+        Returns after how many seconds a request to the endpoint should be hedged,
+        or None if hedging is disabled or the endpoint has not been observed enough yet.
+        """
+        settings = self.settings
+        if not settings.hedge_enabled:
+            return None
+        observed = self._percentile(endpoint, settings.hedge_percentile)
+        if observed is None:
+            return None
+        return max(observed, settings.hedge_min_delay_ms / 1000)
+
+    def try_fire_hedge(self) -> bool:
+        """Counts a hedge about to be sent, unless it would exceed the share of requests that may be hedged."""
+        with self._lock:
+            if self.hedges_fired + 1 > self.settings.hedge_max_ratio * max(self.requests, 1):
+                self.hedges_skipped += 1
+                return False
+            self.hedges_fired += 1
+            return True
+
+    def record_hedge_won(self):
+        """Counts a hedge whose response arrived before the one of the original request."""
+        with self._lock:
+            self.hedges_won += 1
+
+    def stats(self) -> dict:
+        """Returns the request, timeout and hedge counters, and the current read timeout per endpoint."""
+        with self._lock:
+            endpoints = list(self._samples)
+            stats = {"requests": self.requests, "timeouts": self.timeouts, "hedges_fired": self.hedges_fired,
+                     "hedges_won": self.hedges_won, "hedges_skipped": self.hedges_skipped}
+        stats["read_timeouts"] = {endpoint: (self.timeout_for(endpoint) or (None, None))[1] for endpoint in endpoints}
+        return stats
+
+    def summary_lines(self) -> list[str]:
+        """Returns human-readable lines describing the timeouts and hedges, used in the pytest terminal summary."""
+        stats = self.stats()
+        lines = [f"Tail latency: {stats['requests']} requests, {stats['timeouts']} timed out"]
+        if self.settings.hedge_enabled:
+            lines[0] += (f", {stats['hedges_fired']} hedged ({stats['hedges_won']} won), "
+                         f"{stats['hedges_skipped']} hedges skipped over the {self.settings.hedge_max_ratio:.0%} cap")
+        timeouts = ", ".join(f"{endpoint} {seconds:.2f}s" for endpoint, seconds in stats["read_timeouts"].items()
+                             if seconds is not None)
+        if timeouts:
+            lines.append(f"  read timeouts: {timeouts}")
+        return lines
@@ -0,0 +1,306 @@
+import csv
+import io
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+PHASES = ("dns", "connect", "tls", "ttfb", "download", "deserialize", "total")
+PERCENTILES = (50, 95, 99)
+
+# Per-thread state: connection phases of the request being sent, and the last recorded timing (for deserialize)
+_local = threading.local()
+
+
+def _add_connection_phase(phase, seconds):
+    """Adds the duration of a connection setup phase to the request currently sent by this thread."""
+    phases = getattr(_local, "connection_phases", None)
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+def _connection_setup_seconds() -> float:
+    """Returns the DNS + TCP connect time recorded so far for the request currently sent by this thread."""
+    phases = getattr(_local, "connection_phases", None) or {}
+    return phases.get("dns", 0.0) + phases.get("connect", 0.0)
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """HTTPConnection reporting the time spent resolving the host name and opening the TCP connection."""
+
+    def _new_conn(self):
+        started = time.perf_counter()
+        try:
+            address = socket.getaddrinfo(self._dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)[0][4][0]
+        except OSError:
+            # Let urllib3 resolve again and raise its own NameResolutionError
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        _add_connection_phase("dns", resolved - started)
+
+        # Connect to the resolved address, so the lookup is not done twice
+        dns_host = self._dns_host
+        self._dns_host = address
+        try:
+            sock = super()._new_conn()
+        except NewConnectionError:
+            # Fall back to urllib3 trying all the addresses of the host
+            self._dns_host = dns_host
+            sock = super()._new_conn()
+        finally:
+            self._dns_host = dns_host
+        _add_connection_phase("connect", time.perf_counter() - resolved)
+        return sock
+
+
+class TimedHTTPSConnection(TimedHTTPConnection, HTTPSConnection):
+    """HTTPSConnection also reporting the time spent on the TLS handshake."""
+
+    def connect(self):
+        started = time.perf_counter()
+        setup_before = _connection_setup_seconds()
+        super().connect()
+        # Whatever connect() spent beyond the DNS lookup and the TCP connection is the TLS handshake
+        setup = _connection_setup_seconds() - setup_before
+        _add_connection_phase("tls", max(time.perf_counter() - started - setup, 0.0))
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report their DNS/connect/TLS phases to the TimingRecorder."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool,
+                                                   "https": TimedHTTPSConnectionPool}
+
+
+@dataclass(slots=True)
+class RequestTiming:
+    """
+    A data class to hold the duration (in seconds) of the phases of one API request, and its tags.
+    dns/connect/tls are 0 when an already open connection was reused; download is None for streamed responses,
+    and deserialize is None until the response is validated with BaseAssertions.validate_and_deserialize.
+    """
+    endpoint: str
+    node_id: str
+    env: str
+    status_code: int
+    dns: float
+    connect: float
+    tls: float
+    ttfb: float
+    download: float | None
+    deserialize: float | None
+    total: float
+
+    @property
+    def new_connection(self) -> bool:
+        return bool(self.dns or self.connect or self.tls)
+
+
+def percentile(sorted_values, pct) -> float:
+    """Returns the pct-th percentile of sorted values, interpolating linearly between the closest ranks."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def current_node_id() -> str:
+    """Returns the node id of the running test (e.g., tests/test_x.py::TestX::test_y), or '' outside tests."""
+    return os.environ.get("PYTEST_CURRENT_TEST", "").rsplit(" ", 1)[0]
+
+
+@contextmanager
+def timed_deserialize():
+    """
+    Records the duration of the block as the deserialize phase of the last request sent by this thread.
+    Does nothing if the thread has no pending request (e.g., the response was served from the cache).
+    """
+    timing = getattr(_local, "last_timing", None)
+    _local.last_timing = None
+    started = time.perf_counter()
+    yield
+    if timing is not None:
+        timing.deserialize = time.perf_counter() - started
+
+
+def adopt_timing(response):
+    """
+    Makes the timing of a response (sent by another thread, e.g. a hedged request) the last request of this thread,
+    so its deserialize phase is recorded by timed_deserialize().
+    """
+    _local.last_timing = getattr(response, "timing", None)
+
+
+@dataclass
+class SloSettings:
+    """
+    A data class to hold the latency and payload size objectives asserted by the smoke tests.
+    """
+    # Maximum total time of a single request, in milliseconds
+    response_ms: float = 2000.0
+    # Percentile of a group of requests (e.g., a parametrized test) and its maximum, in milliseconds
+    percentile: float = 95.0
+    percentile_ms: float = 1500.0
+    # Maximum size of a response body, in kilobytes
+    payload_kb: float = 512.0
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds the settings from a config.ini section, falling back to the defaults for missing keys.
+
+        :param config: The config.ini section of the target environment.
+        """
+        return cls(
+            response_ms=config.getfloat('slo_response_ms', fallback=cls.response_ms),
+            percentile=config.getfloat('slo_percentile', fallback=cls.percentile),
+            percentile_ms=config.getfloat('slo_percentile_ms', fallback=cls.percentile_ms),
+            payload_kb=config.getfloat('slo_payload_kb', fallback=cls.payload_kb),
+        )
+
+
+class TimingRecorder:
+    """
+    Collects the phase timings of the requests sent by the APIClient, tagged with the endpoint, the node id of the
+    running test and the environment, and aggregates them into p50/p95/p99 percentiles per endpoint.
+    Responses served from the response cache or a cassette are not timed.
+    """
+
+    def __init__(self, env: str = ""):
+        """
+        Initializes the TimingRecorder.
+
+        :param env: The environment the requests are sent to (tag of the timings).
+        """
+        self.env = env
+        self.records: list[RequestTiming] = []
+        self._lock = threading.Lock()
+
+    def start(self) -> float:
+        """Starts timing a request sent by this thread. Returns the start time, to pass to record()."""
+        _local.connection_phases = {}
+        return time.perf_counter()
+
+    def record(self, endpoint, response, started, stream=False) -> RequestTiming:
+        """
+        Records the timing of a request started with start(), and attaches it to the response as `response.timing`.
+
+        :param endpoint: The API endpoint (e.g., /eod).
+        :param response: The response returned by requests.
+        :param started: The value returned by start().
+        :param stream: Whether the body was left to be read (its download is then not timed).
+        """
+        total = time.perf_counter() - started
+        phases = getattr(_local, "connection_phases", None) or {}
+        _local.connection_phases = None
+        dns, connect, tls = phases.get("dns", 0.0), phases.get("connect", 0.0), phases.get("tls", 0.0)
+        # requests measures 'elapsed' from sending the request (including opening the connection) to the headers
+        elapsed = response.elapsed.total_seconds()
+        timing = RequestTiming(
+            endpoint=endpoint,
+            node_id=current_node_id(),
+            env=self.env,
+            status_code=response.status_code,
+            dns=dns,
+            connect=connect,
+            tls=tls,
+            ttfb=max(elapsed - dns - connect - tls, 0.0),
+            download=None if stream else max(total - elapsed, 0.0),
+            deserialize=None,
+            total=total,
+        )
+        response.timing = timing
+        _local.last_timing = timing
+        with self._lock:
+            self.records.append(timing)
+        return timing
+
+    def select(self, endpoint=None, node_prefix=None) -> list[RequestTiming]:
+        """
+        Returns the recorded timings of an endpoint and/or of the tests whose node id starts with node_prefix
+        (e.g., the node id of a parametrized test without its parameters selects all its cases).
+        """
+        with self._lock:
+            return [timing for timing in self.records
+                    if (endpoint is None or timing.endpoint == endpoint)
+                    and (node_prefix is None or timing.node_id.startswith(node_prefix))]
+
+    def report(self) -> dict:
+        """
+        Returns the percentiles of each phase per endpoint, in milliseconds:
+        {endpoint: {"count": n, phase: {"count": n, "p50": ms, "p95": ms, "p99": ms}}}.
+        The connection phases only consider the requests that opened a new (TLS) connection.
+        """
+        with self._lock:
+            records = list(self.records)
+
+        by_endpoint = {}
+        for timing in records:
+            by_endpoint.setdefault(timing.endpoint, []).append(timing)
+
+        report = {}
+        for endpoint, timings in sorted(by_endpoint.items()):
+            endpoint_report = {"count": len(timings)}
+            for phase in PHASES:
+                if phase == "tls":
+                    # Plain HTTP connections have no handshake
+                    values = [timing.tls for timing in timings if timing.tls]
+                elif phase in ("dns", "connect"):
+                    values = [getattr(timing, phase) for timing in timings if timing.new_connection]
+                else:
+                    values = [getattr(timing, phase) for timing in timings if getattr(timing, phase) is not None]
+                if not values:
+                    continue
+                values.sort()
+                endpoint_report[phase] = {"count": len(values)}
+                for pct in PERCENTILES:
+                    endpoint_report[phase][f"p{pct}"] = round(percentile(values, pct) * 1000, 3)
+            report[endpoint] = endpoint_report
+        return report
+
+    def summary_lines(self) -> list[str]:
+        """Returns one line per endpoint and phase with its percentiles, used in the pytest terminal summary."""
+        lines = []
+        for endpoint, endpoint_report in self.report().items():
+            lines.append(f"Latency GET {endpoint} ({endpoint_report['count']} requests, env {self.env or 'n/a'}):")
+            for phase in PHASES:
+                stats = endpoint_report.get(phase)
+                if stats is not None:
+                    values = "  ".join(f"p{pct} {stats[f'p{pct}']:8.2f}" for pct in PERCENTILES)
+                    lines.append(f"  {phase:<12}{values} ms  (n={stats['count']})")
+        return lines
+
+    def to_csv(self) -> str:
+        """Returns all the recorded timings as CSV (durations in milliseconds), e.g., for an Allure attachment."""
+        with self._lock:
+            records = list(self.records)
+
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=[field.name for field in fields(RequestTiming)])
+        writer.writeheader()
+        for timing in records:
+            row = asdict(timing)
+            for phase in PHASES:
+                if row[phase] is not None:
+                    row[phase] = round(row[phase] * 1000, 3)
+            writer.writerow(row)
+        return output.getvalue()
@@ -0,0 +1,56 @@
+import allure
+from api_services.market.filters.eod_filters import EodFilters
+from api_services.market.filters.timezone_filters import TimezoneFilters
+
+
+class AsyncMarketController:
+    """
+    Asyncio counterpart of MarketController for the 'market' related endpoints of the API.
+    Accepts the same filter dataclasses and returns the same response objects.
+    """
+
+    def __init__(self, async_api_client, eod_batcher=None):
+        """
+        Initializes the AsyncMarketController.
+
+        :param async_api_client: Instance of AsyncAPIClient for HTTP requests.
+        :param eod_batcher: Optional EodBatcher (e.g., MarketController.eod_batcher) used by get_eod_data_batched.
+        """
+        self.async_api_client = async_api_client
+        self.eod_batcher = eod_batcher
+
+    async def get_eod_data(self, filters: EodFilters):
+        """
+        Gets end-of-day data from the /eod endpoint.
+
+        :param filters: An EodFilters object containing the query parameters.
+        :return: The response object from the GET request.
+        """
+        endpoint = "/eod"
+        # allure.step only wraps plain functions: as a decorator, the step would end before the request is awaited
+        with allure.step("Send GET request to /eod endpoint"):
+            return await self.async_api_client.get(endpoint, params=filters.serialize())
+
+    async def get_timezones(self, filters: TimezoneFilters):
+        """
+        Gets timezone data from the /timezones endpoint.
+
+        :param filters: TimezoneFilters object containing query params.
+        :return: The response object from the GET request.
+        """
+        endpoint = "/timezones"
+        with allure.step("Send GET request to /timezones endpoint"):
+            return await self.async_api_client.get(endpoint, params=filters.serialize())
+
+    async def get_eod_data_batched(self, filters: EodFilters):
+        """
+        Gets the end-of-day data of a single symbol, coalesced with the concurrent calls for other symbols and the
+        same filters into one multi-symbol /eod request (see EodBatcher).
+        The response is checked for status code 200 and deserialized.
+
+        :param filters: An EodFilters object with a single symbol.
+        :return: The EodResponseDTO holding the records of the symbol.
+        """
+        if self.eod_batcher is None:
+            raise RuntimeError("The AsyncMarketController was created without an EodBatcher.")
+        return await self.async_api_client.call(self.eod_batcher.get_eod_data, filters)
@@ -0,0 +1,165 @@
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from api_services.market import schemas
+from api_services.market.filters.eod_filters import EodFilters
+
+# Default 'limit' of the /eod endpoint, and the largest one it accepts
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+@dataclass
+class BatchSettings:
+    """
+    A data class to hold the settings of the coalescing of single-symbol /eod requests into multi-symbol ones.
+    """
+    enabled: bool = True
+    # Maximum number of symbols per multi-symbol request (also capped so that limit * symbols <= 1000)
+    max_batch_size: int = 10
+    # How long the first request of a batch waits for others to join it, in milliseconds
+    wait_window_ms: float = 20.0
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds the settings from a config.ini section, falling back to the defaults for missing keys.
+
+        :param config: The config.ini section of the target environment.
+        """
+        return cls(
+            enabled=config.getboolean('eod_batch_enabled', fallback=cls.enabled),
+            max_batch_size=config.getint('eod_batch_size', fallback=cls.max_batch_size),
+            wait_window_ms=config.getfloat('eod_batch_window_ms', fallback=cls.wait_window_ms),
+        )
+
+
+class _Batch:
+    """The single-symbol requests waiting to be sent as one multi-symbol request."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.futures = {}
+        self.full = threading.Event()
+
+
+class EodBatcher:
+    """
+    Coalesces concurrent single-symbol /eod requests with the same filters into one multi-symbol request,
+    and hands each caller the EodDataDTO records of its symbol.
+
+    The first request of a batch waits up to `wait_window_ms` for other requests to join (or until the batch is
+    full), then sends `symbols=A,B,...` with `limit = limit * batch size`. The API sorts the records of all the
+    symbols by date, so the records of each symbol in the response are its first ones: a symbol is served from the
+    batch if it got at least `limit` records, or if the response holds all the records of the batch. Otherwise (and
+    if the batch request fails) the caller sends its own single-symbol request, so it sees the same data and errors
+    as without batching. Requests with an offset or several symbols are never batched.
+    """
+
+    def __init__(self, market_controller, settings: BatchSettings | None = None):
+        """
+        Initializes the EodBatcher.
+
+        :param market_controller: The MarketController sending the (single and multi-symbol) requests.
+        :param settings: Batch size and wait window settings (defaults are used if omitted).
+        """
+        self.market_controller = market_controller
+        self.settings = settings or BatchSettings()
+        self.calls = 0
+        self.batch_requests = 0
+        self.single_requests = 0
+        self._batches = {}
+        self._lock = threading.Lock()
+
+    def get_eod_data(self, filters: EodFilters) -> "schemas.EodResponseDTO":
+        """
+        Gets the end-of-day data of one symbol, batched with the concurrent calls for the same filters.
+        The response is checked for status code 200 and deserialized.
+
+        :param filters: An EodFilters object with a single symbol.
+        :return: The EodResponseDTO of the symbol. Its pagination.total is a lower bound when the symbol was
+            served from a batch holding only part of its records.
+        """
+        with self._lock:
+            self.calls += 1
+        limit = filters.limit or DEFAULT_LIMIT
+        capacity = min(self.settings.max_batch_size, MAX_LIMIT // limit)
+        if not self.settings.enabled or filters.offset or "," in filters.symbols or capacity < 2:
+            return self._get_single(filters)
+
+        # Requests can share a batch if all their other filters are the same
+        key = tuple(sorted(replace(filters, symbols="").serialize().items()))
+        with self._lock:
+            batch = self._batches.get(key)
+            leader = batch is None
+            if leader:
+                batch = self._batches[key] = _Batch(capacity)
+            future = batch.futures.get(filters.symbols)
+            if future is None:
+                future = batch.futures[filters.symbols] = Future()
+                if len(batch.futures) >= batch.capacity:
+                    # No more room: the next request starts a new batch
+                    del self._batches[key]
+                    batch.full.set()
+
+        if leader:
+            batch.full.wait(self.settings.wait_window_ms / 1000)
+            with self._lock:
+                if self._batches.get(key) is batch:
+                    del self._batches[key]
+            self._send_batch(filters, batch)
+
+        result = future.result()
+        return result if result is not None else self._get_single(filters)
+
+    def _send_batch(self, filters: EodFilters, batch: _Batch):
+        """
+        Sends the multi-symbol request of the batch and resolves the future of every symbol with its records,
+        or with None when the symbol must be requested on its own.
+        """
+        symbols = list(batch.futures)
+        if len(symbols) == 1:
+            batch.futures[symbols[0]].set_result(None)
+            return
+
+        limit = filters.limit or DEFAULT_LIMIT
+        batch_filters = replace(filters, symbols=",".join(symbols), limit=limit * len(symbols))
+        with self._lock:
+            self.batch_requests += 1
+        try:
+            response = self.market_controller.get_eod_data(batch_filters)
+            batch_dto = self.market_controller.load_eod_response(response) if response.status_code == 200 else None
+        except Exception:
+            # Whatever went wrong, every caller retries on its own and gets its own error
+            batch_dto = None
+        if batch_dto is None:
+            for future in batch.futures.values():
+                future.set_result(None)
+            return
+
+        records_by_symbol = {symbol: [] for symbol in symbols}
+        for record in batch_dto.data:
+            records_by_symbol.setdefault(record.symbol, []).append(record)
+        complete = batch_dto.pagination.total <= batch_dto.pagination.count
+
+        for symbol, future in batch.futures.items():
+            records = records_by_symbol[symbol]
+            if len(records) >= limit or (complete and records):
+                page = records[:limit]
+                pagination = schemas.PaginationDTO(limit=limit, offset=0, count=len(page), total=len(records))
+                future.set_result(schemas.EodResponseDTO(pagination=pagination, data=page))
+            else:
+                future.set_result(None)
+
+    def _get_single(self, filters: EodFilters) -> "schemas.EodResponseDTO":
+        """Sends the single-symbol request, unbatched."""
+        with self._lock:
+            self.single_requests += 1
+        return self.market_controller.load_eod_response(self.market_controller.get_eod_data(filters))
+
+    def stats(self) -> dict:
+        """Returns the number of calls, of requests sent, and of requests saved by batching."""
+        with self._lock:
+            sent = self.batch_requests + self.single_requests
+            return {"calls": self.calls, "batch_requests": self.batch_requests,
+                    "single_requests": self.single_requests, "requests_saved": max(self.calls - sent, 0)}
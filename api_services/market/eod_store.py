@@ -0,0 +1,229 @@
+import json
+import math
+import os
+import sys
+import threading
+from array import array
+from contextlib import contextmanager
+from datetime import date, datetime, timezone
+from pathlib import Path
+from urllib.parse import quote
+from api_services.market import schemas
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent syncs from several processes are then not serialized
+    fcntl = None
+
+# Fields of a stored record: the date (epoch seconds, UTC) then the float columns of EodColumnStore
+RECORD_FIELDS = ("date", "open", "high", "low", "close", "volume", "adj_high", "adj_low", "adj_close", "adj_open",
+                 "adj_volume", "split_factor", "dividend")
+RECORD_SIZE = len(RECORD_FIELDS) * 8
+# String fields, stored once per symbol (those of its latest record)
+SYMBOL_FIELDS = ("name", "exchange_code", "asset_type", "price_currency", "symbol", "exchange")
+
+
+class EodStore:
+    """
+    Local, per-symbol store of EOD histories, sorted by date.
+
+    The store is a directory with:
+    - one `<SYMBOL>.eod` file per symbol: fixed-size records of little-endian float64 values (RECORD_FIELDS, NaN
+      for None), in ascending date order, so a history is read with a single array.frombytes() and new days are
+      appended at the end of the file,
+    - `index.json`: per symbol, the number of records, the first and last dates and the string fields.
+
+    Records are only ever appended after the last stored date; older dates (e.g., a gap range) are merged by
+    rewriting the symbol file. Files are replaced atomically, and a partial append is discarded on the next write.
+    Writes are serialized across threads and processes (pytest-xdist workers) with lock().
+    """
+
+    INDEX_FILE = "index.json"
+    LOCK_FILE = ".lock"
+    VERSION = 1
+
+    def __init__(self, path):
+        """
+        Initializes the EodStore, creating its directory if needed.
+
+        :param path: Directory of the store.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._index = self._read_index()
+
+    def symbols(self) -> list[str]:
+        """Returns the stored symbols."""
+        return sorted(self._index)
+
+    def __len__(self):
+        return sum(entry["rows"] for entry in self._index.values())
+
+    def rows(self, symbol) -> int:
+        """Returns the number of stored records of a symbol."""
+        return self._index.get(symbol, {}).get("rows", 0)
+
+    def last_date(self, symbol) -> date | None:
+        """Returns the date of the latest stored record of a symbol, or None if it has none."""
+        entry = self._index.get(symbol)
+        return date.fromisoformat(entry["last_date"]) if entry else None
+
+    def load(self, symbol, date_from: datetime | None = None, date_to: datetime | None = None):
+        """
+        Returns the stored records of a symbol, oldest first, as an EodColumns container.
+
+        :param symbol: The symbol.
+        :param date_from: Optional first date of the records to return (inclusive).
+        :param date_to: Optional last date of the records to return (inclusive).
+        """
+        store = schemas.EodColumnStore()
+        # Under the lock, with the index re-read: another process may have rewritten the file since (gap merge)
+        with self.lock():
+            entry = self._index.get(symbol)
+            values = self._read_values(symbol, entry["rows"]) if entry is not None else None
+        if entry is not None:
+            step = len(RECORD_FIELDS)
+            # Every column is a strided slice of the records (copied in C, without a loop over the records)
+            store.dates = array('q', map(int, values[0::step]))
+            for number, name in enumerate(RECORD_FIELDS[1:], 1):
+                store.floats[name] = values[number::step]
+            for name in SYMBOL_FIELDS:
+                store.codes[name] = array('i', [store.encode(entry["strings"][name])]) * entry["rows"]
+        columns = schemas.EodColumns(store)
+        return columns if date_from is None and date_to is None else columns.between(date_from, date_to)
+
+    def merge(self, symbol, records) -> int:
+        """
+        Adds records of a symbol to the store. Records dated after the last stored one are appended; older ones
+        replace the stored records of the same date.
+
+        :param symbol: The symbol of the records.
+        :param records: EodDataDTO records (or EodColumns rows) of the symbol, in any order.
+        :return: The number of stored records that were added (not replaced).
+        """
+        # The latest record of every date, in date order
+        records = list({record.date: record for record in sorted(records, key=lambda record: record.date)}.values())
+        if not records:
+            return 0
+        with self.lock():
+            entry = self._index.get(symbol)
+            rows = entry["rows"] if entry else 0
+            new_values = _encode(records)
+            first_date, last_date = _iso_date(records[0].date), _iso_date(records[-1].date)
+
+            if entry is None or first_date > entry["last_date"]:
+                with open(self._symbol_path(symbol), "r+b" if entry else "wb") as symbol_file:
+                    # Drop the partial record of an interrupted append, if any
+                    symbol_file.truncate(rows * RECORD_SIZE)
+                    symbol_file.seek(rows * RECORD_SIZE)
+                    symbol_file.write(_to_bytes(new_values))
+                added = len(records)
+                strings = {name: getattr(records[-1], name) for name in SYMBOL_FIELDS}
+            else:
+                step = len(RECORD_FIELDS)
+                merged = {}
+                for values in (self._read_values(symbol, rows), new_values):
+                    for start in range(0, len(values), step):
+                        merged[values[start]] = values[start:start + step]
+                all_values = array('d')
+                for timestamp in sorted(merged):
+                    all_values.extend(merged[timestamp])
+                self._write_atomically(self._symbol_path(symbol), _to_bytes(all_values))
+                added = len(merged) - rows
+                first_date, last_date = min(first_date, entry["first_date"]), max(last_date, entry["last_date"])
+                strings = entry["strings"] if last_date > _iso_date(records[-1].date) else {
+                    name: getattr(records[-1], name) for name in SYMBOL_FIELDS}
+
+            self._index[symbol] = {
+                "rows": rows + added,
+                "first_date": entry["first_date"] if entry and entry["first_date"] < first_date else first_date,
+                "last_date": last_date,
+                "strings": strings,
+            }
+            self._write_index()
+        return added
+
+    @contextmanager
+    def lock(self):
+        """
+        Holds the lock of the store (across the threads and processes using it), with the index re-read from disk.
+        The lock is reentrant within a thread.
+        """
+        with self._lock:
+            if self._lock_depth:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                return
+            with open(self.path / self.LOCK_FILE, "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                self._lock_depth = 1
+                try:
+                    self._index = self._read_index()
+                    yield
+                finally:
+                    self._lock_depth = 0
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _symbol_path(self, symbol) -> Path:
+        return self.path / f"{quote(symbol, safe='')}.eod"
+
+    def _read_values(self, symbol, rows) -> array:
+        """Returns the stored values of a symbol, as one flat array of rows * len(RECORD_FIELDS) floats."""
+        values = array('d')
+        with open(self._symbol_path(symbol), "rb") as symbol_file:
+            values.frombytes(symbol_file.read(rows * RECORD_SIZE))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    def _read_index(self) -> dict:
+        index_path = self.path / self.INDEX_FILE
+        if not index_path.exists():
+            return {}
+        index = json.loads(index_path.read_text())
+        if index.get("version") != self.VERSION:
+            raise ValueError(f"Unsupported EOD store version {index.get('version')} at: {self.path}. "
+                             f"Delete the directory to sync the histories again.")
+        return index["symbols"]
+
+    def _write_index(self):
+        self._write_atomically(self.path / self.INDEX_FILE,
+                               json.dumps({"version": self.VERSION, "symbols": self._index}, indent=1, sort_keys=True))
+
+    @staticmethod
+    def _write_atomically(path: Path, content):
+        tmp_path = path.with_suffix(".tmp")
+        if isinstance(content, bytes):
+            tmp_path.write_bytes(content)
+        else:
+            tmp_path.write_text(content)
+        os.replace(tmp_path, path)
+
+
+def _encode(records) -> array:
+    """Returns the records as one flat array of float64 values (RECORD_FIELDS), record after record."""
+    values = array('d')
+    for record in records:
+        values.append(record.date.timestamp())
+        values.extend(math.nan if value is None else value
+                      for value in (getattr(record, name) for name in RECORD_FIELDS[1:]))
+    return values
+
+
+def _to_bytes(values: array) -> bytes:
+    """Returns the values as little-endian float64 bytes, the byte order of the store files."""
+    if sys.byteorder == "big":
+        values = array('d', values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _iso_date(value: datetime) -> str:
+    return value.astimezone(timezone.utc).date().isoformat()
@@ -0,0 +1,61 @@
+from api_services.market import schemas
+from utils.json_stream import ITEM, iter_json_object
+
+
+class EodStream:
+    """
+    Streams the records of an /eod response while it is being downloaded.
+
+    The response body is parsed incrementally, and every record of 'data' is validated and deserialized to an
+    EodDataDTO as soon as it is complete, so memory use does not grow with the 'limit'. The pagination is available
+    as soon as it has been parsed: before the first record if the API sends it first, otherwise at the end.
+    Validation errors are raised with the same message structure as EodResponseSchema (e.g., {"data": {3: {...}}}).
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, response, loader: "schemas.FastEodResponseLoader | None" = None, chunk_size: int = CHUNK_SIZE):
+        """
+        Initializes the EodStream.
+
+        :param response: A response requested with stream=True (an already read response works as well).
+        :param loader: The loader used to validate each record (defaults to FastEodResponseLoader()).
+        :param chunk_size: Number of bytes read from the response at a time.
+        """
+        self.response = response
+        self.loader = loader or schemas.FastEodResponseLoader()
+        self.chunk_size = chunk_size
+        self.pagination: schemas.PaginationDTO | None = None
+        self.count = 0
+        self._consumed = False
+
+    def __iter__(self):
+        if self._consumed:
+            raise RuntimeError("The /eod response stream can only be iterated once.")
+        self._consumed = True
+
+        seen_keys = set()
+        parsed_dates = {}
+        events = iter_json_object(self.response.iter_content(self.chunk_size), stream_keys=("data",))
+        for event, key, value in events:
+            seen_keys.add(key)
+            if event == ITEM:
+                try:
+                    record = self.loader.load_row(value, parsed_dates)
+                except schemas.ValidationError as err:
+                    raise schemas.ValidationError({"data": {self.count: err.messages}})
+                self.count += 1
+                yield record
+            elif key == "pagination":
+                try:
+                    self.pagination = schemas.PaginationSchema().load(value)
+                except schemas.ValidationError as err:
+                    raise schemas.ValidationError({"pagination": err.messages})
+            elif key == "data":
+                raise schemas.ValidationError({"data": ["Not a valid list."]})
+            else:
+                raise schemas.ValidationError({key: ["Unknown field."]})
+
+        missing = {"pagination", "data"} - seen_keys
+        if missing:
+            raise schemas.ValidationError({key: ["Missing data for required field."] for key in sorted(missing)})
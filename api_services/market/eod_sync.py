@@ -0,0 +1,109 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+import allure
+from api_services.market.eod_store import EodStore
+from api_services.market.filters.eod_filters import EodFilters
+
+
+@dataclass
+class SyncSettings:
+    """
+    A data class to hold the settings of the incremental /eod sync into the local EodStore.
+    """
+    # Directory of the store, relative to the project root
+    store_path: str = "eod_store"
+    # Maximum number of symbols synced by the same request (symbols with the same start date are grouped)
+    symbols_per_request: int = 10
+    # Records per page of the /eod requests
+    page_size: int = 1000
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds the settings from a config.ini section, falling back to the defaults for missing keys.
+
+        :param config: The config.ini section of the target environment.
+        """
+        return cls(
+            store_path=config.get('eod_store_path', fallback=cls.store_path),
+            symbols_per_request=config.getint('eod_sync_symbols_per_request', fallback=cls.symbols_per_request),
+            page_size=config.getint('eod_sync_page_size', fallback=cls.page_size),
+        )
+
+
+@dataclass(slots=True)
+class SyncResult:
+    """A data class to hold the outcome of the sync of one symbol."""
+    symbol: str
+    fetched: int
+    added: int
+    rows: int
+    last_date: date | None
+
+
+class EodSync:
+    """
+    Keeps the EOD histories of the local EodStore up to date with the /eod endpoint.
+
+    A sync only requests the dates after the last stored one of each symbol (the whole history for a new symbol),
+    or an explicit date range (to fill a gap, or refresh days that were corrected). Symbols starting at the same
+    date are requested together, page by page in ascending date order, and each page is validated like any /eod
+    response. The network traffic of a run therefore grows with the new days, not with the length of the history.
+    """
+
+    def __init__(self, market_controller, store: EodStore, settings: SyncSettings | None = None):
+        """
+        Initializes the EodSync.
+
+        :param market_controller: The MarketController sending the /eod requests.
+        :param store: The EodStore to update.
+        :param settings: The sync settings (defaults are used if omitted).
+        """
+        self.market_controller = market_controller
+        self.store = store
+        self.settings = settings or SyncSettings()
+
+    @allure.step("Sync the stored /eod history of {symbols}")
+    def sync(self, symbols: list[str], date_from: date | None = None, date_to: date | None = None) -> dict:
+        """
+        Fetches the missing records of the symbols and adds them to the store.
+
+        :param symbols: The symbols to sync.
+        :param date_from: Optional first date to fetch; if omitted, the day after the last stored record of each
+            symbol (or its whole history, if it has none).
+        :param date_to: Optional last date to fetch (today if omitted).
+        :return: The SyncResult of every symbol, by symbol.
+        """
+        results = {}
+        # Held for the whole sync, so concurrent workers wait and then find the store up to date
+        with self.store.lock():
+            starts = defaultdict(list)
+            for symbol in dict.fromkeys(symbols):
+                last_date = self.store.last_date(symbol)
+                start = date_from or (last_date + timedelta(days=1) if last_date else None)
+                starts[start].append(symbol)
+
+            for start, group in starts.items():
+                for first in range(0, len(group), self.settings.symbols_per_request):
+                    chunk = group[first:first + self.settings.symbols_per_request]
+                    # Nothing to request when the range is empty (e.g., the symbols were synced today)
+                    up_to_date = start is not None and start > (date_to or date.today())
+                    fetched = {} if up_to_date else self._fetch(chunk, start, date_to)
+                    for symbol in chunk:
+                        records = fetched.get(symbol, [])
+                        added = self.store.merge(symbol, records)
+                        results[symbol] = SyncResult(symbol, len(records), added, self.store.rows(symbol),
+                                                     self.store.last_date(symbol))
+        return results
+
+    def _fetch(self, symbols, date_from: date | None, date_to: date | None) -> dict:
+        """Returns the records of the symbols in the date range, by symbol."""
+        filters = EodFilters(symbols=",".join(symbols), sort="ASC",
+                             date_from=date_from.isoformat() if date_from else None,
+                             date_to=date_to.isoformat() if date_to else None)
+        records = defaultdict(list)
+        for page in self.market_controller.iter_eod_pages(filters, page_size=self.settings.page_size):
+            for record in page.data:
+                records[record.symbol].append(record)
+        return records
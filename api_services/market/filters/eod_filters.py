@@ -15,6 +15,9 @@ class EodFilters:
     limit: int | None = None
     offset: int | None = None
     sort: str | None = None
+    # Date range, as YYYY-MM-DD (both inclusive)
+    date_from: str | None = None
+    date_to: str | None = None
 
     def serialize(self) -> dict:
         """
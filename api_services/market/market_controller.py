@@ -1,6 +1,12 @@
+from dataclasses import replace
 import allure
+from api_services.market.eod_batcher import BatchSettings, EodBatcher
+from api_services.market.eod_stream import EodStream
 from api_services.market.filters.eod_filters import EodFilters
 from api_services.market.filters.timezone_filters import TimezoneFilters
+from api_services.market import schemas
+from api_services.market.pagination import iter_pages
+from utils.base_assertions import BaseAssertions
 
 
 class MarketController:
@@ -8,13 +14,19 @@ class MarketController:
     Controller to interact with the 'market' related endpoints of the API.
     """
 
-    def __init__(self, api_client):
+    # Largest 'limit' accepted by the API, used as the default page size when iterating
+    MAX_PAGE_SIZE = 1000
+
+    def __init__(self, api_client, batch_settings: BatchSettings | None = None):
         """
         Initializes the MarketController.
 
         :param api_client: Instance of APIClient for HTTP requests.
+        :param batch_settings: Settings of the coalescing of concurrent single-symbol /eod requests
+            (see get_eod_data_batched; defaults are used if omitted).
         """
         self.api_client = api_client
+        self.eod_batcher = EodBatcher(self, batch_settings)
 
     @allure.step("Send GET request to /eod endpoint")
     def get_eod_data(self, filters: EodFilters):
@@ -27,6 +39,25 @@ class MarketController:
         endpoint = "/eod"
         return self.api_client.get(endpoint, params=filters.serialize())
 
+    def get_eod_data_batched(self, filters: EodFilters):
+        """
+        Gets the end-of-day data of a single symbol, coalesced with the concurrent calls for other symbols and the
+        same filters into one multi-symbol /eod request (see EodBatcher).
+        The response is checked for status code 200 and deserialized.
+
+        :param filters: An EodFilters object with a single symbol.
+        :return: The EodResponseDTO holding the records of the symbol.
+        """
+        return self.eod_batcher.get_eod_data(filters)
+
+    def load_eod_response(self, response):
+        """
+        Verifies the status code of an /eod response and deserializes it to an EodResponseDTO.
+
+        :param response: The response of an /eod request.
+        """
+        return self._load_page(response, schemas.FastEodResponseLoader())
+
     @allure.step("Send GET request to /timezones endpoint")
     def get_timezones(self, filters: TimezoneFilters):
         """
@@ -37,3 +68,91 @@ class MarketController:
         """
         endpoint = "/timezones"
         return self.api_client.get(endpoint, params=filters.serialize())
+
+    @allure.step("Send streamed GET request to /eod endpoint")
+    def stream_eod_data(self, filters: EodFilters, chunk_size: int = EodStream.CHUNK_SIZE) -> EodStream:
+        """
+        Gets end-of-day data from the /eod endpoint, parsing the records incrementally while they download.
+
+        :param filters: An EodFilters object containing the query parameters.
+        :param chunk_size: Number of bytes read from the response at a time.
+        :return: An EodStream yielding validated EodDataDTO records (its 'response' holds the status code).
+        """
+        endpoint = "/eod"
+        response = self.api_client.get(endpoint, params=filters.serialize(), stream=True)
+        return EodStream(response, chunk_size=chunk_size)
+
+    def iter_eod_pages(self, filters: EodFilters, page_size: int | None = None, prefetch: bool = True,
+                       parallel_pages: int = 1, max_pages: int | None = None, columnar: bool = False):
+        """
+        Iterates over all the pages of the /eod endpoint, starting at filters.offset.
+        Every page is checked for status code 200 and deserialized to an EodResponseDTO.
+
+        :param filters: An EodFilters object containing the query parameters.
+        :param page_size: Records per page (defaults to filters.limit, or MAX_PAGE_SIZE).
+        :param prefetch: Whether to fetch the next page in the background while the current one is consumed.
+        :param parallel_pages: Number of pages fetched concurrently once the total is known.
+        :param max_pages: Optional maximum number of pages to fetch.
+        :param columnar: Whether the records of each page are returned as an EodColumns container.
+        :return: A generator of EodResponseDTO pages.
+        """
+        endpoint = "/eod"
+
+        def fetch_page(offset, limit):
+            return self.api_client.get(endpoint, params=replace(filters, offset=offset, limit=limit).serialize())
+
+        def load_page(response):
+            return self._load_page(response, schemas.FastEodResponseLoader(columnar=columnar))
+
+        return iter_pages(fetch_page, load_page,
+                          filters.offset or 0, page_size or filters.limit or self.MAX_PAGE_SIZE,
+                          prefetch, parallel_pages, max_pages)
+
+    def iter_eod_data(self, filters: EodFilters, **kwargs):
+        """
+        Streams the EodDataDTO records of all the pages of the /eod endpoint (see iter_eod_pages for the options).
+
+        :param filters: An EodFilters object containing the query parameters.
+        :return: A generator of EodDataDTO records.
+        """
+        for page in self.iter_eod_pages(filters, **kwargs):
+            yield from page.data
+
+    def iter_timezones_pages(self, filters: TimezoneFilters, page_size: int | None = None, prefetch: bool = True,
+                             parallel_pages: int = 1, max_pages: int | None = None):
+        """
+        Iterates over all the pages of the /timezones endpoint, starting at filters.offset.
+        Every page is checked for status code 200 and deserialized to a TimezonesResponseDTO.
+
+        :param filters: TimezoneFilters object containing query params.
+        :param page_size: Records per page (defaults to filters.limit, or MAX_PAGE_SIZE).
+        :param prefetch: Whether to fetch the next page in the background while the current one is consumed.
+        :param parallel_pages: Number of pages fetched concurrently once the total is known.
+        :param max_pages: Optional maximum number of pages to fetch.
+        :return: A generator of TimezonesResponseDTO pages.
+        """
+        endpoint = "/timezones"
+
+        def fetch_page(offset, limit):
+            return self.api_client.get(endpoint, params=replace(filters, offset=offset, limit=limit).serialize())
+
+        return iter_pages(fetch_page, lambda response: self._load_page(response, schemas.TimezonesResponseSchema()),
+                          filters.offset or 0, page_size or filters.limit or self.MAX_PAGE_SIZE,
+                          prefetch, parallel_pages, max_pages)
+
+    def iter_timezones(self, filters: TimezoneFilters, **kwargs):
+        """
+        Streams the TimezoneDataDTO records of all the pages of the /timezones endpoint
+        (see iter_timezones_pages for the options).
+
+        :param filters: TimezoneFilters object containing query params.
+        :return: A generator of TimezoneDataDTO records.
+        """
+        for page in self.iter_timezones_pages(filters, **kwargs):
+            yield from page.data
+
+    @staticmethod
+    def _load_page(response, schema):
+        """Verifies the status code of a page response and deserializes it."""
+        BaseAssertions.assert_status_code(response, 200)
+        return BaseAssertions.validate_and_deserialize(response.json(), schema)
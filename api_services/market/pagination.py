@@ -0,0 +1,57 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def iter_pages(fetch_page, load_page, start_offset: int, page_size: int, prefetch: bool = True,
+               parallel_pages: int = 1, max_pages: int | None = None):
+    """
+    Yields the deserialized pages of a paginated endpoint, from start_offset until pagination.total.
+
+    The first page is fetched alone, to learn the total. After that, up to `parallel_pages` next pages are fetched
+    in the background while the current one is consumed (one page ahead if prefetch is on and parallel_pages is 1).
+    At most that many pages are held in memory at once, whatever the total.
+
+    :param fetch_page: Function (offset, limit) -> response. Called from worker threads.
+    :param load_page: Function response -> response DTO with 'pagination' and 'data'. Called from the consumer thread.
+    :param start_offset: Offset of the first page.
+    :param page_size: Number of records requested per page (the 'limit' param).
+    :param prefetch: Whether to fetch the next pages in the background.
+    :param parallel_pages: Maximum number of pages fetched concurrently once the total is known.
+    :param max_pages: Optional maximum number of pages to fetch.
+    """
+    window = max(parallel_pages, 1) if prefetch else 0
+    executor = ThreadPoolExecutor(max_workers=max(window, 1), thread_name_prefix="page-prefetch")
+    pending = deque()
+    try:
+        page = load_page(fetch_page(start_offset, page_size))
+        yield page
+
+        total = page.pagination.total
+        if max_pages is not None:
+            total = min(total, start_offset + max_pages * page_size)
+        offsets = iter(range(start_offset + page_size, total, page_size))
+
+        while True:
+            # Keep the prefetch window full before handing the current page to the consumer
+            while len(pending) < window:
+                offset = next(offsets, None)
+                if offset is None:
+                    break
+                pending.append(executor.submit(fetch_page, offset, page_size))
+
+            if pending:
+                response = pending.popleft().result()
+            else:
+                offset = next(offsets, None)
+                if offset is None:
+                    return
+                response = fetch_page(offset, page_size)
+
+            page = load_page(response)
+            if not page.data:
+                return
+            yield page
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
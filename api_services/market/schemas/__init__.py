@@ -0,0 +1,53 @@
+"""
+Schemas and DTOs of the Market API responses.
+
+The names below are exported lazily: a schema module (and marshmallow) is only imported when one of its names is
+first used, e.g. `schemas.TimezonesResponseSchema()`, so modules that merely refer to the schemas do not slow down
+the startup and the test collection.
+"""
+import importlib
+
+# Exported name -> module of this package defining it (None for marshmallow)
+_EXPORTS = {
+    "PaginationDTO": "common_schemas",
+    "PaginationSchema": "common_schemas",
+    "EodDataDTO": "eod_response_schema",
+    "FrozenEodDataDTO": "eod_response_schema",
+    "EodResponseDTO": "eod_response_schema",
+    "EodDataSchema": "eod_response_schema",
+    "FrozenEodDataSchema": "eod_response_schema",
+    "EodResponseSchema": "eod_response_schema",
+    "FrozenEodResponseSchema": "eod_response_schema",
+    "EodColumns": "eod_columnar",
+    "EodColumnStore": "eod_columnar",
+    "EodRowView": "eod_columnar",
+    "FastEodResponseLoader": "eod_fast_loader",
+    "ErrorDetailsDTO": "error_response_schema",
+    "ErrorResponseDTO": "error_response_schema",
+    "ErrorDetailsSchema": "error_response_schema",
+    "ErrorResponseSchema": "error_response_schema",
+    "TimezoneDataDTO": "timezone_response_schema",
+    "FrozenTimezoneDataDTO": "timezone_response_schema",
+    "TimezonesResponseDTO": "timezone_response_schema",
+    "TimezoneDataSchema": "timezone_response_schema",
+    "FrozenTimezoneDataSchema": "timezone_response_schema",
+    "TimezonesResponseSchema": "timezone_response_schema",
+    "FrozenTimezonesResponseSchema": "timezone_response_schema",
+    "ValidationError": None,
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = _EXPORTS[name]
+    value = getattr(importlib.import_module(f"{__name__}.{module}" if module else "marshmallow"), name)
+    # Later lookups find the name directly, without calling __getattr__ again
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -3,7 +3,7 @@ from marshmallow import Schema, fields, post_load
 
 
 # DTO (Data Transfer Object)
-@dataclass
+@dataclass(slots=True)
 class PaginationDTO:
     """A dataclass to hold deserialized pagination data."""
     limit: int
@@ -0,0 +1,224 @@
+import bisect
+import math
+from array import array
+from dataclasses import fields
+from datetime import datetime, timezone
+from api_services.market.schemas.eod_response_schema import EodDataDTO
+
+FLOAT_COLUMNS = ("open", "high", "low", "close", "volume", "adj_high", "adj_low", "adj_close", "adj_open",
+                 "adj_volume", "split_factor", "dividend")
+STRING_COLUMNS = ("name", "exchange_code", "asset_type", "price_currency", "symbol", "exchange")
+# Nullable float columns store None as NaN (a real NaN is rejected by the schema, so it is never ambiguous)
+NULLABLE_FLOAT_COLUMNS = frozenset(field.name for field in fields(EodDataDTO)
+                                   if field.name in FLOAT_COLUMNS and field.type != float)
+# Code of a None value in the dictionary-encoded string columns
+NULL_CODE = -1
+
+
+class EodColumnStore:
+    """
+    The shared, append-only storage behind EodColumns views:
+    - a typed array('d') per float column (OHLC, adj_*, volume, split_factor, dividend),
+    - an array('i') of codes per string column, pointing into a table of interned strings (symbol, exchange, ...),
+    - an array('q') of epoch seconds (UTC) for the date.
+    """
+
+    def __init__(self):
+        self.floats = {name: array('d') for name in FLOAT_COLUMNS}
+        self.codes = {name: array('i') for name in STRING_COLUMNS}
+        self.dates = array('q')
+        self.strings = []
+        self._string_codes = {}
+
+    def __len__(self):
+        return len(self.dates)
+
+    def encode(self, value) -> int:
+        """Returns the code of a string value, adding it to the string table on first use."""
+        if value is None:
+            return NULL_CODE
+        code = self._string_codes.get(value)
+        if code is None:
+            code = self._string_codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def append(self, record):
+        """Appends one record, given as an EodDataDTO (or any object with the same attributes)."""
+        for name, column in self.floats.items():
+            value = getattr(record, name)
+            column.append(math.nan if value is None else value)
+        for name, column in self.codes.items():
+            column.append(self.encode(getattr(record, name)))
+        self.dates.append(int(record.date.timestamp()))
+
+    def append_values(self, values: dict):
+        """Appends one record, given as a dictionary of already validated field values."""
+        for name, column in self.floats.items():
+            value = values[name]
+            column.append(math.nan if value is None else value)
+        for name, column in self.codes.items():
+            column.append(self.encode(values[name]))
+        self.dates.append(int(values["date"].timestamp()))
+
+
+class EodRowView:
+    """
+    Lazy view of one row of an EodColumns container, with the same attributes as EodDataDTO.
+    Values are read from the columns on access, and it compares equal to the EodDataDTO with the same values.
+    """
+    __slots__ = ("_store", "_position")
+
+    def __init__(self, store: EodColumnStore, position: int):
+        self._store = store
+        self._position = position
+
+    @property
+    def date(self) -> datetime:
+        return datetime.fromtimestamp(self._store.dates[self._position], tz=timezone.utc)
+
+    def to_dto(self) -> EodDataDTO:
+        """Materializes the row as an EodDataDTO."""
+        return EodDataDTO(**{field.name: getattr(self, field.name) for field in fields(EodDataDTO)})
+
+    def __eq__(self, other):
+        if isinstance(other, (EodRowView, EodDataDTO)):
+            return all(getattr(self, field.name) == getattr(other, field.name) for field in fields(EodDataDTO))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"EodRowView({self.symbol!r}, {self.date.isoformat()})"
+
+
+def _float_getter(name, nullable):
+    def getter(self):
+        value = self._store.floats[name][self._position]
+        return None if nullable and math.isnan(value) else value
+    return property(getter)
+
+
+def _string_getter(name):
+    def getter(self):
+        code = self._store.codes[name][self._position]
+        return None if code == NULL_CODE else self._store.strings[code]
+    return property(getter)
+
+
+for _name in FLOAT_COLUMNS:
+    setattr(EodRowView, _name, _float_getter(_name, _name in NULLABLE_FLOAT_COLUMNS))
+for _name in STRING_COLUMNS:
+    setattr(EodRowView, _name, _string_getter(_name))
+
+
+class EodColumns:
+    """
+    Columnar (array-backed) container of EOD records, an alternative to list[EodDataDTO] for long histories.
+
+    It behaves like a read-only sequence of EodRowView (len, indexing, iteration), so it can be used as
+    EodResponseDTO.data with the existing assertions. Slicing by position, symbol or date range returns another
+    EodColumns view over the same store: contiguous selections share the underlying arrays (zero-copy), others only
+    hold an array of row positions.
+    """
+
+    def __init__(self, store: EodColumnStore, positions: range | array | None = None):
+        """
+        Initializes the EodColumns view.
+
+        :param store: The EodColumnStore holding the data.
+        :param positions: The store positions of the rows in this view (all rows if omitted).
+        """
+        self.store = store
+        self.positions = range(len(store)) if positions is None else positions
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds a container from EodDataDTO records."""
+        store = EodColumnStore()
+        for record in records:
+            store.append(record)
+        return cls(store)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __iter__(self):
+        store = self.store
+        return (EodRowView(store, position) for position in self.positions)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self._view(self.positions[item])
+        return EodRowView(self.store, self.positions[item])
+
+    def __eq__(self, other):
+        if isinstance(other, (EodColumns, list)):
+            return len(self) == len(other) and all(row == other_row for row, other_row in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"EodColumns({len(self)} rows)"
+
+    def _view(self, positions):
+        """Returns a view on the given positions, as a range (zero-copy) whenever they are contiguous."""
+        if isinstance(positions, range) or not positions:
+            return EodColumns(self.store, positions if isinstance(positions, range) else range(0))
+        first, last = positions[0], positions[-1]
+        if last - first + 1 == len(positions) and all(b - a == 1 for a, b in zip(positions, positions[1:])):
+            return EodColumns(self.store, range(first, last + 1))
+        return EodColumns(self.store, array('q', positions))
+
+    def column(self, name):
+        """
+        Returns the raw values of a column for the rows of this view: floats (NaN for None), string codes
+        (see strings_of) or epoch seconds for 'date'.
+        For contiguous views this is a zero-copy memoryview of the store arrays.
+        """
+        if name == "date":
+            values = self.store.dates
+        elif name in self.store.floats:
+            values = self.store.floats[name]
+        else:
+            values = self.store.codes[name]
+
+        if isinstance(self.positions, range) and self.positions.step == 1:
+            return memoryview(values)[self.positions.start:self.positions.stop]
+        return array(values.typecode, (values[position] for position in self.positions))
+
+    def strings_of(self, name) -> list:
+        """Returns the decoded values of a string column for the rows of this view."""
+        strings = self.store.strings
+        return [None if code == NULL_CODE else strings[code] for code in self.column(name)]
+
+    def for_symbol(self, symbol: str) -> "EodColumns":
+        """Returns the view of the rows of one symbol."""
+        code = self.store._string_codes.get(symbol)
+        codes = self.store.codes["symbol"]
+        return self._view([position for position in self.positions if codes[position] == code])
+
+    def between(self, date_from: datetime | None = None, date_to: datetime | None = None) -> "EodColumns":
+        """
+        Returns the view of the rows whose date is within [date_from, date_to] (both inclusive, None = unbounded).
+        Uses a binary search when the dates of the view are sorted (ascending or descending).
+        """
+        low = -math.inf if date_from is None else date_from.timestamp()
+        high = math.inf if date_to is None else date_to.timestamp()
+        dates = self.column("date")
+
+        if all(a <= b for a, b in zip(dates, dates[1:])):
+            start, stop = bisect.bisect_left(dates, low), bisect.bisect_right(dates, high)
+            return self._view(self.positions[start:stop])
+        if all(a >= b for a, b in zip(dates, dates[1:])):
+            start = bisect.bisect_left(dates, -high, key=lambda value: -value)
+            stop = bisect.bisect_right(dates, -low, key=lambda value: -value)
+            return self._view(self.positions[start:stop])
+        return self._view([position for position, date in zip(self.positions, dates) if low <= date <= high])
+
+    def to_dtos(self) -> list[EodDataDTO]:
+        """Materializes the rows of this view as a list of EodDataDTO."""
+        return [row.to_dto() for row in self]
+
+    def nbytes(self) -> int:
+        """Approximate size in bytes of the column arrays of the underlying store."""
+        store = self.store
+        arrays = [*store.floats.values(), *store.codes.values(), store.dates]
+        return sum(column.itemsize * len(column) for column in arrays)
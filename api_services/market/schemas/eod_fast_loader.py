@@ -0,0 +1,156 @@
+import math
+from marshmallow import fields
+from api_services.market.schemas.common_schemas import PaginationDTO, PaginationSchema
+from api_services.market.schemas.eod_columnar import EodColumns, EodColumnStore
+from api_services.market.schemas.eod_response_schema import EodResponseDTO, EodResponseSchema
+
+# Field kinds the fast path knows how to check
+FLOAT, INT, STR, DATETIME = "float", "int", "str", "datetime"
+FIELD_KINDS = {fields.Float: FLOAT, fields.Int: INT, fields.Str: STR, fields.DateTime: DATETIME}
+
+
+class FallbackToSchema(Exception):
+    """Raised by the fast path when a value needs the full marshmallow validation."""
+
+
+def compile_schema_fields(schema_class) -> tuple:
+    """
+    Precomputes (name, kind, allow_none, parse_datetime) for every field of a flat marshmallow schema.
+    The rules are read from the schema itself, so the fast path checks exactly the same required/nullable/type rules.
+    """
+    compiled = []
+    for name, field in schema_class._declared_fields.items():
+        kind = FIELD_KINDS[type(field)]
+        parse_datetime = None
+        if kind == DATETIME:
+            parse_datetime = fields.DateTime.DESERIALIZATION_FUNCS[field.format or field.DEFAULT_FORMAT]
+        compiled.append((name, kind, field.allow_none, parse_datetime))
+    return tuple(compiled)
+
+
+class FastEodResponseLoader:
+    """
+    Fast-path replacement for EodResponseSchema().load(), for large /eod payloads.
+
+    Every row is checked against the rules precomputed from the row schema, i.e. EodDataSchema (no unknown or missing
+    fields, nullability, float/str/datetime types) and built into an EodDataDTO directly, without marshmallow's per-field
+    machinery. Identical date strings are parsed once per payload.
+    Valid payloads produce the same DTOs (the row schema's dto_class) as the reference schema. As soon as a value
+    fails a check, the whole payload is loaded by the reference schema instead, so the ValidationError messages are
+    exactly the same.
+    """
+
+    def __init__(self, reference_schema: EodResponseSchema | None = None, columnar: bool = False):
+        """
+        Initializes the FastEodResponseLoader.
+
+        :param reference_schema: The marshmallow schema defining the rules and DTO classes, also used for invalid
+            payloads and parity checks (e.g., FrozenEodResponseSchema() for frozen records).
+        :param columnar: Whether load() returns the records as an EodColumns container (see load_columns).
+        """
+        self.reference_schema = reference_schema or EodResponseSchema()
+        self.columnar = columnar
+        self.row_schema = self.reference_schema.fields["data"].inner.schema
+        self._dto_class = self.row_schema.dto_class
+        self._row_fields = compile_schema_fields(type(self.row_schema))
+        self._row_field_names = frozenset(name for name, *_ in self._row_fields)
+        self._pagination_fields = compile_schema_fields(PaginationSchema)
+        self._pagination_field_names = frozenset(name for name, *_ in self._pagination_fields)
+
+    def load(self, json_data) -> EodResponseDTO:
+        """
+        Validates and deserializes an /eod response payload.
+
+        :raises marshmallow.ValidationError: With the same messages as EodResponseSchema, if the payload is invalid.
+        """
+        if self.columnar:
+            return self.load_columns(json_data)
+        try:
+            pagination, rows = self._fast_load(json_data)
+            return EodResponseDTO(pagination=pagination, data=[self._dto_class(**values) for values in rows])
+        except FallbackToSchema:
+            return self.reference_schema.load(json_data)
+
+    def load_columns(self, json_data) -> EodResponseDTO:
+        """
+        Like load(), but the records are returned as an EodColumns container instead of a list of EodDataDTO.
+
+        :raises marshmallow.ValidationError: With the same messages as EodResponseSchema, if the payload is invalid.
+        """
+        try:
+            pagination, rows = self._fast_load(json_data)
+            store = EodColumnStore()
+            for values in rows:
+                store.append_values(values)
+            return EodResponseDTO(pagination=pagination, data=EodColumns(store))
+        except FallbackToSchema:
+            response_dto = self.reference_schema.load(json_data)
+            return EodResponseDTO(pagination=response_dto.pagination, data=EodColumns.from_records(response_dto.data))
+
+    def load_row(self, row, parsed_dates: dict | None = None):
+        """
+        Validates and deserializes a single record of the 'data' list, falling back to the row schema if needed.
+
+        :param row: The record, as parsed from JSON.
+        :param parsed_dates: Optional cache of parsed date strings, shared between the records of a payload.
+        :raises marshmallow.ValidationError: With the messages of the row schema, if the record is invalid.
+        """
+        try:
+            return self._dto_class(**self._load_values(row, self._row_fields, self._row_field_names,
+                                                       {} if parsed_dates is None else parsed_dates))
+        except FallbackToSchema:
+            return self.row_schema.load(row)
+
+    def _fast_load(self, json_data) -> tuple:
+        """
+        Checks the payload and returns the PaginationDTO and a generator of the checked row values.
+        The rows are checked lazily, so FallbackToSchema can also be raised while consuming the generator.
+        """
+        if type(json_data) is not dict or json_data.keys() != {"pagination", "data"}:
+            raise FallbackToSchema()
+        rows = json_data["data"]
+        if type(rows) is not list:
+            raise FallbackToSchema()
+
+        pagination = PaginationDTO(**self._load_values(json_data["pagination"], self._pagination_fields,
+                                                       self._pagination_field_names, {}))
+        parsed_dates = {}
+        return pagination, (self._load_values(row, self._row_fields, self._row_field_names, parsed_dates)
+                            for row in rows)
+
+    @staticmethod
+    def _load_values(row, compiled_fields, field_names, parsed_dates) -> dict:
+        """Checks and converts the values of one object, raising FallbackToSchema on any doubt."""
+        if type(row) is not dict or row.keys() != field_names:
+            raise FallbackToSchema()
+
+        values = {}
+        for name, kind, allow_none, parse_datetime in compiled_fields:
+            value = row[name]
+            if value is None:
+                if not allow_none:
+                    raise FallbackToSchema()
+            elif kind == FLOAT:
+                value_type = type(value)
+                if value_type is int:
+                    value = float(value)
+                elif value_type is not float or not math.isfinite(value):
+                    raise FallbackToSchema()
+            elif kind == STR:
+                if type(value) is not str:
+                    raise FallbackToSchema()
+            elif kind == DATETIME:
+                if type(value) is not str:
+                    raise FallbackToSchema()
+                parsed = parsed_dates.get(value)
+                if parsed is None:
+                    try:
+                        parsed = parsed_dates[value] = parse_datetime(value)
+                    except (TypeError, ValueError):
+                        raise FallbackToSchema()
+                value = parsed
+            elif kind == INT:
+                if type(value) is not int:
+                    raise FallbackToSchema()
+            values[name] = value
+        return values
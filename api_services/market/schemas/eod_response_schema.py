@@ -2,10 +2,11 @@ from dataclasses import dataclass
 from datetime import datetime
 from marshmallow import Schema, fields, post_load, RAISE
 from api_services.market.schemas.common_schemas import PaginationSchema, PaginationDTO
+from utils.dataclass_factory import frozen_variant
 
 
 # Data Transfer Objects (DTOs)
-@dataclass
+@dataclass(slots=True)
 class EodDataDTO:
     """DTO for individual EOD data records."""
     open: float
@@ -29,7 +30,11 @@ class EodDataDTO:
     date: datetime
 
 
-@dataclass
+# Immutable, hashable variant of EodDataDTO (see FrozenEodDataSchema)
+FrozenEodDataDTO = frozen_variant(EodDataDTO)
+
+
+@dataclass(slots=True)
 class EodResponseDTO:
     """DTO for the entire /eod endpoint response."""
     pagination: PaginationDTO
@@ -42,6 +47,9 @@ class EodDataSchema(Schema):
     class Meta:
         unknown = RAISE
 
+    # DTO class built by make_dto, overridden by the frozen variant
+    dto_class = EodDataDTO
+
     open = fields.Float(required=True)
     high = fields.Float(required=True)
     low = fields.Float(required=True)
@@ -64,7 +72,12 @@ class EodDataSchema(Schema):
 
     @post_load
     def make_dto(self, data, **kwargs):
-        return EodDataDTO(**data)
+        return self.dto_class(**data)
+
+
+class FrozenEodDataSchema(EodDataSchema):
+    """Schema for individual EOD data objects, emitting immutable, hashable FrozenEodDataDTO records."""
+    dto_class = FrozenEodDataDTO
 
 
 class EodResponseSchema(Schema):
@@ -78,3 +91,8 @@ class EodResponseSchema(Schema):
     @post_load
     def make_dto(self, data, **kwargs):
         return EodResponseDTO(**data)
+
+
+class FrozenEodResponseSchema(EodResponseSchema):
+    """Schema for the entire /eod endpoint response, with FrozenEodDataDTO records."""
+    data = fields.List(fields.Nested(FrozenEodDataSchema), required=True)
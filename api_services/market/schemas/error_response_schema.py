@@ -3,13 +3,13 @@ from marshmallow import Schema, fields, post_load
 
 
 # DTOs
-@dataclass
+@dataclass(slots=True)
 class ErrorDetailsDTO:
     code: str
     message: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorResponseDTO:
     error: ErrorDetailsDTO
 
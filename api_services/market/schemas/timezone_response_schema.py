@@ -1,17 +1,22 @@
 from dataclasses import dataclass
 from marshmallow import Schema, fields, post_load
 from api_services.market.schemas.common_schemas import PaginationSchema, PaginationDTO
+from utils.dataclass_factory import frozen_variant
 
 
 # DTOs
-@dataclass
+@dataclass(slots=True)
 class TimezoneDataDTO:
     timezone: str
     abbr: str
     abbr_dst: str
 
 
-@dataclass
+# Immutable, hashable variant of TimezoneDataDTO (see FrozenTimezoneDataSchema)
+FrozenTimezoneDataDTO = frozen_variant(TimezoneDataDTO)
+
+
+@dataclass(slots=True)
 class TimezonesResponseDTO:
     pagination: PaginationDTO
     data: list[TimezoneDataDTO]
@@ -19,13 +24,20 @@ class TimezonesResponseDTO:
 
 # Schemas
 class TimezoneDataSchema(Schema):
+    # DTO class built by deserialize, overridden by the frozen variant
+    dto_class = TimezoneDataDTO
+
     timezone = fields.Str(required=True)
     abbr = fields.Str(required=True)
     abbr_dst = fields.Str(required=True)
 
     @post_load
     def deserialize(self, data, **kwargs):
-        return TimezoneDataDTO(**data)
+        return self.dto_class(**data)
+
+
+class FrozenTimezoneDataSchema(TimezoneDataSchema):
+    dto_class = FrozenTimezoneDataDTO
 
 
 class TimezonesResponseSchema(Schema):
@@ -35,3 +47,7 @@ class TimezonesResponseSchema(Schema):
     @post_load
     def deserialize(self, data, **kwargs):
         return TimezonesResponseDTO(**data)
+
+
+class FrozenTimezonesResponseSchema(TimezonesResponseSchema):
+    data = fields.List(fields.Nested(FrozenTimezoneDataSchema), required=True)
@@ -0,0 +1,104 @@
+"""
+Memory/allocation benchmark of the EOD record representations, at increasing numbers of rows held at once.
+
+Run it with:
+    python -m benchmarks.dto_memory --sizes 10000 100000 1000000
+
+Every row gets its own float objects (like rows parsed from JSON), while the strings and dates are shared between
+rows (like the fast loader does for repeated values), so the numbers show the cost of keeping the records alive.
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from api_services.market.schemas.eod_columnar import EodColumns, EodColumnStore
+from api_services.market.schemas.eod_fast_loader import FastEodResponseLoader
+from api_services.market.schemas.eod_response_schema import EodDataDTO, FrozenEodDataDTO
+from stub_server.dataset import SyntheticDataset
+
+# The pre-slots representation (plain @dataclass with a per-instance __dict__), as the baseline
+DictEodDataDTO = make_dataclass("DictEodDataDTO", [(field.name, field.type) for field in fields(EodDataDTO)])
+
+
+def sample_values(count: int = 1000) -> list[dict]:
+    """Returns the validated field values of `count` synthetic EOD rows."""
+    dataset = SyntheticDataset(symbols_count=4, days=count // 4 + 1)
+    rows = dataset.eod_rows(list(dataset.symbols))[:count]
+    payload = {"pagination": {"limit": count, "offset": 0, "count": count, "total": count}, "data": rows}
+    return [{field.name: getattr(record, field.name) for field in fields(EodDataDTO)}
+            for record in FastEodResponseLoader().load(payload).data]
+
+
+def fresh_rows(samples: list[dict], size: int):
+    """Yields `size` rows cycling over the samples, with new float objects for every row."""
+    for number in range(size):
+        values = dict(samples[number % len(samples)])
+        for name, value in values.items():
+            if type(value) is float:
+                values[name] = value + number * 1e-9
+        yield values
+
+
+def build_dtos(dto_class):
+    """Returns a builder of a list of `dto_class` records."""
+    def build(rows):
+        return [dto_class(**values) for values in rows]
+    return build
+
+
+def build_columns(rows):
+    """Builds an EodColumns container."""
+    store = EodColumnStore()
+    for values in rows:
+        store.append_values(values)
+    return EodColumns(store)
+
+
+VARIANTS = {
+    "dataclass (__dict__)": build_dtos(DictEodDataDTO),
+    "dataclass(slots=True)": build_dtos(EodDataDTO),
+    "frozen slots": build_dtos(FrozenEodDataDTO),
+    "columnar (EodColumns)": build_columns,
+}
+
+
+def measure(build, samples, size) -> dict:
+    """Builds `size` records with the given builder and measures the memory they keep alive."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    records = build(fresh_rows(samples, size))
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return {"retained_bytes": current, "peak_bytes": peak, "bytes_per_row": current / size, "build_seconds": elapsed}
+
+
+def main():
+    """Runs the benchmark and prints a table of the results."""
+    parser = argparse.ArgumentParser(description="Memory benchmark of the EOD record representations.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--json", dest="json_path", help="Optional path to write the results as JSON.")
+    args = parser.parse_args()
+
+    samples = sample_values()
+    results = []
+    print(f"{'rows':>10} | {'representation':<22} | {'retained MB':>11} | {'peak MB':>8} | {'B/row':>6} | {'build s':>7}")
+    for size in args.sizes:
+        for name, build in VARIANTS.items():
+            result = {"rows": size, "representation": name, **measure(build, samples, size)}
+            results.append(result)
+            print(f"{size:>10} | {name:<22} | {result['retained_bytes'] / 2**20:>11.1f} | "
+                  f"{result['peak_bytes'] / 2**20:>8.1f} | {result['bytes_per_row']:>6.0f} | "
+                  f"{result['build_seconds']:>7.2f}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as results_file:
+            json.dump(results, results_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
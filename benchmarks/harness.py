@@ -0,0 +1,118 @@
+"""
+Measurement, baseline storage and comparison helpers shared by the benchmarks.
+"""
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib import metadata
+from pathlib import Path
+
+
+def time_per_call(function, min_time: float = 0.2, repeat: int = 5, setup=None) -> float:
+    """
+    Returns the best time of one call of function(), in seconds.
+    The number of calls per round is calibrated so that a round lasts at least min_time / repeat seconds,
+    and the fastest of `repeat` rounds is kept (the others are slowed down by noise, not by the code).
+    setup(), if given, is called before every round, outside the measured time (e.g., to empty a recorder).
+    """
+    round_time = min_time / repeat
+    number = 1
+    while True:
+        elapsed = _time_round(function, number, setup)
+        if elapsed >= round_time:
+            break
+        number *= 2 if elapsed <= 0 else max(2, min(10, int(round_time / elapsed) + 1))
+    best = elapsed
+    for _ in range(repeat - 1):
+        best = min(best, _time_round(function, number, setup))
+    return best / number
+
+
+def _time_round(function, number, setup=None) -> float:
+    """Returns how long `number` calls of function() take, with the garbage collector disabled like timeit."""
+    if setup is not None:
+        setup()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for _ in range(number):
+            function()
+        return time.perf_counter() - started
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def peak_memory(function, setup=None) -> int:
+    """
+    Returns the peak memory allocated while function() runs (its result is kept alive until the end), in bytes.
+    setup(), if given, is called before, outside the measurement.
+    """
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def environment() -> dict:
+    """Returns the interpreter and library versions the results were measured with."""
+    versions = {}
+    for package in ("marshmallow", "requests", "urllib3"):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return {"python": sys.version.split()[0], "platform": platform.platform(), "machine": platform.machine(),
+            "measured_at": datetime.now(timezone.utc).isoformat(timespec="seconds"), **versions}
+
+
+def save_results(path, results: dict):
+    """Writes the results (with the environment they were measured in) as a JSON baseline."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"environment": environment(), "results": results}, indent=2, sort_keys=True))
+
+
+def load_results(path) -> dict:
+    """Reads a JSON baseline written by save_results()."""
+    return json.loads(Path(path).read_text())
+
+
+def compare_results(baseline: dict, current: dict, tolerance: float = 0.2, memory_tolerance: float = 0.2) -> list[dict]:
+    """
+    Compares the current results with a baseline, per stage and size.
+
+    :param baseline: The "results" of a baseline ({stage: {size: {"seconds_per_call": ..., "peak_bytes": ...}}}).
+    :param current: The current results, in the same format.
+    :param tolerance: Allowed slowdown, e.g. 0.2 flags the measurements more than 20% slower than the baseline.
+    :param memory_tolerance: Allowed growth of the peak memory.
+    :return: One row per measurement present in both, with the time and memory ratios and whether it regressed.
+    """
+    rows = []
+    for stage, sizes in current.items():
+        for size, result in sizes.items():
+            reference = baseline.get(stage, {}).get(size)
+            if reference is None:
+                continue
+            time_ratio = result["seconds_per_call"] / reference["seconds_per_call"]
+            memory_ratio = result["peak_bytes"] / reference["peak_bytes"] if reference["peak_bytes"] else 1.0
+            rows.append({
+                "stage": stage,
+                "size": size,
+                "time_ratio": round(time_ratio, 3),
+                "memory_ratio": round(memory_ratio, 3),
+                "regressed": time_ratio > 1 + tolerance or memory_ratio > 1 + memory_tolerance,
+            })
+    return rows
@@ -0,0 +1,316 @@
+"""
+Benchmark of the request -> validate -> DTO pipeline, stage by stage, offline.
+
+Every stage runs on payloads of increasing size (synthetic, or the /eod and /timezones responses of a recorded
+cassette), and reports its throughput (rows per second), its cost per row and the peak memory of one call.
+The APIClient stages go through the whole client (single-flight, timings, ...) down to a transport adapter that
+answers from memory, so they measure the client overhead without the network. The responses are built by urllib3
+and metered like network ones (gzip-encoded when the client accepts it), and the instrumented stages start every
+round of calls with empty recorders, so their cost does not grow with the number of calls.
+
+Run it with:
+    python -m benchmarks.pipeline --sizes 10 100 1000 --save benchmarks/baselines/pipeline.json
+    python -m benchmarks.pipeline --compare benchmarks/baselines/pipeline.json --tolerance 0.2
+    python -m benchmarks.pipeline --cassette cassettes/marketstack --stages fast_load/eod schema_load/eod
+
+In compare mode, the exit code is 1 if a stage got slower (or needed more memory) than the baseline beyond the
+tolerance, even after measuring it again (--confirm times). Timings depend on the machine: compare against a
+baseline measured on the same kind of runner.
+"""
+import argparse
+import gzip
+import io
+import json
+import sys
+from dataclasses import dataclass
+from datetime import timedelta
+from http.client import HTTPMessage
+from pathlib import Path
+from typing import Callable
+from urllib3 import HTTPResponse
+from api_services.client.api_client import APIClient
+from api_services.client.cassette import Cassette
+from api_services.client.compression import CompressionSettings, MeteredHTTPAdapter, TransferRecorder
+from api_services.client.single_flight import SingleFlight
+from api_services.client.tail_latency import TailLatencyPolicy
+from api_services.client.timing import TimingRecorder
+from api_services.market import schemas
+from api_services.market.filters.eod_filters import EodFilters
+from api_services.market.market_controller import MarketController
+from benchmarks.harness import compare_results, load_results, peak_memory, save_results, time_per_call
+from stub_server.dataset import TIMEZONES, SyntheticDataset
+
+BASE_URL = "http://benchmark.invalid"
+API_VERSION = "/v2"
+
+
+class InMemoryBody(io.BytesIO):
+    """
+    A response body read from memory, standing for the http.client response: it tells urllib3 when it is read,
+    and has the (empty) header message requests reads the cookies from.
+    """
+
+    def __init__(self, body: bytes):
+        super().__init__(body)
+        self.msg = HTTPMessage()
+
+    def isclosed(self) -> bool:
+        return self.closed
+
+
+class InMemoryAdapter(MeteredHTTPAdapter):
+    """
+    Metered transport adapter answering every request with the same body, without any network access.
+    The body is served as a urllib3 response through MeteredHTTPAdapter.build_response, like a network one, so its
+    decoding and byte metering are measured. There is no connection to open: the DNS/connect/TLS phases of the
+    timings are those of a reused connection (0).
+    """
+
+    def __init__(self, body: bytes):
+        super().__init__()
+        self.body = body
+        self.gzip_body = gzip.compress(body)
+
+    def send(self, request, stream=False, **kwargs):
+        headers = {"Content-Type": "application/json"}
+        body = self.body
+        if "gzip" in request.headers.get("Accept-Encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            body = self.gzip_body
+        headers["Content-Length"] = str(len(body))
+        body = InMemoryBody(body)
+        # The body is read (and closed) in chunks, then the "connection" released, as with a network response
+        raw = HTTPResponse(body, headers, status=200, reason="OK", preload_content=False, decode_content=False,
+                           original_response=body, request_method=request.method, request_url=request.url)
+        response = self.build_response(request, raw)
+        response.elapsed = timedelta(0)
+        return response
+
+
+@dataclass(frozen=True)
+class Payloads:
+    """Synthetic or recorded response payloads (as bytes) of one size."""
+    eod: bytes
+    timezones: bytes
+
+
+def synthetic_payloads(size: int) -> Payloads:
+    """Returns /eod and /timezones payloads of `size` records from the synthetic dataset."""
+    dataset = SyntheticDataset(symbols_count=max(size // 250 + 1, 1), days=min(size, 250))
+    rows = dataset.eod_rows(list(dataset.symbols))[:size]
+    timezones = [{"timezone": f"{timezone}/{number // len(TIMEZONES)}", "abbr": abbr, "abbr_dst": abbr_dst}
+                 for number, (timezone, abbr, abbr_dst) in zip(range(size), TIMEZONES * (size // len(TIMEZONES) + 1))]
+    return Payloads(eod=page(rows), timezones=page(timezones))
+
+
+def page(rows: list) -> bytes:
+    """Wraps the rows in a response page, as the API returns them."""
+    pagination = {"limit": max(len(rows), 1), "offset": 0, "count": len(rows), "total": len(rows)}
+    return json.dumps({"pagination": pagination, "data": rows}).encode()
+
+
+def recorded_payloads(cassette_path) -> dict[int, Payloads]:
+    """
+    Returns the largest recorded /eod response of the cassette per number of records, each paired with the
+    largest recorded /timezones response (the timezone list does not grow with the /eod sizes).
+    """
+    cassette_path = Path(cassette_path)
+    index = json.loads((cassette_path / Cassette.INDEX_FILE).read_text())
+    bodies = (cassette_path / Cassette.BODY_FILE).read_bytes()
+    eod, timezones = {}, b""
+    for fingerprint, entry in index.items():
+        if entry["status_code"] != 200:
+            continue
+        body = bodies[entry["offset"]:entry["offset"] + entry["length"]]
+        endpoint = fingerprint.split("?")[0]
+        if endpoint == "/eod":
+            eod[len(json.loads(body)["data"])] = body
+        elif endpoint == "/timezones" and len(body) > len(timezones):
+            timezones = body
+    if not eod or not timezones:
+        sys.exit(f"The cassette at {cassette_path} needs successful /eod and /timezones responses.")
+    return {size: Payloads(eod=body, timezones=timezones) for size, body in sorted(eod.items())}
+
+
+def make_client(body: bytes, instrumented: bool) -> APIClient:
+    """Builds an APIClient answered from memory, bare or with the instrumentation the test session uses."""
+    options = {}
+    if instrumented:
+        options = {"single_flight": SingleFlight(), "timings": TimingRecorder(), "tail_latency": TailLatencyPolicy(),
+                   "compression": CompressionSettings(), "transfers": TransferRecorder()}
+    api_client = APIClient(BASE_URL, API_VERSION, "benchmark-key", log_requests=False, **options)
+    api_client.session.mount(BASE_URL, InMemoryAdapter(body))
+    return api_client
+
+
+def rows_in(payload: bytes) -> int:
+    """Returns the number of records of a payload."""
+    return len(json.loads(payload)["data"])
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    A stage of the pipeline: `prepare(payloads, size)` returns the function to measure, the number of rows one
+    call of it processes and, optionally, a setup function called before every round of calls (not measured).
+    """
+    name: str
+    prepare: Callable
+
+
+def prepare_loader(loader_factory, payload_name, columnar=False):
+    """Returns the prepare function of a stage validating and deserializing an already decoded payload."""
+    def prepare(payloads, size):
+        payload = getattr(payloads, payload_name)
+        json_data = json.loads(payload)
+        loader = loader_factory()
+        load = loader.load_columns if columnar else loader.load
+        return lambda: load(json_data), rows_in(payload)
+    return prepare
+
+
+def prepare_json_decode(payloads, size):
+    return lambda: json.loads(payloads.eod), rows_in(payloads.eod)
+
+
+def prepare_filters_serialize(payloads, size):
+    filters = [EodFilters(symbols="AAPL", limit=number % 1000 + 1, sort="DESC") for number in range(size)]
+    return lambda: [item.serialize() for item in filters], size
+
+
+def prepare_client_get(instrumented):
+    """Returns the prepare function of a stage sending GET /eod through the APIClient."""
+    def prepare(payloads, size):
+        api_client = make_client(payloads.eod, instrumented)
+        params = EodFilters(symbols="AAPL", limit=size).serialize()
+        return lambda: api_client.get("/eod", dict(params)), rows_in(payloads.eod), reset_recorders(api_client)
+    return prepare
+
+
+def prepare_end_to_end(payloads, size):
+    api_client = make_client(payloads.eod, instrumented=True)
+    controller = MarketController(api_client)
+    filters = EodFilters(symbols="AAPL", limit=size)
+    return (lambda: controller.load_eod_response(controller.get_eod_data(filters)), rows_in(payloads.eod),
+            reset_recorders(api_client))
+
+
+def reset_recorders(api_client: APIClient):
+    """Returns a setup function giving the client new, empty timing and transfer recorders (if it has them)."""
+    def setup():
+        if api_client.timings is not None:
+            api_client.timings = TimingRecorder()
+        if api_client.transfers is not None:
+            api_client.transfers = TransferRecorder()
+    return setup
+
+
+STAGES = {stage.name: stage for stage in [
+    Stage("json_decode/eod", prepare_json_decode),
+    Stage("schema_load/eod", prepare_loader(lambda: schemas.EodResponseSchema(), "eod")),
+    Stage("fast_load/eod", prepare_loader(lambda: schemas.FastEodResponseLoader(), "eod")),
+    Stage("columnar_load/eod", prepare_loader(lambda: schemas.FastEodResponseLoader(), "eod", columnar=True)),
+    Stage("schema_load/timezones", prepare_loader(lambda: schemas.TimezonesResponseSchema(), "timezones")),
+    Stage("filters_serialize/eod", prepare_filters_serialize),
+    Stage("api_client_get/eod", prepare_client_get(instrumented=False)),
+    Stage("api_client_get_instrumented/eod", prepare_client_get(instrumented=True)),
+    Stage("end_to_end/eod", prepare_end_to_end),
+]}
+
+
+def run(payloads_by_size: dict[int, Payloads], stage_names=None, min_time: float = 0.2, repeat: int = 5) -> dict:
+    """
+    Measures the stages on the payloads of every size.
+
+    :return: {stage: {size: {"rows", "seconds_per_call", "rows_per_second", "us_per_row", "peak_bytes"}}}, with
+        the sizes as strings (as in the JSON baselines).
+    """
+    results = {}
+    for name in stage_names or STAGES:
+        stage = STAGES[name]
+        results[name] = {}
+        for size, payloads in payloads_by_size.items():
+            function, rows, *setup = stage.prepare(payloads, size)
+            setup = setup[0] if setup else None
+            function()  # Warm-up (imports, caches, connection setup)
+            seconds = time_per_call(function, min_time=min_time, repeat=repeat, setup=setup)
+            results[name][str(size)] = {
+                "rows": rows,
+                "seconds_per_call": seconds,
+                "rows_per_second": round(rows / seconds, 1) if seconds else None,
+                "us_per_row": round(seconds * 1e6 / max(rows, 1), 3),
+                "peak_bytes": peak_memory(function, setup=setup),
+            }
+    return results
+
+
+def format_results(results: dict) -> list[str]:
+    """Returns the results as human-readable lines."""
+    lines = [f"{'stage':<34} | {'size':>6} | {'ms/call':>9} | {'rows/s':>12} | {'us/row':>8} | {'peak KB':>9}"]
+    for stage, sizes in results.items():
+        for size, result in sizes.items():
+            lines.append(f"{stage:<34} | {size:>6} | {result['seconds_per_call'] * 1000:>9.3f} | "
+                         f"{result['rows_per_second'] or 0:>12,.0f} | {result['us_per_row']:>8.2f} | "
+                         f"{result['peak_bytes'] / 1024:>9.1f}")
+    return lines
+
+
+def format_comparison(rows: list[dict], tolerance: float) -> list[str]:
+    """Returns the comparison with the baseline as human-readable lines."""
+    lines = [f"{'stage':<34} | {'size':>6} | {'time':>7} | {'memory':>7} |"]
+    for row in rows:
+        flag = f"REGRESSION (> +{tolerance:.0%})" if row["regressed"] else ""
+        lines.append(f"{row['stage']:<34} | {row['size']:>6} | {row['time_ratio']:>6.2f}x | "
+                     f"{row['memory_ratio']:>6.2f}x | {flag}")
+    return lines
+
+
+def main(argv=None):
+    """Runs the benchmark, then saves it as a baseline and/or compares it with one."""
+    parser = argparse.ArgumentParser(description="Benchmark of the request -> validate -> DTO pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000],
+                        help="Records per synthetic payload.")
+    parser.add_argument("--cassette", help="Use the /eod and /timezones responses of a recorded cassette instead.")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), help="Stages to run (default: all).")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Measuring time per stage and size (seconds).")
+    parser.add_argument("--repeat", type=int, default=5, help="Rounds per measurement (the fastest one is kept).")
+    parser.add_argument("--save", help="Path to write the results as a JSON baseline.")
+    parser.add_argument("--compare", help="Path of a JSON baseline to compare the results with.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs. the baseline (0.2 = 20%%).")
+    parser.add_argument("--memory-tolerance", type=float, default=0.2, help="Allowed peak memory growth.")
+    parser.add_argument("--confirm", type=int, default=2,
+                        help="Times a slower measurement is taken again before it is reported as a regression.")
+    args = parser.parse_args(argv)
+
+    if args.cassette:
+        payloads_by_size = recorded_payloads(args.cassette)
+    else:
+        payloads_by_size = {size: synthetic_payloads(size) for size in args.sizes}
+    results = run(payloads_by_size, args.stages, args.min_time, args.repeat)
+    print("\n".join(format_results(results)))
+
+    if args.save:
+        save_results(args.save, results)
+    if args.compare:
+        baseline = load_results(args.compare)["results"]
+        rows = compare_results(baseline, results, args.tolerance, args.memory_tolerance)
+        for _ in range(args.confirm):
+            # A slowdown is only reported if it survives new measurements (the best time is kept), to rule out noise
+            regressed = [row for row in rows if row["regressed"]]
+            if not regressed:
+                break
+            for row in regressed:
+                size = int(row["size"])
+                result = run({size: payloads_by_size[size]}, [row["stage"]], args.min_time, args.repeat)
+                current = results[row["stage"]][row["size"]]
+                if result[row["stage"]][row["size"]]["seconds_per_call"] < current["seconds_per_call"]:
+                    results[row["stage"]][row["size"]] = result[row["stage"]][row["size"]]
+            rows = compare_results(baseline, results, args.tolerance, args.memory_tolerance)
+        print()
+        print("\n".join(format_comparison(rows, args.tolerance)))
+        if any(row["regressed"] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Import-time breakdown of the test collection (the startup cost paid by every pytest process and xdist worker).
+
+Run it with:
+    python -m benchmarks.startup --top 20
+    python -m benchmarks.startup -- tests/test_market_timezones_positive.py
+
+It collects the tests (without running them) under `python -X importtime`, and prints the import time per
+top-level package and the slowest modules. The setup time of the fixtures is reported by `pytest --profile-startup`.
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+from utils.startup_profile import import_time_by_package, parse_import_times
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def profile_collection(pytest_args: list[str]) -> dict:
+    """Collects the tests in a new interpreter and returns its wall time and import times."""
+    # -s: pytest captures stderr during the collection, which would hide the imports of conftest and test modules
+    command = [sys.executable, "-X", "importtime", "-m", "pytest", "--collect-only", "-q", "-s",
+               "-p", "no:cacheprovider", *pytest_args]
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True)
+    wall_seconds = time.perf_counter() - started
+    if completed.returncode != 0:
+        sys.exit(f"Collection failed:\n{completed.stdout}")
+
+    imports = parse_import_times(completed.stderr)
+    return {"wall_ms": round(wall_seconds * 1000, 1),
+            "import_ms": round(sum(self_us for _, self_us, _ in imports) / 1000, 1),
+            "packages_ms": {package: round(self_us / 1000, 1)
+                            for package, self_us in import_time_by_package(imports).items()},
+            "modules_ms": {module: round(cumulative_us / 1000, 1) for module, _, cumulative_us in
+                           sorted(imports, key=lambda item: item[2], reverse=True)}}
+
+
+def main():
+    """Profiles the collection and prints the slowest packages and modules."""
+    parser = argparse.ArgumentParser(description="Import-time breakdown of the pytest collection.")
+    parser.add_argument("--top", type=int, default=15, help="Number of packages and modules to list.")
+    parser.add_argument("--json", dest="json_path", help="Optional path to write the results as JSON.")
+    parser.add_argument("pytest_args", nargs="*", help="Arguments passed to pytest (after --).")
+    args = parser.parse_args()
+
+    result = profile_collection(args.pytest_args)
+    print(f"Collection: {result['wall_ms']:.0f} ms wall, {result['import_ms']:.0f} ms importing modules")
+    print(f"\n{'package (self time)':<40} | {'ms':>7}")
+    for package, ms in list(result["packages_ms"].items())[:args.top]:
+        print(f"{package:<40} | {ms:>7.1f}")
+    print(f"\n{'module (cumulative time)':<40} | {'ms':>7}")
+    for module, ms in list(result["modules_ms"].items())[:args.top]:
+        print(f"{module:<40} | {ms:>7.1f}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as results_file:
+            json.dump(result, results_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
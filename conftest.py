@@ -1,44 +1,187 @@
 import pytest
-import requests
-import configparser
+import allure
+import json
 import os
+import time
 from pathlib import Path
+from api_services.client.api_client import APIClient, PoolSettings
+from api_services.client.async_api_client import AsyncAPIClient
+from api_services.client.cassette import Cassette, CassetteMode
+from api_services.client.compression import CompressionSettings, TransferRecorder
+from api_services.client.rate_limiter import RateLimiter, RateLimitSettings
+from api_services.client.request_log import RequestLog
+from api_services.client.response_cache import CacheSettings, ResponseCache
+from api_services.client.single_flight import SingleFlight
+from api_services.client.tail_latency import TailLatencyPolicy, TailLatencySettings
+from api_services.client.timing import SloSettings, TimingRecorder
 from enums.environment import Env
-from dotenv import load_dotenv
-
-
-class APIClient:
-    """Responsible for making requests to the API, handling URL construction."""
-
-    def __init__(self, base_url, api_version, access_key):
-        """
-        Initializes the APIClient.
-
-        :param base_url: The base URL for the API (e.g., https://api.marketstack.com).
-        :param api_version: The version of the API to use (e.g., /v1/).
-        :param access_key: The API access key for authentication.
-        """
-        self.base_url = base_url
-        self.api_version = api_version
-        self.access_key = access_key
-
-    def get(self, endpoint, params=None):
-        """
-        Makes a GET request. The access_key is added automatically.
+from utils.run_context import is_xdist_worker
+from utils.startup_profile import StartupProfile
+from utils.settings import Settings, SettingsError, export_settings, get_settings
+
+# The stub server, snapshot, test cost and shared cache modules (and their dependencies, e.g. sqlite3 and the
+# pytest-xdist scheduler) are imported by the hooks and fixtures that use them, to keep the test collection fast
+
+# Key under which the session APIClient is kept, so the terminal summary can report its activity
+api_client_key = pytest.StashKey[APIClient]()
+# Key under which the startup profile is kept when --profile-startup is given
+startup_profile_key = pytest.StashKey[StartupProfile]()
+# Key under which the requests of every test are logged, when the test cost history is recorded
+request_log_key = pytest.StashKey[RequestLog]()
+# Key under which the main process aggregates the test reports into the test cost history
+cost_recorder_key = pytest.StashKey["CostRecorder"]()
+# Key under which the scheduler is kept when --balance-by-cost is given, so the terminal summary can report its plan
+scheduler_key = pytest.StashKey["CostBalancedScheduling"]()
+
+
+def pytest_addoption(parser):
+    """Registers the command line options of the framework."""
+    parser.addoption(
+        "--cassette-mode",
+        choices=[mode.value for mode in CassetteMode],
+        default=None,
+        help="live: call the API; record: call the API and store the responses in the cassette; "
+             "replay: serve the responses from the cassette without network access. "
+             "Overrides 'cassette_mode' from config.ini.",
+    )
+    parser.addoption(
+        "--update-snapshots",
+        action="store_true",
+        default=False,
+        help="Write the golden snapshots compared by the 'snapshots' fixture, instead of comparing them.",
+    )
+    parser.addoption(
+        "--balance-by-cost",
+        action="store_true",
+        default=False,
+        help="With -n, give every pytest-xdist worker a balanced share of the tests, from the durations and "
+             "shared requests recorded by the previous runs ('test_cost_history_path' in config.ini).",
+    )
+    parser.addoption(
+        "--profile-startup",
+        action="store_true",
+        default=False,
+        help="Report the collection time and the setup time of every fixture in the terminal summary.",
+    )
+
+
+def pytest_configure(config):
+    """
+    Resolves the settings once in the main process and hands them to the pytest-xdist workers,
+    so the workers do not parse the .env and config.ini files again.
+    Unless 'test_cost_history_path' is empty, the requests of every test are logged, and the main process records
+    the cost of the tests at the end of the run.
+    """
+    if config.getoption("--profile-startup"):
+        config.stash[startup_profile_key] = StartupProfile()
+    if is_xdist_worker() and config.getoption("--balance-by-cost"):
+        # Report the xdist_group of the tests as a '@<group>' node id suffix (as --dist loadgroup), for the bins
+        config.option.loadgroup = True
+    if not is_xdist_worker():
+        try:
+            export_settings(get_settings(config.rootpath))
+        except SettingsError:
+            # Reported by the 'settings' fixture, in the tests that need it
+            pass
+        cassette_path = recording_cassette_path(config)
+        if cassette_path is not None:
+            Cassette.discard_parts(cassette_path)
+
+    history = cost_history(config)
+    if history is not None:
+        config.stash[request_log_key] = RequestLog()
+        if not is_xdist_worker():
+            from utils.test_costs import CostRecorder
+
+            # Registered as a plugin, to receive the reports of all the tests
+            config.stash[cost_recorder_key] = CostRecorder(history)
+            config.pluginmanager.register(config.stash[cost_recorder_key], "test_cost_recorder")
+
+
+def recording_cassette_path(config) -> Path | None:
+    """Returns the path of the cassette if the run records one (--cassette-mode or 'cassette_mode'), else None."""
+    try:
+        section = get_settings(config.rootpath).config
+    except SettingsError:
+        return None
+    mode = config.getoption("--cassette-mode") or section.get('cassette_mode', fallback=CassetteMode.LIVE.value)
+    if CassetteMode(mode) != CassetteMode.RECORD:
+        return None
+    return config.rootpath / section.get('cassette_path', fallback='cassettes/marketstack')
 
-        :param endpoint: The API endpoint (e.g., /eod).
-        :param params: A dictionary of query parameters.
-        :return: The response object from requests.
-        """
-        if params is None:
-            params = {}
 
-        # Automatically add the access key to every request
-        params['access_key'] = self.access_key
+def cost_history(config):
+    """Returns the test cost history of the target environment, or None if it is disabled (or not configured)."""
+    from utils.test_costs import CostHistory, CostSettings
 
-        url = f"{self.base_url}{self.api_version}{endpoint}"
-        print("Request URL:", url)
-        return requests.get(url, params=params)
+    try:
+        cost_settings = CostSettings.from_config(get_settings(config.rootpath).config)
+    except SettingsError:
+        return None
+    if not cost_settings.history_path:
+        return None
+    return CostHistory(config.rootpath / cost_settings.history_path, cost_settings.smoothing)
+
+
+@pytest.hookimpl(tryfirst=True, optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """With --balance-by-cost, replaces the default pytest-xdist scheduling (--dist load) by CostBalancedScheduling."""
+    if not config.getoption("--balance-by-cost") or config.getoption("dist") not in ("load", "loadgroup"):
+        return None
+    from utils.cost_scheduling import CostBalancedScheduling
+
+    recorder = config.stash.get(cost_recorder_key, None)
+    config.stash[scheduler_key] = CostBalancedScheduling(config, log, recorder.history if recorder else None)
+    return config.stash[scheduler_key]
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Adds the API requests of the test to its teardown report, for the test cost history."""
+    outcome = yield
+    request_log = item.config.stash.get(request_log_key, None)
+    if request_log is not None and call.when == "teardown":
+        from utils.test_costs import FINGERPRINTS_PROPERTY, REQUESTS_PROPERTY
+
+        requests, fingerprints = request_log.pop(item.nodeid)
+        outcome.get_result().user_properties.extend([(REQUESTS_PROPERTY, requests),
+                                                     (FINGERPRINTS_PROPERTY, fingerprints)])
+
+
+def pytest_sessionfinish(session):
+    """
+    Writes the test cost history recorded by the main process, and merges the cassette parts recorded by the
+    pytest-xdist workers.
+    """
+    recorder = session.config.stash.get(cost_recorder_key, None)
+    if recorder is not None:
+        recorder.save()
+    cassette_path = recording_cassette_path(session.config) if not is_xdist_worker() else None
+    if cassette_path is not None:
+        Cassette.merge_parts(cassette_path)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    """Times the collection for --profile-startup."""
+    profile = session.config.stash.get(startup_profile_key, None)
+    started = time.perf_counter()
+    yield
+    if profile is not None:
+        profile.collection_seconds = time.perf_counter() - started
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    """Times the setup of every fixture for --profile-startup."""
+    profile = request.config.stash.get(startup_profile_key, None)
+    if profile is None:
+        yield
+        return
+    profile.record_first_test()
+    started = time.perf_counter()
+    yield
+    profile.record_fixture(fixturedef, time.perf_counter() - started)
 
 
 @pytest.fixture(scope="session")
@@ -48,81 +191,60 @@ def project_root(pytestconfig) -> Path:
 
 
 @pytest.fixture(scope="session")
-def env(project_root):
-    """Loads the environment from the .env file and validates it."""
-    env_path = project_root / ".env"
-    print(f"Looking for .env file at: {env_path}")
+def settings(project_root) -> Settings:
+    """
+    Provides the settings of the run (environment from the .env file and its section of config.ini).
+    They are resolved once per process, and the pytest-xdist workers reuse the ones of the main process.
+    """
+    try:
+        return get_settings(project_root)
+    except SettingsError as error:
+        pytest.fail(str(error))
 
-    if not env_path.exists():
-        pytest.fail(f"The .env file is missing at: {env_path}. Please create it and set the ENV variable.")
 
-    load_dotenv(dotenv_path=env_path)
-    env_value = os.getenv("ENV")
+@pytest.fixture(scope="session")
+def env(project_root, settings):
+    """Provides the environment from the .env file."""
+    print(f"Looking for .env file at: {project_root / '.env'}")
+    return settings.env
 
-    if not env_value:
-        pytest.fail("The ENV variable is not set in the .env file.")
 
-    try:
-        return Env(env_value)
-    except ValueError:
-        valid_envs = [e.value for e in Env]
-        pytest.fail(f"Invalid ENV value '{env_value}' in .env file. Must be one of: {valid_envs}")
+@pytest.fixture(scope="session")
+def config(settings):
+    """Provides the (read-only) configuration from config.ini for the specified environment."""
+    return settings.config
 
 
 @pytest.fixture(scope="session")
-def config(env, project_root):
-    """Loads the configuration from config.ini for the specified environment."""
-    config = configparser.ConfigParser()
-    config_path = project_root / 'config.ini'
-    config.read(config_path)
-
-    return config[env.value]
+def secrets(settings):
+    """Provides the secrets from secrets.ini for the specified environment (read and validated on first use)."""
+    try:
+        return {"access_key": settings.access_key}
+    except SettingsError as error:
+        pytest.fail(str(error))
 
 
 @pytest.fixture(scope="session")
-def secrets(env, project_root):
-    """Loads secrets from secrets.ini for the specified environment."""
-    secrets = configparser.ConfigParser()
-    secrets_path = project_root / 'secrets.ini'
-    read_files = secrets.read(secrets_path)
-
-    if not read_files:
-        pytest.fail(
-            f"Could not find or read secrets.ini at: {secrets_path}.\n"
-            f"Please create it or copy from secrets.ini.example file and set variables (i.e. API_ACCESS_KEY).")
-    env_name = env.value
-    if env_name not in secrets:
-        pytest.fail(
-            f"\n\n[VALIDATION ERROR]\nThe section [{env.value}] is MISSING from your secrets.ini file."
-            f"\nPlease add this section.\n"
-        )
-
-    env_object = secrets[env_name]
-    # Check if the key is missing entirely
-    if 'access_key' not in env_object:
-        pytest.fail(
-            f"\n\n[VALIDATION ERROR]"
-            f"\nThe 'access_key' property is MISSING from the [{env_name}] section in your secrets.ini file."
-            f"\nPlease add it: `access_key = YOUR_KEY`\n")
-    access_key_val = env_object['access_key']
-
-    # Check if the value is empty
-    if not access_key_val:
-        pytest.fail(
-            f"\n\n[VALIDATION ERROR] The 'access_key' property in the [{env_name}] section of secrets.ini is EMPTY."
-            f"\nPlease provide your API key.\n")
-
-    # Check if it's still the placeholder value from your example
-    if access_key_val == 'API_ACCESS_KEY':
-        pytest.fail(f"\n\n[VALIDATION ERROR] The 'access_key' in the [{env_name}] section of secrets.ini "
-                    f"is still set to the placeholder 'API_ACCESS_KEY'.\nPlease replace it with your real API key.\n")
-
-    return env_object
+def stub_server(env, config):
+    """
+    Starts the local Marketstack stand-in server for ENV=local, for the whole session.
+    Provides None for the other environments.
+    """
+    if env != Env.LOCAL:
+        yield None
+        return
+    from stub_server.server import MarketstackStub, StubSettings
+
+    stub = MarketstackStub(StubSettings.from_config(config)).start()
+    yield stub
+    stub.stop()
 
 
 @pytest.fixture(scope="session")
-def base_url(config):
-    """Provides the base_url from the config."""
+def base_url(config, stub_server):
+    """Provides the base_url from the config (or of the local stand-in server)."""
+    if stub_server is not None:
+        return stub_server.base_url
     return config['base_url']
 
 
@@ -133,12 +255,147 @@ def api_version(config):
 
 
 @pytest.fixture(scope="session")
-def access_key(secrets):
-    """Provides the access_key from the secrets."""
-    return secrets['access_key']
+def access_key(request, stub_server):
+    """Provides the access_key from the secrets (or the one accepted by the local stand-in server)."""
+    if stub_server is not None:
+        return stub_server.settings.access_key
+    return request.getfixturevalue("secrets")['access_key']
+
+
+@pytest.fixture(scope="session")
+def cassette_mode(config, pytestconfig):
+    """Provides the cassette mode, from the --cassette-mode option or else from the config."""
+    mode = pytestconfig.getoption("--cassette-mode") or config.get('cassette_mode', fallback=CassetteMode.LIVE.value)
+    return CassetteMode(mode)
+
+
+@pytest.fixture(scope="session")
+def cassette(cassette_mode, config, project_root):
+    """
+    Provides the Cassette to record to or replay from, or None in live mode.
+    When recording, every pytest-xdist worker records its own part of the cassette, and the main process merges
+    the parts at the end of the run.
+    """
+    if cassette_mode == CassetteMode.LIVE:
+        return None
+    part = os.environ["PYTEST_XDIST_WORKER"] if cassette_mode == CassetteMode.RECORD and is_xdist_worker() else None
+    return Cassette(project_root / config.get('cassette_path', fallback='cassettes/marketstack'), cassette_mode, part)
+
+
+@pytest.fixture(scope="session")
+def api_client(request, env, base_url, api_version, config, cassette, pytestconfig, project_root):
+    """
+    Provides an instance of the APIClient, configured for the target environment.
+    Its connection pool is shared by the whole session and closed at the end of it.
+    Successful responses are cached for the session if `cache_enabled` is set in the config (and shared between
+    the pytest-xdist workers of the run if `cache_shared` is set too),
+    and requests are throttled to the rate limit and budget of the config if `rate_limit_enabled` is set.
+    Identical requests in flight share one call unless `single_flight_enabled` is false.
+    Requests time out after a multiple of the observed response times of their endpoint (`timeout_*` keys), and
+    requests slower than the p95 are hedged with a duplicate if `hedge_enabled` is set.
+    Compressed responses are accepted as set by `compression_*`, and the bytes transferred per endpoint (on the wire
+    and decoded) are reported at the end of the session unless `transfer_stats_enabled` is false.
+    Unless `timing_enabled` is false, the phases of every request are timed, and the latency percentiles per
+    endpoint are attached to the Allure report at the end of the session.
+    """
+    # Replayed runs never reach the API, so they do not require secrets.ini
+    if cassette is not None and cassette.mode == CassetteMode.REPLAY:
+        access_key = None
+    else:
+        access_key = request.getfixturevalue("access_key")
+
+    cache_settings = CacheSettings.from_config(config)
+    cache = ResponseCache(cache_settings) if cache_settings.enabled else None
+    # Only xdist workers have other processes to share the responses with
+    shared_cache = None
+    if cache and cache_settings.shared and is_xdist_worker():
+        from api_services.client.shared_cache import SharedResponseCache
+
+        shared_cache = SharedResponseCache(cache_settings)
+    rate_limit_settings = RateLimitSettings.from_config(config)
+    rate_limiter = None
+    if rate_limit_settings.enabled:
+        usage_path = rate_limit_settings.monthly_usage_path
+        rate_limiter = RateLimiter(rate_limit_settings, usage_path=project_root / usage_path if usage_path else None)
+    timings = TimingRecorder(env.value) if config.getboolean('timing_enabled', fallback=True) else None
+    single_flight = SingleFlight() if config.getboolean('single_flight_enabled', fallback=True) else None
+    tail_latency_settings = TailLatencySettings.from_config(config)
+    tail_latency = None
+    if tail_latency_settings.timeout_enabled or tail_latency_settings.hedge_enabled:
+        tail_latency = TailLatencyPolicy(tail_latency_settings)
+    transfers = TransferRecorder() if config.getboolean('transfer_stats_enabled', fallback=True) else None
+    client = APIClient(base_url, api_version, access_key, pool_settings=PoolSettings.from_config(config),
+                       cache=cache, cassette=cassette, rate_limiter=rate_limiter, timings=timings,
+                       single_flight=single_flight, shared_cache=shared_cache, tail_latency=tail_latency,
+                       compression=CompressionSettings.from_config(config), transfers=transfers,
+                       request_log=pytestconfig.stash.get(request_log_key, None))
+    pytestconfig.stash[api_client_key] = client
+    yield client
+    client.close()
+
+    if timings is not None and timings.records:
+        allure.attach(json.dumps(timings.report(), indent=2), name="API latency percentiles (ms)",
+                      attachment_type=allure.attachment_type.JSON)
+        allure.attach(timings.to_csv(), name="API request timings (ms)", attachment_type=allure.attachment_type.CSV)
+    if transfers is not None and transfers.records:
+        allure.attach(json.dumps(transfers.report(), indent=2), name="API bytes transferred",
+                      attachment_type=allure.attachment_type.JSON)
+
+
+@pytest.fixture(scope="session")
+def slo(config):
+    """Provides the latency and payload size objectives of the target environment (`slo_*` keys of the config)."""
+    return SloSettings.from_config(config)
+
+
+@pytest.fixture(scope="session")
+def snapshots(config, project_root, pytestconfig):
+    """
+    Provides the SnapshotStore of the target environment (`snapshot_path` of the config), to compare responses
+    with their golden snapshots (or to record them, with --update-snapshots).
+    """
+    from utils.snapshots import SnapshotStore
+
+    return SnapshotStore(project_root / config.get('snapshot_path', fallback='snapshots'),
+                         update=pytestconfig.getoption("--update-snapshots"))
 
 
 @pytest.fixture(scope="session")
-def api_client(base_url, api_version, access_key):
-    """Provides an instance of the APIClient, configured for the target environment."""
-    return APIClient(base_url, api_version, access_key)
+def async_api_client(api_client, config):
+    """
+    Provides an AsyncAPIClient sharing the session APIClient, for concurrent request fan-out.
+    The number of requests in flight is capped by `max_concurrency` from the config.
+    """
+    client = AsyncAPIClient(api_client, max_concurrency=config.getint('max_concurrency', fallback=10))
+    yield client
+    client.close()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Reports the APIClient activity (connection reuse etc.), the startup profile and the balance of the pytest-xdist
+    workers at the end of the run.
+    """
+    profile = config.stash.get(startup_profile_key, None)
+    if profile is not None:
+        terminalreporter.section("Startup profile")
+        for line in profile.summary_lines():
+            terminalreporter.write_line(line)
+
+    recorder = config.stash.get(cost_recorder_key, None)
+    if recorder is not None and len(recorder.worker_loads) > 1:
+        terminalreporter.section("Test costs")
+        scheduler = config.stash.get(scheduler_key, None)
+        if scheduler is not None and scheduler.plan is not None:
+            terminalreporter.write_line("Planned busy time per worker: " +
+                                        ", ".join(f"{seconds:.1f}s" for seconds in scheduler.plan.loads))
+        for line in recorder.summary_lines():
+            terminalreporter.write_line(line)
+
+    client = config.stash.get(api_client_key, None)
+    if client is None:
+        return
+
+    terminalreporter.section("API client")
+    for line in client.summary_lines():
+        terminalreporter.write_line(line)
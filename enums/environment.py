@@ -5,3 +5,5 @@ class Env(Enum):
     DEV = "dev"
     STAGE = "stage"
     PROD = "prod"
+    OFFLINE = "offline"
+    LOCAL = "local"
@@ -0,0 +1,126 @@
+"""
+Load-test entry point, driving the MarketController against an environment of config.ini.
+
+Run it with:
+    python -m load_test --env local --rps 50 --duration 30 --mix eod=70,timezones=30
+    python -m load_test --env stage --concurrency 8 --duration 60 --json load-report.json
+
+With --env local, the local stand-in server is started for the run (no secrets.ini needed); the other environments
+read the access_key from secrets.ini.
+"""
+import argparse
+import configparser
+import json
+import os
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+from api_services.client.api_client import APIClient, PoolSettings
+from api_services.market.market_controller import MarketController
+from enums.environment import Env
+from load_test.runner import PERCENTILES, LoadSettings, LoadTestRunner
+from load_test.scenarios import parse_mix
+from stub_server.dataset import KNOWN_SYMBOLS
+from stub_server.server import MarketstackStub, StubSettings
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_args(argv=None):
+    """Parses the command line options."""
+    load_dotenv(PROJECT_ROOT / ".env")
+    parser = argparse.ArgumentParser(description="Load test of the Marketstack API through the MarketController.")
+    parser.add_argument("--env", default=os.getenv("ENV", Env.LOCAL.value), choices=[env.value for env in Env],
+                        help="config.ini section of the target environment (default: ENV from .env).")
+    parser.add_argument("--mix", default="eod=70,timezones=30", type=parse_mix,
+                        help="Scenario weights, e.g. 'eod=70,timezones=30'.")
+    parser.add_argument("--rps", type=float, default=LoadSettings.rps,
+                        help="Requests started per second (open loop).")
+    parser.add_argument("--concurrency", type=int,
+                        help="Number of concurrent users (closed loop). Overrides --rps.")
+    parser.add_argument("--duration", type=float, default=LoadSettings.duration, help="Duration in seconds.")
+    parser.add_argument("--max-in-flight", type=int, default=LoadSettings.max_in_flight,
+                        help="Maximum number of requests in flight in open loop.")
+    parser.add_argument("--validate-sample", type=float, default=LoadSettings.validate_sample,
+                        help="Share of the successful responses validated with the schemas (0-1).")
+    parser.add_argument("--symbols", help="Comma-separated symbols of the /eod scenario "
+                                          "(default: the stub dataset for local, otherwise well-known symbols).")
+    parser.add_argument("--retries", type=int, default=0,
+                        help="Retries of the failed requests (429/5xx, connection errors). Default 0, so that the "
+                             "report counts every failure and the latencies include no hidden backoff.")
+    parser.add_argument("--seed", type=int, default=LoadSettings.seed, help="Seed of the scenario choices.")
+    parser.add_argument("--json", type=Path, help="Also write the report to this JSON file.")
+    return parser.parse_args(argv)
+
+
+def read_access_key(env: Env) -> str:
+    """Reads the access_key of the environment from secrets.ini."""
+    secrets = configparser.ConfigParser()
+    secrets.read(PROJECT_ROOT / "secrets.ini")
+    access_key = secrets.get(env.value, "access_key", fallback=None)
+    if not access_key or access_key == "API_ACCESS_KEY":
+        sys.exit(f"Set the access_key of the [{env.value}] section in secrets.ini to load test '{env.value}'.")
+    return access_key
+
+
+def format_report(report: dict) -> list[str]:
+    """Returns the report as human-readable lines."""
+    lines = [f"Load test: {report['mode']} for {report['duration_s']:.1f}s, {report.get('retries', 0)} retries"]
+    header = "  ".join(f"{f'p{pct}':>7}" for pct in PERCENTILES)
+    lines.append(f"{'scenario':<12}{'requests':>9}{'rps':>9}{'errors':>9}{'validated':>11}   latency (ms) {header}")
+    for name, group in report.items():
+        if not isinstance(group, dict):
+            continue
+        values = "  ".join(f"{group['latency_ms'][f'p{pct}']:7.1f}" for pct in PERCENTILES)
+        lines.append(f"{name:<12}{group['requests']:>9}{group['throughput_rps']:>9.1f}"
+                     f"{group['error_rate']:>9.2%}{group['validated']:>11}                {values}")
+        for error, count in group["errors"].items():
+            lines.append(f"{'':<12}{count:>9} x {error}")
+    return lines
+
+
+def main(argv=None):
+    """Runs the load test and prints (and optionally writes) its report."""
+    args = parse_args(argv)
+    env = Env(args.env)
+    if env == Env.OFFLINE:
+        sys.exit("The offline environment replays a cassette; pick an environment with a server to load test.")
+
+    config = configparser.ConfigParser()
+    config.read(PROJECT_ROOT / "config.ini")
+    env_config = config[env.value]
+
+    stub = MarketstackStub(StubSettings.from_config(env_config)).start() if env == Env.LOCAL else None
+    try:
+        if stub is not None:
+            base_url, access_key, symbols = stub.base_url, stub.settings.access_key, list(stub.dataset.symbols)
+        else:
+            base_url, access_key, symbols = env_config["base_url"], read_access_key(env), list(KNOWN_SYMBOLS)
+        if args.symbols:
+            symbols = [symbol.strip() for symbol in args.symbols.split(",") if symbol.strip()]
+
+        # The load profile sets the request rate, so the response cache and the rate limiter are left out
+        pool_settings = PoolSettings.from_config(env_config)
+        # Retries would hide the failures (and add their backoff to the latencies) the load test measures
+        pool_settings.max_retries = args.retries
+        pool_settings.pool_maxsize = max(pool_settings.pool_maxsize, args.concurrency or args.max_in_flight)
+        api_client = APIClient(base_url, env_config["api_version"], access_key, pool_settings=pool_settings,
+                               log_requests=False)
+        settings = LoadSettings(mix=args.mix, rps=args.rps, concurrency=args.concurrency, duration=args.duration,
+                                max_in_flight=args.max_in_flight, validate_sample=args.validate_sample,
+                                seed=args.seed)
+        runner = LoadTestRunner(MarketController(api_client), settings, symbols).run()
+        api_client.close()
+    finally:
+        if stub is not None:
+            stub.stop()
+
+    report = runner.report()
+    report["retries"] = args.retries
+    print("\n".join(format_report(report)))
+    if args.json is not None:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from api_services.client.timing import percentile
+from api_services.market import schemas
+from load_test.scenarios import SCENARIOS
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class LoadSettings:
+    """
+    A data class to hold the load profile: the scenario mix, the arrival rate (open loop) or the number of
+    concurrent users (closed loop), and the duration.
+    """
+    # Scenario name -> weight (e.g., {"eod": 70, "timezones": 30})
+    mix: dict = field(default_factory=lambda: {"eod": 70.0, "timezones": 30.0})
+    # Requests started per second, whatever the response times (open loop). Ignored if concurrency is set
+    rps: float = 10.0
+    # Number of users sending their next request as soon as the previous one completes (closed loop)
+    concurrency: int | None = None
+    duration: float = 30.0
+    # Maximum number of requests in flight in open loop; late requests queue up (and their response time grows)
+    max_in_flight: int = 50
+    # Share of the successful responses validated with the schemas
+    validate_sample: float = 0.05
+    seed: int = 42
+
+
+@dataclass(slots=True)
+class RequestResult:
+    """
+    A data class to hold the outcome of one load test request (times in seconds).
+    """
+    scenario: str
+    status_code: int | None
+    # From sending the request to the end of the response
+    latency: float
+    # From the time the request was scheduled (open loop), including any queuing before it could be sent
+    response_time: float
+    error: str | None = None
+    validated: bool = False
+
+
+class LoadTestRunner:
+    """
+    Drives a MarketController with a mix of scenarios, in open loop (a fixed arrival rate) or closed loop
+    (a fixed number of concurrent users), and collects the outcome of every request.
+    """
+
+    def __init__(self, market_controller, settings: LoadSettings, symbols):
+        """
+        Initializes the LoadTestRunner.
+
+        :param market_controller: The MarketController sending the requests.
+        :param settings: The load profile.
+        :param symbols: Symbols the /eod scenarios pick from.
+        """
+        self.market_controller = market_controller
+        self.settings = settings
+        self.symbols = list(symbols)
+        self.results: list[RequestResult] = []
+        self.elapsed = 0.0
+        self._scenarios = [SCENARIOS[name] for name in settings.mix]
+        self._weights = list(settings.mix.values())
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _rng(self) -> random.Random:
+        """Returns the random generator of the current thread (random.Random is not safe to share)."""
+        rng = getattr(self._local, "rng", None)
+        if rng is None:
+            rng = self._local.rng = random.Random(f"{self.settings.seed}-{threading.get_ident()}")
+        return rng
+
+    def run(self) -> "LoadTestRunner":
+        """Runs the load test for the configured duration and returns the runner, holding the results."""
+        started = time.perf_counter()
+        if self.settings.concurrency:
+            self._run_closed_loop(started)
+        else:
+            self._run_open_loop(started)
+        self.elapsed = time.perf_counter() - started
+        return self
+
+    def _run_open_loop(self, started):
+        """Starts requests at the target rate, regardless of how long the previous ones take."""
+        rng = random.Random(self.settings.seed)
+        interval = 1 / self.settings.rps
+        with ThreadPoolExecutor(max_workers=self.settings.max_in_flight, thread_name_prefix="load") as executor:
+            number = 0
+            while True:
+                scheduled = started + number * interval
+                if scheduled - started >= self.settings.duration:
+                    break
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                scenario = rng.choices(self._scenarios, self._weights)[0]
+                executor.submit(self._send, scenario, scheduled)
+                number += 1
+
+    def _run_closed_loop(self, started):
+        """Runs `concurrency` users, each sending its next request as soon as the previous one completes."""
+        deadline = started + self.settings.duration
+
+        def user():
+            rng = self._rng()
+            while time.perf_counter() < deadline:
+                self._send(rng.choices(self._scenarios, self._weights)[0], time.perf_counter())
+
+        with ThreadPoolExecutor(max_workers=self.settings.concurrency, thread_name_prefix="user") as executor:
+            for _ in range(self.settings.concurrency):
+                executor.submit(user)
+
+    def _send(self, scenario, scheduled):
+        """Sends one request of the scenario, validating a sample of the successful responses."""
+        rng = self._rng()
+        sent = time.perf_counter()
+        try:
+            response = scenario.send(self.market_controller, rng, self.symbols)
+            # Read the whole body within the latency
+            content = response.content
+        except Exception as error:
+            # Any failure to get a response (connection error, timeout, ...) counts as an error
+            finished = time.perf_counter()
+            result = RequestResult(scenario.name, None, finished - sent, finished - scheduled,
+                                   error=type(error).__name__)
+        else:
+            finished = time.perf_counter()
+            result = RequestResult(scenario.name, response.status_code, finished - sent, finished - scheduled)
+            if not response.ok:
+                result.error = f"HTTP {response.status_code}"
+            elif content and rng.random() < self.settings.validate_sample:
+                result.validated = True
+                try:
+                    scenario.schema_factory().load(response.json())
+                except (schemas.ValidationError, ValueError) as error:
+                    result.error = f"invalid response ({type(error).__name__})"
+
+        with self._lock:
+            self.results.append(result)
+
+    def report(self) -> dict:
+        """
+        Returns the throughput, error rate and latency percentiles (in ms), overall and per scenario.
+        """
+        with self._lock:
+            results = list(self.results)
+
+        groups = {"all": results}
+        for name in self.settings.mix:
+            groups[name] = [result for result in results if result.scenario == name]
+
+        report = {
+            "mode": f"closed loop, {self.settings.concurrency} users" if self.settings.concurrency
+            else f"open loop, {self.settings.rps:g} rps",
+            "duration_s": round(self.elapsed, 3),
+        }
+        for name, group in groups.items():
+            errors = [result.error for result in group if result.error]
+            group_report = {
+                "requests": len(group),
+                "throughput_rps": round(len(group) / self.elapsed, 2) if self.elapsed else 0.0,
+                "error_rate": round(len(errors) / len(group), 4) if group else 0.0,
+                "errors": {error: errors.count(error) for error in sorted(set(errors))},
+                "validated": sum(result.validated for result in group),
+            }
+            for metric in ("latency", "response_time"):
+                values = sorted(getattr(result, metric) for result in group)
+                group_report[f"{metric}_ms"] = {f"p{pct}": round(percentile(values, pct) * 1000, 2)
+                                                for pct in PERCENTILES}
+            report[name] = group_report
+        return report
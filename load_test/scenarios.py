@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from typing import Callable
+from api_services.market import schemas
+from api_services.market.filters.eod_filters import EodFilters
+from api_services.market.filters.timezone_filters import TimezoneFilters
+
+# Values the scenarios pick the 'limit' from
+EOD_LIMITS = (10, 100, 1000)
+TIMEZONE_LIMITS = (10, 50, 100)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """
+    A data class to hold a request type of the load test: how to send it through the MarketController
+    (with random filters), and the schema its sampled responses are validated with.
+    """
+    name: str
+    # (market_controller, rng, symbols) -> response
+    send: Callable
+    # () -> schema (or loader) validating a successful response
+    schema_factory: Callable
+
+
+def send_eod(market_controller, rng, symbols):
+    """Requests /eod for a random symbol and limit."""
+    return market_controller.get_eod_data(EodFilters(symbols=rng.choice(symbols), limit=rng.choice(EOD_LIMITS)))
+
+
+def send_timezones(market_controller, rng, symbols):
+    """Requests a random page of /timezones."""
+    return market_controller.get_timezones(TimezoneFilters(limit=rng.choice(TIMEZONE_LIMITS)))
+
+
+SCENARIOS = {
+    "eod": Scenario("eod", send_eod, lambda: schemas.FastEodResponseLoader()),
+    "timezones": Scenario("timezones", send_timezones, lambda: schemas.TimezonesResponseSchema()),
+}
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """
+    Parses a scenario mix such as 'eod=70,timezones=30' into {scenario name: weight}.
+
+    :raises ValueError: For an unknown scenario, or a weight that is not a positive number.
+    """
+    mix = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}' in the mix. Available scenarios: {', '.join(SCENARIOS)}")
+        mix[name] = float(weight) if weight.strip() else 1.0
+        if mix[name] <= 0:
+            raise ValueError(f"The weight of scenario '{name}' must be positive, got '{weight}'.")
+    if not mix:
+        raise ValueError("The scenario mix is empty.")
+    return mix
@@ -0,0 +1,36 @@
+import argparse
+import configparser
+from pathlib import Path
+from stub_server.server import MarketstackStub, StubSettings
+
+
+def main():
+    """Runs the local Marketstack stand-in server until interrupted."""
+    parser = argparse.ArgumentParser(description="Local stand-in server for the Marketstack /eod and /timezones API.")
+    parser.add_argument("--env", default="local", help="config.ini section to read the stub_* settings from.")
+    parser.add_argument("--port", type=int, help="Port to listen on (stub_port).")
+    parser.add_argument("--symbols", type=int, help="Number of symbols in the synthetic dataset (stub_symbols).")
+    parser.add_argument("--days", type=int, help="Trading days of history per symbol (stub_days).")
+    parser.add_argument("--latency-ms", type=float, help="Added latency per request (stub_latency_ms).")
+    parser.add_argument("--error-rate", type=float, help="Share of requests failing with 500 (stub_error_rate).")
+    args = parser.parse_args()
+
+    config = configparser.ConfigParser()
+    config.read(Path(__file__).resolve().parent.parent / "config.ini")
+    settings = StubSettings.from_config(config[args.env]) if args.env in config else StubSettings()
+    for name, value in (("port", args.port), ("symbols_count", args.symbols), ("days", args.days),
+                        ("latency_ms", args.latency_ms), ("error_rate", args.error_rate)):
+        if value is not None:
+            setattr(settings, name, value)
+
+    stub = MarketstackStub(settings).start()
+    print(f"Marketstack stub serving {stub.base_url}{settings.api_version} "
+          f"(access_key={settings.access_key}, {len(stub.dataset.symbols)} symbols, {settings.days} days)")
+    try:
+        stub._thread.join()
+    except KeyboardInterrupt:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
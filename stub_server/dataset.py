@@ -0,0 +1,125 @@
+import random
+from datetime import date, timedelta
+
+# Symbols used by the test suite, with the reference data the real API returns for them
+KNOWN_SYMBOLS = {
+    "AAPL": ("Apple Inc", 190.0),
+    "MSFT": ("Microsoft Corporation", 410.0),
+    "TSLA": ("Tesla Inc", 240.0),
+    "NVDA": ("NVIDIA Corporation", 120.0),
+}
+
+TIMEZONES = [
+    ("America/New_York", "EST", "EDT"),
+    ("America/Chicago", "CST", "CDT"),
+    ("America/Denver", "MST", "MDT"),
+    ("America/Los_Angeles", "PST", "PDT"),
+    ("America/Toronto", "EST", "EDT"),
+    ("America/Sao_Paulo", "BRT", "BRT"),
+    ("America/Mexico_City", "CST", "CST"),
+    ("Europe/London", "GMT", "BST"),
+    ("Europe/Dublin", "GMT", "IST"),
+    ("Europe/Paris", "CET", "CEST"),
+    ("Europe/Berlin", "CET", "CEST"),
+    ("Europe/Amsterdam", "CET", "CEST"),
+    ("Europe/Madrid", "CET", "CEST"),
+    ("Europe/Zurich", "CET", "CEST"),
+    ("Europe/Stockholm", "CET", "CEST"),
+    ("Europe/Helsinki", "EET", "EEST"),
+    ("Europe/Istanbul", "+03", "+03"),
+    ("Europe/Moscow", "MSK", "MSK"),
+    ("Africa/Johannesburg", "SAST", "SAST"),
+    ("Africa/Cairo", "EET", "EEST"),
+    ("Asia/Dubai", "+04", "+04"),
+    ("Asia/Kolkata", "IST", "IST"),
+    ("Asia/Singapore", "+08", "+08"),
+    ("Asia/Hong_Kong", "HKT", "HKT"),
+    ("Asia/Shanghai", "CST", "CST"),
+    ("Asia/Seoul", "KST", "KST"),
+    ("Asia/Tokyo", "JST", "JST"),
+    ("Australia/Sydney", "AEST", "AEDT"),
+    ("Australia/Melbourne", "AEST", "AEDT"),
+    ("Pacific/Auckland", "NZST", "NZDT"),
+]
+
+
+def trading_days(end: date, count: int) -> list[date]:
+    """Returns the last `count` weekdays up to `end`, newest first."""
+    days = []
+    day = end
+    while len(days) < count:
+        if day.weekday() < 5:
+            days.append(day)
+        day -= timedelta(days=1)
+    return days
+
+
+class SyntheticDataset:
+    """
+    Deterministic synthetic Marketstack data: EOD histories (a random walk per symbol) and the timezones list.
+    The same seed and sizes always produce the same data.
+    """
+
+    def __init__(self, symbols_count: int = 10, days: int = 500, seed: int = 42, end: date = date(2025, 1, 31)):
+        """
+        Initializes the SyntheticDataset.
+
+        :param symbols_count: Total number of symbols, including the KNOWN_SYMBOLS.
+        :param days: Number of trading days of history per symbol.
+        :param seed: Seed of the random generator.
+        :param end: Date of the most recent EOD record.
+        """
+        self.days = trading_days(end, days)
+        self.symbols = {}
+        rnd = random.Random(seed)
+        for symbol, (name, price) in KNOWN_SYMBOLS.items():
+            self.symbols[symbol] = (name, price)
+        for number in range(max(symbols_count - len(KNOWN_SYMBOLS), 0)):
+            self.symbols[f"SYM{number:04d}"] = (f"Synthetic Company {number}", round(rnd.uniform(5, 500), 2))
+
+        # symbol -> list of rows, newest first
+        self.eod = {symbol: self._history(symbol, name, price, rnd)
+                    for symbol, (name, price) in self.symbols.items()}
+        self.timezones = [{"timezone": timezone, "abbr": abbr, "abbr_dst": abbr_dst}
+                          for timezone, abbr, abbr_dst in TIMEZONES]
+
+    def _history(self, symbol, name, price, rnd) -> list[dict]:
+        """Generates the EOD rows of one symbol, as returned by the API."""
+        rows = []
+        close = price
+        for day in self.days:
+            open_ = round(close * rnd.uniform(0.98, 1.02), 4)
+            high = round(max(open_, close) * rnd.uniform(1.0, 1.02), 4)
+            low = round(min(open_, close) * rnd.uniform(0.98, 1.0), 4)
+            volume = float(rnd.randint(100_000, 50_000_000))
+            rows.append({
+                "open": open_,
+                "high": high,
+                "low": low,
+                "close": close,
+                "volume": volume,
+                "adj_high": high,
+                "adj_low": low,
+                "adj_close": close,
+                "adj_open": open_,
+                "adj_volume": volume,
+                "split_factor": 1.0,
+                "dividend": 0.0,
+                "name": name,
+                "exchange_code": "NASDAQ",
+                "asset_type": "Stock",
+                "price_currency": "usd",
+                "symbol": symbol,
+                "exchange": "XNAS",
+                "date": f"{day.isoformat()}T00:00:00+0000",
+            })
+            close = round(open_ * rnd.uniform(0.98, 1.02), 4)
+        return rows
+
+    def eod_rows(self, symbols: list[str], ascending: bool = False) -> list[dict]:
+        """
+        Returns the EOD rows of the given (known) symbols, sorted by date like the API does.
+        """
+        rows = [row for symbol in symbols for row in self.eod[symbol]]
+        rows.sort(key=lambda row: row["date"], reverse=not ascending)
+        return rows
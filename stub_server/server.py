@@ -0,0 +1,289 @@
+import gzip
+import json
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from stub_server.dataset import SyntheticDataset
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Content encodings the stub can compress responses with, by preference
+ENCODERS = {"zstd": zstandard and (lambda body: zstandard.ZstdCompressor().compress(body)),
+            "br": brotli and (lambda body: brotli.compress(body, quality=5)),
+            "gzip": lambda body: gzip.compress(body, compresslevel=6),
+            "deflate": zlib.compress}
+ENCODERS = {name: encoder for name, encoder in ENCODERS.items() if encoder}
+
+
+@dataclass
+class StubSettings:
+    """
+    A data class to hold the settings of the local Marketstack stand-in server.
+    """
+    host: str = "127.0.0.1"
+    # 0 picks a free port
+    port: int = 0
+    api_version: str = "/v2"
+    access_key: str = "local-access-key"
+    symbols_count: int = 10
+    days: int = 500
+    seed: int = 42
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    # Share of the requests delayed by slow_ms more (a latency tail, e.g. to exercise timeouts and hedging)
+    slow_rate: float = 0.0
+    slow_ms: float = 0.0
+    error_rate: float = 0.0
+    # Compress responses of at least compression_min_bytes with the best encoding accepted by the client
+    compression: bool = True
+    compression_min_bytes: int = 1024
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds the settings from a config.ini section, falling back to the defaults for missing keys.
+
+        :param config: The config.ini section of the target environment.
+        """
+        return cls(
+            host=config.get('stub_host', fallback=cls.host),
+            port=config.getint('stub_port', fallback=cls.port),
+            api_version=config.get('api_version', fallback=cls.api_version),
+            access_key=config.get('stub_access_key', fallback=cls.access_key),
+            symbols_count=config.getint('stub_symbols', fallback=cls.symbols_count),
+            days=config.getint('stub_days', fallback=cls.days),
+            seed=config.getint('stub_seed', fallback=cls.seed),
+            latency_ms=config.getfloat('stub_latency_ms', fallback=cls.latency_ms),
+            latency_jitter_ms=config.getfloat('stub_latency_jitter_ms', fallback=cls.latency_jitter_ms),
+            slow_rate=config.getfloat('stub_slow_rate', fallback=cls.slow_rate),
+            slow_ms=config.getfloat('stub_slow_ms', fallback=cls.slow_ms),
+            error_rate=config.getfloat('stub_error_rate', fallback=cls.error_rate),
+            compression=config.getboolean('stub_compression', fallback=cls.compression),
+            compression_min_bytes=config.getint('stub_compression_min_bytes', fallback=cls.compression_min_bytes),
+        )
+
+
+class StubRequestError(Exception):
+    """An API error to be returned to the client as an error payload."""
+
+    def __init__(self, status_code, code, message):
+        super().__init__(message)
+        self.status_code = status_code
+        self.code = code
+        self.message = message
+
+
+def parse_int(params, name, default, minimum=0, maximum=None):
+    """Parses an integer query parameter, raising a validation error like the real API does."""
+    raw = params.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        value = int(raw)
+    except ValueError:
+        raise StubRequestError(422, "validation_error", f"{name}: A valid integer is required.")
+    if value < minimum or (maximum is not None and value > maximum):
+        raise StubRequestError(422, "validation_error", f"{name}: The value is out of the allowed range.")
+    return value
+
+
+def paginate(rows, params) -> dict:
+    """Applies limit/offset to the rows and wraps them with the pagination object."""
+    limit = parse_int(params, "limit", default=100, minimum=1, maximum=1000)
+    offset = parse_int(params, "offset", default=0)
+    page = rows[offset:offset + limit]
+    return {
+        "pagination": {"limit": limit, "offset": offset, "count": len(page), "total": len(rows)},
+        "data": page,
+    }
+
+
+class MarketstackStubHandler(BaseHTTPRequestHandler):
+    """Serves the /eod and /timezones endpoints from the server's SyntheticDataset."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without TCP_NODELAY the body waits for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        stub = self.server.stub
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query, keep_blank_values=True).items()}
+
+        stub.simulate_latency()
+        try:
+            if not url.path.startswith(stub.settings.api_version):
+                raise StubRequestError(404, "invalid_api_function", "The requested API endpoint does not exist.")
+            endpoint = url.path[len(stub.settings.api_version):]
+            handler = stub.endpoints.get(endpoint)
+            if handler is None:
+                raise StubRequestError(404, "invalid_api_function", "The requested API endpoint does not exist.")
+            stub.check_access_key(params)
+            stub.simulate_error()
+            status_code, payload = 200, handler(params)
+        except StubRequestError as err:
+            status_code, payload = err.status_code, {"error": {"code": err.code, "message": err.message}}
+
+        body = json.dumps(payload).encode()
+        encoding = stub.choose_encoding(self.headers.get("Accept-Encoding", ""), len(body))
+        if encoding is not None:
+            body = ENCODERS[encoding](body)
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionError:
+            # The client gave up on the connection (e.g., it timed out, or dropped a response it did not need)
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        """Keeps the test output clean (requests are already logged by the APIClient)."""
+
+
+class MarketstackStub:
+    """
+    Local stand-in for the Marketstack /eod and /timezones endpoints, served from a synthetic dataset.
+    It honours symbols/limit/offset/sort/date_from/date_to/access_key and returns the same error payloads as the real API,
+    with optional per-request latency and a random server error rate.
+    """
+
+    VALID_SORTS = ("DESC", "ASC")
+
+    def __init__(self, settings: StubSettings | None = None):
+        """
+        Initializes the MarketstackStub.
+
+        :param settings: Server, dataset, latency and error-rate settings (defaults are used if omitted).
+        """
+        self.settings = settings or StubSettings()
+        self.dataset = SyntheticDataset(self.settings.symbols_count, self.settings.days, self.settings.seed)
+        self.endpoints = {"/eod": self.eod, "/timezones": self.timezones}
+        self._random = random.Random(self.settings.seed)
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        """The base URL of the running server (e.g., http://127.0.0.1:8080)."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def check_access_key(self, params):
+        """Rejects requests without the configured access_key (any key is accepted if none is configured)."""
+        if not params.get("access_key"):
+            raise StubRequestError(401, "missing_access_key", "You have not supplied an API Access Key.")
+        if self.settings.access_key and params["access_key"] != self.settings.access_key:
+            raise StubRequestError(401, "invalid_access_key", "You have not supplied a valid API Access Key.")
+
+    def simulate_latency(self):
+        """Delays the response by the configured latency plus a random jitter (and the slow tail, at its rate)."""
+        latency = self.settings.latency_ms + self._random.uniform(0, self.settings.latency_jitter_ms)
+        if self.settings.slow_rate and self._random.random() < self.settings.slow_rate:
+            latency += self.settings.slow_ms
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+    def choose_encoding(self, accept_encoding: str, size: int) -> str | None:
+        """
+        Returns the encoding to compress a response body of the given size with: the one the client prefers
+        (highest q-value) among those the stub supports, or None to send it as is.
+        """
+        if not self.settings.compression or size < self.settings.compression_min_bytes:
+            return None
+        preferences = {}
+        for item in accept_encoding.split(","):
+            name, _, quality = item.strip().partition(";q=")
+            try:
+                preferences[name.strip().lower()] = float(quality) if quality else 1.0
+            except ValueError:
+                continue
+        candidates = [(preferences[name], -number, name) for number, name in enumerate(ENCODERS)
+                      if preferences.get(name, 0) > 0]
+        return max(candidates)[2] if candidates else None
+
+    def simulate_error(self):
+        """Fails the request with a 500 error at the configured error rate."""
+        if self.settings.error_rate and self._random.random() < self.settings.error_rate:
+            raise StubRequestError(500, "internal_error", "An internal error occurred (simulated by the stub).")
+
+    def eod(self, params) -> dict:
+        """Handles GET /eod."""
+        symbols = [symbol.strip() for symbol in params.get("symbols", "").split(",") if symbol.strip()]
+        if not symbols:
+            raise StubRequestError(422, "validation_error", "You have to specify at least one symbol.")
+
+        sort = params.get("sort", "DESC").upper()
+        if sort not in self.VALID_SORTS:
+            raise StubRequestError(422, "validation_error", "sort: the value you selected is not a valid choice.")
+
+        valid_symbols = [symbol for symbol in symbols if symbol in self.dataset.eod]
+        if not valid_symbols:
+            raise StubRequestError(422, "no_valid_symbols_provided", "At least one valid symbol must be provided")
+
+        rows = self.dataset.eod_rows(valid_symbols, ascending=sort == "ASC")
+        date_from, date_to = (self.parse_date(params, name) for name in ("date_from", "date_to"))
+        if date_from or date_to:
+            # The row dates start with YYYY-MM-DD, so they compare as strings
+            rows = [row for row in rows if (not date_from or row["date"][:10] >= date_from)
+                    and (not date_to or row["date"][:10] <= date_to)]
+        return paginate(rows, params)
+
+    @staticmethod
+    def parse_date(params, name) -> str | None:
+        """Returns a YYYY-MM-DD date parameter, normalized, or None if absent."""
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            return date.fromisoformat(value[:10]).isoformat()
+        except ValueError:
+            raise StubRequestError(422, "validation_error",
+                                   f"{name}: The {name.replace('_', ' ')} does not match the format Y-m-d.")
+
+    def timezones(self, params) -> dict:
+        """Handles GET /timezones."""
+        return paginate(self.dataset.timezones, params)
+
+    def start(self):
+        """Starts serving in a background thread."""
+        self._server = ThreadingHTTPServer((self.settings.host, self.settings.port), MarketstackStubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = threading.Thread(target=self._server.serve_forever, name="marketstack-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server and waits for the background thread."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
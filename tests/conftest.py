@@ -1,8 +1,37 @@
 import pytest
+from api_services.market.async_market_controller import AsyncMarketController
+from api_services.market.eod_batcher import BatchSettings
+from api_services.market.eod_store import EodStore
+from api_services.market.eod_sync import EodSync, SyncSettings
 from api_services.market.market_controller import MarketController
 
 
 @pytest.fixture(scope="module")
-def market_controller(api_client):
-    """Provides a MarketController instance for the tests."""
-    return MarketController(api_client)
+def market_controller(api_client, config):
+    """Provides a MarketController instance for the tests, batching /eod requests as set in the config."""
+    return MarketController(api_client, BatchSettings.from_config(config))
+
+
+@pytest.fixture(scope="module")
+def eod_sync(market_controller, config, project_root):
+    """
+    Provides the EodSync keeping the local /eod histories of the environment (eod_store_path) up to date, to
+    compare the API data of a run with the stored baseline.
+    """
+    settings = SyncSettings.from_config(config)
+    return EodSync(market_controller, EodStore(project_root / settings.store_path), settings)
+
+
+@pytest.fixture(scope="module")
+def async_market_controller(async_api_client, market_controller):
+    """Provides an AsyncMarketController instance for the tests, sharing the /eod batcher of the MarketController."""
+    return AsyncMarketController(async_api_client, eod_batcher=market_controller.eod_batcher)
+
+
+@pytest.fixture(scope="session")
+def run_concurrently(async_api_client):
+    """
+    Provides a function that issues the given async controller calls at once (under the concurrency cap)
+    and returns their responses in order.
+    """
+    return async_api_client.run_concurrently
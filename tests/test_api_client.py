@@ -0,0 +1,69 @@
+import configparser
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.client.api_client import APIClient, PoolSettings
+from api_services.client.rate_limiter import RateLimitedRetry, RateLimiter, RateLimitSettings
+
+POOL_CONFIG = """
+[test]
+pool_connections = 4
+pool_maxsize = 16
+keep_alive = false
+max_retries = 5
+backoff_factor = 0.25
+"""
+
+
+def make_client(pool_settings, **kwargs):
+    """Builds an APIClient (no request is sent) with the given pool settings."""
+    return APIClient("https://api.example.com", "/v2", "key", pool_settings=pool_settings, log_requests=False,
+                     **kwargs)
+
+
+@allure.feature("API Client")
+@allure.story("Connection Pool and Retries")
+class TestApiClient:
+    """
+    Contains unit tests of the connection pool and retry settings of the APIClient transport (no API calls).
+    """
+
+    @allure.title("Test the adapter mounted by the APIClient uses the pool and retry settings of config.ini")
+    @pytest.mark.regression
+    def test_adapter_from_config(self):
+        config = configparser.ConfigParser()
+        config.read_string(POOL_CONFIG)
+        client = make_client(PoolSettings.from_config(config["test"]))
+
+        for prefix in ("https://", "http://"):
+            with allure.step(f"Assert the adapter mounted on {prefix}"):
+                adapter = client.session.get_adapter(f"{prefix}api.example.com")
+                assert_that(adapter._pool_connections).is_equal_to(4)
+                assert_that(adapter._pool_maxsize).is_equal_to(16)
+                assert_that(adapter.max_retries.total).is_equal_to(5)
+                assert_that(adapter.max_retries.backoff_factor).is_equal_to(0.25)
+                assert_that(set(adapter.max_retries.status_forcelist)).is_equal_to(set(APIClient.RETRY_STATUSES))
+                assert_that(set(adapter.max_retries.allowed_methods)).is_equal_to({"GET"})
+        assert_that(client.session.headers).contains_entry({"Connection": "close"})
+        client.close()
+
+    @allure.title("Test the pool and retry defaults apply to the keys missing from config.ini")
+    @pytest.mark.regression
+    def test_adapter_defaults(self, tmp_path):
+        config = configparser.ConfigParser()
+        config.read_string("[test]\npool_maxsize = 20\n")
+        settings = PoolSettings.from_config(config["test"])
+        assert_that(settings).is_equal_to(PoolSettings(pool_maxsize=20))
+
+        with allure.step("Assert the retries of a rate-limited client keep the same settings"):
+            limiter = RateLimiter(RateLimitSettings(enabled=True), tmp_path / "state.json")
+            client = make_client(settings, rate_limiter=limiter)
+            adapter = client.session.get_adapter("https://api.example.com")
+            assert_that(adapter._pool_connections).is_equal_to(10)
+            assert_that(adapter._pool_maxsize).is_equal_to(20)
+            assert_that(adapter.max_retries).is_instance_of(RateLimitedRetry)
+            assert_that(adapter.max_retries.total).is_equal_to(3)
+            assert_that(adapter.max_retries.backoff_factor).is_equal_to(0.5)
+            assert_that(adapter.max_retries.path_prefix).is_equal_to("/v2")
+            assert_that(client.session.headers).contains_entry({"Connection": "keep-alive"})
+            client.close()
@@ -0,0 +1,73 @@
+import json
+import pytest
+import allure
+from assertpy import assert_that
+from benchmarks.harness import compare_results, load_results, save_results
+from benchmarks.pipeline import STAGES, make_client, reset_recorders, run, synthetic_payloads
+
+
+@allure.feature("Benchmarks")
+@allure.story("Pipeline Benchmark")
+class TestPipelineBenchmark:
+    """
+    Contains unit tests of the pipeline benchmark and of its comparison with a baseline (no API calls).
+    """
+
+    @allure.title("Test every stage of the pipeline runs offline on synthetic payloads")
+    @pytest.mark.regression
+    def test_run_all_stages(self):
+        payloads = synthetic_payloads(30)
+        assert_that(json.loads(payloads.eod)["data"]).is_length(30)
+        assert_that(json.loads(payloads.timezones)["data"]).is_length(30)
+
+        results = run({30: payloads}, min_time=0.001, repeat=1)
+        assert_that(results).contains_only(*STAGES)
+        for stage, sizes in results.items():
+            result = sizes["30"]
+            assert_that(result["rows"]).described_as(stage).is_equal_to(30)
+            assert_that(result["seconds_per_call"]).described_as(stage).is_positive()
+            assert_that(result["peak_bytes"]).described_as(stage).is_positive()
+
+    @allure.title("Test measurements slower or bigger than the baseline beyond the tolerance are flagged")
+    @pytest.mark.regression
+    def test_compare_with_baseline(self, tmp_path):
+        baseline = {"fast_load/eod": {"10": {"seconds_per_call": 1.0, "peak_bytes": 1000},
+                                      "100": {"seconds_per_call": 10.0, "peak_bytes": 10000}},
+                    "schema_load/eod": {"10": {"seconds_per_call": 2.0, "peak_bytes": 0}}}
+        save_results(tmp_path / "baseline.json", baseline)
+        saved = load_results(tmp_path / "baseline.json")
+        assert_that(saved["results"]).is_equal_to(baseline)
+        assert_that(saved["environment"]).contains_key("python", "marshmallow")
+
+        current = {"fast_load/eod": {"10": {"seconds_per_call": 1.1, "peak_bytes": 1000},
+                                     "100": {"seconds_per_call": 10.0, "peak_bytes": 13000},
+                                     "1000": {"seconds_per_call": 100.0, "peak_bytes": 100000}},
+                   "schema_load/eod": {"10": {"seconds_per_call": 3.0, "peak_bytes": 500}}}
+        rows = {(row["stage"], row["size"]): row for row in compare_results(saved["results"], current, 0.2, 0.2)}
+
+        # Measurements missing from the baseline are not compared
+        assert_that(rows).does_not_contain_key(("fast_load/eod", "1000"))
+        assert_that(rows[("fast_load/eod", "10")]).contains_entry({"time_ratio": 1.1}, {"regressed": False})
+        assert_that(rows[("fast_load/eod", "100")]).contains_entry({"memory_ratio": 1.3}, {"regressed": True})
+        assert_that(rows[("schema_load/eod", "10")]).contains_entry({"time_ratio": 1.5}, {"regressed": True})
+
+    @allure.title("Test the in-memory transport goes through the metered adapter of the instrumented client")
+    @pytest.mark.regression
+    def test_in_memory_transport_metered(self):
+        payloads = synthetic_payloads(30)
+        api_client = make_client(payloads.eod, instrumented=True)
+
+        response = api_client.get("/eod", {"symbols": "AAPL"})
+        api_client.get("/eod", {"symbols": "AAPL", "limit": 30}, stream=True).close()
+
+        assert_that(response.json()["data"]).is_length(30)
+        assert_that(response.headers).contains_entry({"Content-Encoding": "gzip"})
+        assert_that(api_client.timings.records).is_length(2)
+        transfer = api_client.transfers.records[0]
+        assert_that(transfer).has_encoding("gzip").has_decoded_bytes(len(payloads.eod))
+        assert_that(transfer.encoded_bytes).is_less_than(len(payloads.eod))
+
+        with allure.step("Assert every round of calls starts with empty recorders"):
+            reset_recorders(api_client)()
+            assert_that(api_client.timings.records).is_empty()
+            assert_that(api_client.transfers.records).is_empty()
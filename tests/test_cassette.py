@@ -0,0 +1,77 @@
+import pytest
+import allure
+import requests
+from assertpy import assert_that
+from api_services.client.cassette import Cassette, CassetteMissError, CassetteMode
+
+
+def make_response(status_code, body):
+    """Builds a requests.Response as returned by the API."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = "OK"
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response.headers["Content-Encoding"] = "gzip"
+    response._content = body
+    return response
+
+
+@allure.feature("API Client")
+@allure.story("Cassette Record/Replay")
+class TestCassette:
+    """
+    Contains unit tests for the on-disk cassette store (no API calls).
+    """
+
+    @allure.title("Test recorded responses are replayed by request fingerprint")
+    @pytest.mark.regression
+    def test_record_and_replay(self, tmp_path):
+        with allure.step("Record two responses"):
+            recorder = Cassette(tmp_path, CassetteMode.RECORD)
+            recorder.record("/eod", {"symbols": "AAPL", "access_key": "secret"}, make_response(200, b'{"a": 1}'))
+            recorder.record("/eod", {"symbols": "INVALID"}, make_response(422, b'{"error": {}}'))
+            recorder.close()
+
+        with allure.step("Replay them without the access_key"):
+            player = Cassette(tmp_path, CassetteMode.REPLAY)
+            response = player.replay("/eod", {"symbols": "AAPL"}, "http://localhost/v2/eod")
+            error_response = player.replay("/eod", {"symbols": "INVALID"}, "http://localhost/v2/eod")
+
+            assert_that(response.status_code).is_equal_to(200)
+            assert_that(response.json()).is_equal_to({"a": 1})
+            assert_that(response.headers).does_not_contain_key("Content-Encoding")
+            assert_that(error_response.status_code).is_equal_to(422)
+            player.close()
+
+    @allure.title("Test a request missing from the cassette raises a clear error")
+    @pytest.mark.negative
+    def test_replay_miss(self, tmp_path):
+        Cassette(tmp_path, CassetteMode.RECORD).close()
+        player = Cassette(tmp_path, CassetteMode.REPLAY)
+
+        with pytest.raises(CassetteMissError, match=r"GET /eod\?symbols=MSFT"):
+            player.replay("/eod", {"symbols": "MSFT"}, "http://localhost/v2/eod")
+        assert_that(player.stats()["misses"]).is_equal_to(1)
+
+    @allure.title("Test the parts recorded by concurrent workers are merged into one cassette")
+    @pytest.mark.regression
+    def test_merge_worker_parts(self, tmp_path):
+        with allure.step("Record a part per worker, both with the /timezones response"):
+            for worker, symbol in (("gw0", "AAPL"), ("gw1", "MSFT")):
+                part = Cassette(tmp_path, CassetteMode.RECORD, part=worker)
+                part.record("/timezones", {}, make_response(200, b'{"data": []}'))
+                part.record("/eod", {"symbols": symbol}, make_response(200, f'{{"symbol": "{symbol}"}}'.encode()))
+                part.close()
+            assert_that(str(tmp_path / Cassette.INDEX_FILE)).does_not_exist()
+
+        assert_that(Cassette.merge_parts(tmp_path)).is_equal_to(2)
+        assert_that(str(tmp_path / Cassette.PARTS_DIR)).does_not_exist()
+        player = Cassette(tmp_path, CassetteMode.REPLAY)
+        for symbol in ("AAPL", "MSFT"):
+            assert_that(player.replay("/eod", {"symbols": symbol}, "http://localhost/v2/eod").json()).is_equal_to(
+                {"symbol": symbol})
+        assert_that(player.replay("/timezones", {}, "http://localhost/v2/timezones").json()).is_equal_to({"data": []})
+        player.close()
+        # Without parts (e.g., a run without pytest-xdist), the cassette is left as it is
+        assert_that(Cassette.merge_parts(tmp_path)).is_equal_to(0)
@@ -0,0 +1,78 @@
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.client.api_client import APIClient
+from api_services.client.compression import SUPPORTED_ENCODINGS, CompressionSettings, TransferRecorder
+from stub_server.server import MarketstackStub, StubSettings
+
+
+@pytest.fixture(scope="module")
+def stub():
+    """Starts a local stub server for the module."""
+    with MarketstackStub(StubSettings(symbols_count=2, days=300)) as stub:
+        yield stub
+
+
+def make_client(stub, compression):
+    """Builds an APIClient on the stub that records the bytes it transfers."""
+    return APIClient(stub.base_url, stub.settings.api_version, stub.settings.access_key, compression=compression,
+                     transfers=TransferRecorder(), log_requests=False)
+
+
+@allure.feature("API Client")
+@allure.story("Compression")
+class TestCompression:
+    """
+    Contains unit tests of the content encoding negotiation and of the accounting of the bytes transferred.
+    """
+
+    @allure.title("Test the Accept-Encoding header only lists the encodings that can be decoded")
+    @pytest.mark.regression
+    def test_accept_encoding(self):
+        assert_that(CompressionSettings(enabled=False).accept_encoding()).is_equal_to("identity")
+        assert_that(CompressionSettings(encodings="gzip, deflate").accept_encoding()).is_equal_to(
+            "gzip, deflate;q=0.9")
+        accepted = [item.split(";")[0] for item in CompressionSettings(encodings="").accept_encoding().split(", ")]
+        assert_that(accepted).is_equal_to(list(SUPPORTED_ENCODINGS))
+
+    @allure.title("Test the stub picks the encoding preferred by the client")
+    @pytest.mark.regression
+    def test_stub_encoding_choice(self, stub):
+        assert_that(stub.choose_encoding("deflate;q=0.5, gzip", 4096)).is_equal_to("gzip")
+        assert_that(stub.choose_encoding("gzip;q=0.4, deflate;q=0.8", 4096)).is_equal_to("deflate")
+        assert_that(stub.choose_encoding("gzip;q=0, identity", 4096)).is_none()
+        assert_that(stub.choose_encoding("gzip", 100)).is_none()
+
+    @allure.title("Test compressed responses are decoded and their bytes on the wire are accounted")
+    @pytest.mark.regression
+    def test_compressed_transfer(self, stub):
+        api_client = make_client(stub, CompressionSettings(encodings="gzip"))
+        response = api_client.get("/eod", {"symbols": "AAPL", "limit": 300})
+        streamed = api_client.get("/eod", {"symbols": "AAPL", "limit": 300}, stream=True)
+        assert_that(api_client.transfers.records).is_length(1)
+        streamed_body = b"".join(streamed.iter_content(4096))
+        api_client.close()
+
+        assert_that(response.headers["Content-Encoding"]).is_equal_to("gzip")
+        assert_that(streamed_body).is_equal_to(response.content)
+        assert_that(response.json()["data"]).is_length(300)
+        for record in api_client.transfers.records:
+            assert_that(record.decoded_bytes).is_equal_to(len(response.content))
+            assert_that(record.encoded_bytes).is_less_than(record.decoded_bytes // 3)
+
+        totals = api_client.transfers.report()["endpoints"]["/eod"]
+        assert_that(totals).contains_entry({"responses": 2}, {"encodings": {"gzip": 2}})
+        summary = [line for line in api_client.summary_lines() if line.startswith("Transfer: 2 responses")]
+        assert_that(summary).is_length(1)
+
+    @allure.title("Test responses are sent uncompressed when compression is disabled")
+    @pytest.mark.regression
+    def test_uncompressed_transfer(self, stub):
+        api_client = make_client(stub, CompressionSettings(enabled=False))
+        response = api_client.get("/eod", {"symbols": "AAPL", "limit": 300})
+        api_client.close()
+
+        assert_that(response.headers).does_not_contain_key("Content-Encoding")
+        record = api_client.transfers.records[0]
+        assert_that(record.encoding).is_equal_to("identity")
+        assert_that(record.encoded_bytes).is_equal_to(record.decoded_bytes).is_equal_to(len(response.content))
@@ -0,0 +1,76 @@
+import pytest
+import allure
+from concurrent.futures import ThreadPoolExecutor
+from assertpy import assert_that
+from api_services.client.api_client import APIClient
+from api_services.market.eod_batcher import BatchSettings
+from api_services.market.filters.eod_filters import EodFilters
+from api_services.market.market_controller import MarketController
+from stub_server.server import MarketstackStub, StubSettings
+
+
+@pytest.fixture(scope="module")
+def stub():
+    """Starts a local stub server with 12 symbols for the module."""
+    with MarketstackStub(StubSettings(symbols_count=12, days=150)) as stub:
+        yield stub
+
+
+@pytest.fixture
+def controller(stub):
+    """Provides a MarketController on the stub, with a wide wait window so that concurrent calls always batch."""
+    api_client = APIClient(stub.base_url, stub.settings.api_version, stub.settings.access_key, log_requests=False)
+    yield MarketController(api_client, BatchSettings(max_batch_size=5, wait_window_ms=200))
+    api_client.close()
+
+
+def get_batched_concurrently(controller, filters_list):
+    """Calls get_eod_data_batched for all the filters at once, and returns the results (or errors) in order."""
+    with ThreadPoolExecutor(max_workers=len(filters_list)) as executor:
+        futures = [executor.submit(controller.get_eod_data_batched, filters) for filters in filters_list]
+    return [future.exception() or future.result() for future in futures]
+
+
+@allure.feature("Market API")
+@allure.story("EOD Batching")
+class TestEodBatcher:
+    """
+    Contains tests of the coalescing of single-symbol /eod requests (against a local stub server).
+    """
+
+    @allure.title("Test batched records equal the records of single-symbol requests (limit={limit})")
+    @pytest.mark.regression
+    @pytest.mark.parametrize("limit", [None, 5, 250])
+    def test_batched_records_match_single_requests(self, stub, controller, limit):
+        symbols = list(stub.dataset.symbols)[:8]
+        results = get_batched_concurrently(controller, [EodFilters(symbols=symbol, limit=limit) for symbol in symbols])
+
+        for symbol, eod_response_dto in zip(symbols, results):
+            expected = controller.load_eod_response(controller.get_eod_data(EodFilters(symbols=symbol, limit=limit)))
+            assert_that(eod_response_dto.data).is_equal_to(expected.data)
+            assert_that(eod_response_dto.pagination.count).is_equal_to(expected.pagination.count)
+
+        # 8 symbols in batches of at most 5 (and of at most 1000 // limit)
+        assert_that(controller.eod_batcher.stats()).is_equal_to(
+            {"calls": 8, "batch_requests": 2, "single_requests": 0, "requests_saved": 6})
+
+    @allure.title("Test an invalid symbol fails on its own request and does not affect the batch")
+    @pytest.mark.negative
+    def test_invalid_symbol_falls_back(self, controller):
+        results = get_batched_concurrently(controller, [EodFilters(symbols=symbol) for symbol in
+                                                        ("AAPL", "INVALID", "MSFT")])
+
+        assert_that(results[0].data[0].symbol).is_equal_to("AAPL")
+        assert_that(results[1]).is_instance_of(AssertionError)
+        assert_that(results[2].data[0].symbol).is_equal_to("MSFT")
+        assert_that(controller.eod_batcher.stats()).contains_entry({"batch_requests": 1}, {"single_requests": 1})
+
+    @allure.title("Test requests with an offset or several symbols are not batched")
+    @pytest.mark.regression
+    def test_unbatchable_requests(self, controller):
+        results = get_batched_concurrently(controller, [EodFilters(symbols="AAPL", offset=5),
+                                                        EodFilters(symbols="AAPL,MSFT")])
+
+        assert_that(results[0].pagination.offset).is_equal_to(5)
+        assert_that({record.symbol for record in results[1].data}).is_equal_to({"AAPL", "MSFT"})
+        assert_that(controller.eod_batcher.stats()).contains_entry({"batch_requests": 0}, {"single_requests": 2})
@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.market import schemas
+from stub_server.dataset import SyntheticDataset
+
+
+@pytest.fixture(scope="module")
+def eod_payload():
+    """Provides a valid multi-symbol /eod payload from the synthetic dataset (newest first, like the API)."""
+    rows = SyntheticDataset(symbols_count=4, days=50).eod_rows(["AAPL", "MSFT", "TSLA"])
+    rows[0]["adj_high"] = None
+    return {"pagination": {"limit": 1000, "offset": 0, "count": len(rows), "total": len(rows)}, "data": rows}
+
+
+@allure.feature("Market API")
+@allure.story("EOD Columnar Container")
+class TestEodColumnar:
+    """
+    Contains unit tests of the columnar EOD container (no API calls).
+    """
+
+    @allure.title("Test columnar rows behave like the EodDataDTO records")
+    @pytest.mark.regression
+    def test_columnar_rows_match_dtos(self, eod_payload):
+        loader = schemas.FastEodResponseLoader()
+        dtos = loader.load(eod_payload).data
+        columns = loader.load_columns(eod_payload).data
+
+        assert_that(columns).is_length(len(dtos))
+        assert_that(columns[0].adj_high).is_none()
+        assert_that(columns[0].symbol).is_equal_to(dtos[0].symbol)
+        assert_that(columns.to_dtos()).is_equal_to(dtos)
+
+    @allure.title("Test slicing by symbol and date range")
+    @pytest.mark.regression
+    def test_columnar_slicing(self, eod_payload):
+        columns = schemas.FastEodResponseLoader().load_columns(eod_payload).data
+        date_from = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        date_to = datetime(2025, 1, 15, tzinfo=timezone.utc)
+
+        with allure.step("Select the MSFT rows of the first half of January"):
+            msft = columns.for_symbol("MSFT").between(date_from, date_to)
+
+        with allure.step("Assert the selection matches a plain filter over the rows"):
+            expected = [row for row in columns if row.symbol == "MSFT" and date_from <= row.date <= date_to]
+            assert_that(expected).is_not_empty()
+            assert_that(list(msft)).is_equal_to(expected)
+
+        with allure.step("Assert a contiguous selection shares the column arrays"):
+            head = columns[:10]
+            assert_that(head.column("close").obj).is_same_as(columns.store.floats["close"])
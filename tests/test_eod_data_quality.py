@@ -0,0 +1,77 @@
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.market import schemas
+from stub_server.dataset import SyntheticDataset
+from utils.base_assertions import BaseAssertions
+from utils.eod_data_quality import DEFAULT_EOD_RULES, evaluate_eod_rules, monotonic_dates_rule
+
+
+def eod_payload(rows):
+    """Wraps EOD rows in a /eod response payload."""
+    return {"pagination": {"limit": 1000, "offset": 0, "count": len(rows), "total": len(rows)}, "data": rows}
+
+
+@pytest.fixture
+def eod_rows():
+    """Provides valid multi-symbol /eod rows from the synthetic dataset (newest first, like the API)."""
+    return SyntheticDataset(symbols_count=3, days=60).eod_rows(["AAPL", "MSFT", "TSLA"])
+
+
+@pytest.fixture
+def broken_rows(eod_rows):
+    """Provides the synthetic /eod rows with one violation of every rule."""
+    eod_rows[3]["low"] = eod_rows[3]["adj_low"] = eod_rows[3]["high"] + 1
+    eod_rows[5]["volume"] = -1.0
+    eod_rows[7]["adj_open"] = eod_rows[7]["open"] * 2
+    # A 2:1 split on the last day of AAPL, without the earlier adjusted prices being halved
+    eod_rows[0]["split_factor"] = 2.0
+    eod_rows[10]["adj_high"] = None
+    eod_rows.append(dict(eod_rows[1]))
+    return eod_rows
+
+
+@allure.feature("Assertions")
+@allure.story("EOD Data Quality")
+class TestEodDataQuality:
+    """
+    Contains unit tests of the bulk data-quality assertions over EOD records (no API calls).
+    """
+
+    @allure.title("Test valid EOD records satisfy every rule, as DTOs and as columns")
+    @pytest.mark.regression
+    def test_valid_records(self, eod_rows):
+        loader = schemas.FastEodResponseLoader()
+        for data in (loader.load(eod_payload(eod_rows)).data, loader.load_columns(eod_payload(eod_rows)).data):
+            report = BaseAssertions.assert_eod_data_quality(data, sort="DESC")
+            assert_that(report.violations).is_length(len(DEFAULT_EOD_RULES) + 1)
+            assert_that(report.failed).is_false()
+
+    @allure.title("Test every violating row of every rule is reported in one pass")
+    @pytest.mark.negative
+    def test_all_violations_reported(self, broken_rows):
+        loader = schemas.FastEodResponseLoader()
+        rules = (*DEFAULT_EOD_RULES, monotonic_dates_rule(ascending=False))
+        reports = [evaluate_eod_rules(data, rules) for data in (loader.load(eod_payload(broken_rows)).data,
+                                                                loader.load_columns(eod_payload(broken_rows)).data)]
+        assert_that(reports[1].violations).is_equal_to(reports[0].violations)
+
+        violations = reports[0].violations
+        assert_that(violations["low <= open/close <= high"]).is_equal_to([3])
+        assert_that(violations["volume >= 0"]).is_equal_to([5])
+        # The split on row 0 breaks the adjustment of the previous AAPL day
+        assert_that(violations["adj_* consistent with split_factor"]).is_equal_to([0, 7])
+        assert_that(violations["no duplicate (symbol, date)"]).is_equal_to([len(broken_rows) - 1])
+        assert_that(violations["date non-increasing (sort=DESC)"]).is_equal_to([len(broken_rows) - 1])
+
+        table = reports[0].to_csv().splitlines()
+        assert_that(table).is_length(7)
+        assert_that(table[1]).starts_with(f"low <= open/close <= high,3,{broken_rows[3]['symbol']},")
+
+    @allure.title("Test the assertion fails with the violating rows of every rule")
+    @pytest.mark.negative
+    def test_assertion_fails(self, broken_rows):
+        data = schemas.FastEodResponseLoader().load(eod_payload(broken_rows)).data
+        with pytest.raises(AssertionError, match="EOD data quality violations") as error:
+            BaseAssertions.assert_eod_data_quality(data)
+        assert_that(str(error.value)).contains("'volume >= 0': '1 rows: [5]'")
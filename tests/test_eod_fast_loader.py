@@ -0,0 +1,61 @@
+import copy
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.market import schemas
+from stub_server.dataset import SyntheticDataset
+
+
+@pytest.fixture(scope="module")
+def eod_payload():
+    """Provides a valid multi-symbol /eod payload from the synthetic dataset."""
+    rows = SyntheticDataset(symbols_count=5, days=200).eod_rows(["AAPL", "MSFT", "SYM0000"])
+    return {"pagination": {"limit": 1000, "offset": 0, "count": len(rows), "total": len(rows)}, "data": rows}
+
+
+@allure.feature("Market API")
+@allure.story("EOD Fast-Path Deserializer")
+class TestEodFastLoader:
+    """
+    Contains parity tests of the fast /eod loader against the reference EodResponseSchema (no API calls).
+    """
+
+    @allure.title("Test fast loader builds the same DTOs as EodResponseSchema")
+    @pytest.mark.regression
+    def test_fast_loader_parity_valid_payload(self, eod_payload):
+        payload = copy.deepcopy(eod_payload)
+        payload["data"][0].update({"adj_high": None, "name": None, "volume": 1000})
+
+        fast_dto = schemas.FastEodResponseLoader().load(payload)
+        reference_dto = schemas.EodResponseSchema().load(payload)
+
+        assert_that(fast_dto).is_equal_to(reference_dto)
+        assert_that(fast_dto.data[0].volume).is_instance_of(float)
+
+    @allure.title("Test fast loader reports the same validation errors: {case_name}")
+    @pytest.mark.negative
+    @pytest.mark.parametrize("case_name, row_update", [
+        ("Missing field", {"close": ...}),
+        ("Unknown field", {"unexpected": 1}),
+        ("None in non-nullable field", {"symbol": None}),
+        ("String in float field", {"open": "not a number"}),
+        ("Boolean in float field", {"high": True}),
+        ("Infinite float", {"low": float("inf")}),
+        ("Invalid date", {"date": "yesterday"}),
+        ("Number in string field", {"exchange": 42}),
+    ])
+    def test_fast_loader_parity_invalid_payload(self, eod_payload, case_name, row_update):
+        payload = copy.deepcopy(eod_payload)
+        row = payload["data"][3]
+        for key, value in row_update.items():
+            if value is ...:
+                del row[key]
+            else:
+                row[key] = value
+
+        with pytest.raises(schemas.ValidationError) as reference_error:
+            schemas.EodResponseSchema().load(payload)
+        with pytest.raises(schemas.ValidationError) as fast_error:
+            schemas.FastEodResponseLoader().load(payload)
+
+        assert_that(fast_error.value.messages).is_equal_to(reference_error.value.messages)
@@ -0,0 +1,115 @@
+from datetime import date, datetime, timezone
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.client.api_client import APIClient
+from api_services.market.eod_store import RECORD_SIZE, EodStore
+from api_services.market.eod_sync import EodSync
+from api_services.market.filters.eod_filters import EodFilters
+from api_services.market.market_controller import MarketController
+from stub_server.server import MarketstackStub, StubSettings
+from utils.base_assertions import BaseAssertions
+
+
+@pytest.fixture(scope="module")
+def stub():
+    """Starts a local stub server for the module (300 trading days up to 2025-01-31)."""
+    with MarketstackStub(StubSettings(symbols_count=3, days=300)) as stub:
+        yield stub
+
+
+@pytest.fixture
+def market_controller(stub):
+    """Provides a MarketController on the stub."""
+    api_client = APIClient(stub.base_url, stub.settings.api_version, stub.settings.access_key, log_requests=False)
+    yield MarketController(api_client)
+    api_client.close()
+
+
+def api_history(market_controller, symbol):
+    """Returns the whole /eod history of a symbol, oldest first, as returned by the API."""
+    return list(market_controller.iter_eod_data(EodFilters(symbols=symbol, sort="ASC"), page_size=1000))
+
+
+@allure.feature("Market API")
+@allure.story("EOD Incremental Sync")
+class TestEodSync:
+    """
+    Contains tests of the incremental /eod sync and of its local store, against the local stub.
+    """
+
+    @allure.title("Test the stub filters /eod records by date range")
+    @pytest.mark.regression
+    def test_date_range_filters(self, market_controller):
+        filters = EodFilters(symbols="AAPL,MSFT", date_from="2025-01-02", date_to="2025-01-10", sort="ASC")
+        records = list(market_controller.iter_eod_data(filters))
+        assert_that({record.date.date().isoformat() for record in records}).is_equal_to(
+            {"2025-01-02", "2025-01-03", "2025-01-06", "2025-01-07", "2025-01-08", "2025-01-09", "2025-01-10"})
+
+        response = market_controller.get_eod_data(EodFilters(symbols="AAPL", date_from="2025-31-01"))
+        BaseAssertions.assert_status_code(response, 422)
+        assert_that(response.json()["error"]["message"]).contains("does not match the format Y-m-d")
+
+    @allure.title("Test a sync only fetches the days after the last stored one")
+    @pytest.mark.regression
+    def test_incremental_sync(self, market_controller, tmp_path):
+        eod_sync = EodSync(market_controller, EodStore(tmp_path))
+
+        with allure.step("Sync AAPL and MSFT up to the end of 2024"):
+            results = eod_sync.sync(["AAPL", "MSFT"], date_to=date(2024, 12, 31))
+            assert_that(results["AAPL"].last_date).is_equal_to(date(2024, 12, 31))
+            stored_2024 = results["AAPL"].rows
+
+        with allure.step("Sync again: only January 2025 is fetched for AAPL and MSFT, the whole history for TSLA"):
+            results = eod_sync.sync(["AAPL", "MSFT", "TSLA"])
+            assert_that(results["AAPL"].fetched).is_equal_to(300 - stored_2024).is_equal_to(results["AAPL"].added)
+            assert_that(results["TSLA"].fetched).is_equal_to(300)
+            assert_that(results["MSFT"].last_date).is_equal_to(date(2025, 1, 31))
+
+        with allure.step("Sync once more: nothing new is fetched"):
+            results = eod_sync.sync(["AAPL", "MSFT", "TSLA"])
+            assert_that([result.fetched for result in results.values()]).is_equal_to([0, 0, 0])
+
+        with allure.step("Assert the stored histories match the API"):
+            store = EodStore(tmp_path)
+            assert_that(store.symbols()).is_equal_to(["AAPL", "MSFT", "TSLA"])
+            for symbol in store.symbols():
+                assert_that(store.load(symbol) == api_history(market_controller, symbol)).is_true()
+
+    @allure.title("Test a re-synced range replaces the stored records of the same dates")
+    @pytest.mark.regression
+    def test_range_resync(self, market_controller, tmp_path):
+        store = EodStore(tmp_path)
+        eod_sync = EodSync(market_controller, store)
+        eod_sync.sync(["AAPL"])
+
+        with allure.step("Leave a partial record at the end of the file, as an interrupted append would"):
+            with open(tmp_path / "AAPL.eod", "ab") as symbol_file:
+                symbol_file.write(b"\0" * (RECORD_SIZE // 2))
+
+        with allure.step("Re-sync December 2024"):
+            result = eod_sync.sync(["AAPL"], date_from=date(2024, 12, 1), date_to=date(2024, 12, 31))["AAPL"]
+            assert_that(result.fetched).is_greater_than(0)
+            assert_that(result).has_added(0).has_rows(300).has_last_date(date(2025, 1, 31))
+
+        with allure.step("Assert the history is unchanged and can be sliced by date"):
+            history = api_history(market_controller, "AAPL")
+            assert_that(store.load("AAPL") == history).is_true()
+            december = store.load("AAPL", datetime(2024, 12, 1, tzinfo=timezone.utc),
+                                  datetime(2024, 12, 31, tzinfo=timezone.utc))
+            assert_that(december).is_length(result.fetched)
+
+    @allure.title("Test a store loads the records merged by another instance (e.g., another xdist worker)")
+    @pytest.mark.regression
+    def test_load_after_concurrent_merge(self, market_controller, tmp_path):
+        EodSync(market_controller, EodStore(tmp_path)).sync(["AAPL"], date_from=date(2025, 1, 1))
+        reader = EodStore(tmp_path)
+
+        with allure.step("Fill the gap before January 2025 from another store instance (the file is rewritten)"):
+            writer = EodSync(market_controller, EodStore(tmp_path))
+            writer.sync(["AAPL"], date_from=date(2024, 12, 1), date_to=date(2024, 12, 31))
+
+        with allure.step("Assert the first instance loads the merged history, not its stale row count"):
+            history = [record for record in api_history(market_controller, "AAPL")
+                       if record.date >= datetime(2024, 12, 1, tzinfo=timezone.utc)]
+            assert_that(reader.load("AAPL") == history).is_true()
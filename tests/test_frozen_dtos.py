@@ -0,0 +1,88 @@
+import copy
+from dataclasses import FrozenInstanceError, astuple, dataclass
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.market import schemas
+from stub_server.dataset import SyntheticDataset
+from utils.dataclass_factory import frozen_variant
+
+TIMEZONES_PAYLOAD = {
+    "pagination": {"limit": 100, "offset": 0, "count": 2, "total": 2},
+    "data": [{"timezone": "America/New_York", "abbr": "EST", "abbr_dst": "EDT"},
+             {"timezone": "Europe/London", "abbr": "GMT", "abbr_dst": "BST"}],
+}
+
+
+@pytest.fixture(scope="module")
+def eod_payload():
+    """Provides a valid /eod payload from the synthetic dataset."""
+    rows = SyntheticDataset(symbols_count=2, days=20).eod_rows(["AAPL", "MSFT"])
+    return {"pagination": {"limit": 1000, "offset": 0, "count": len(rows), "total": len(rows)}, "data": rows}
+
+
+@allure.feature("Market API")
+@allure.story("Frozen DTOs")
+class TestFrozenDtos:
+    """
+    Contains unit tests of the frozen (immutable, hashable, slot-based) DTO variants and their schemas (no API calls).
+    """
+
+    @allure.title("Test frozen_variant copies the fields into an immutable, hashable, slot-based dataclass")
+    @pytest.mark.regression
+    def test_frozen_variant(self):
+        @dataclass
+        class PointDTO:
+            x: int
+            y: int | None = None
+
+        frozen_class = frozen_variant(PointDTO)
+        point = frozen_class(1, 2)
+
+        assert_that(frozen_class.__name__).is_equal_to("FrozenPointDTO")
+        assert_that(frozen_class.__module__).is_equal_to(PointDTO.__module__)
+        assert_that(frozen_variant(PointDTO, "Point").__name__).is_equal_to("Point")
+        assert_that(frozen_class.__slots__).is_equal_to(("x", "y"))
+        assert_that(hasattr(point, "__dict__")).is_false()
+        with pytest.raises(FrozenInstanceError):
+            point.x = 3
+        assert_that(point).is_equal_to(frozen_class(1, 2)).is_not_equal_to(frozen_class(1, 3))
+        assert_that({point, frozen_class(1, 2), frozen_class(2, 1)}).is_length(2)
+
+    @allure.title("Test FrozenEodResponseSchema loads immutable, hashable /eod records")
+    @pytest.mark.regression
+    def test_frozen_eod_schema(self, eod_payload):
+        records = schemas.FrozenEodResponseSchema().load(eod_payload).data
+        reference_records = schemas.EodResponseSchema().load(eod_payload).data
+
+        assert_that(records).is_length(len(reference_records))
+        assert_that(records[0]).is_instance_of(schemas.FrozenEodDataDTO)
+        assert_that(hasattr(records[0], "__dict__")).is_false()
+        with pytest.raises(FrozenInstanceError):
+            records[0].close = 0.0
+        # Same values as the mutable records, and records of the same day are equal (so deduplicated in a set)
+        assert_that([astuple(record) for record in records]).is_equal_to(
+            [astuple(record) for record in reference_records])
+        assert_that(set(records + copy.deepcopy(records))).is_length(len(records))
+
+    @allure.title("Test FrozenTimezonesResponseSchema loads immutable, hashable /timezones records")
+    @pytest.mark.regression
+    def test_frozen_timezones_schema(self):
+        records = schemas.FrozenTimezonesResponseSchema().load(TIMEZONES_PAYLOAD).data
+
+        assert_that(records[0]).is_instance_of(schemas.FrozenTimezoneDataDTO)
+        assert_that(hasattr(records[0], "__dict__")).is_false()
+        with pytest.raises(FrozenInstanceError):
+            records[0].abbr = "UTC"
+        assert_that(records[0]).is_equal_to(schemas.FrozenTimezoneDataDTO("America/New_York", "EST", "EDT"))
+        assert_that({records[0], schemas.FrozenTimezoneDataDTO("America/New_York", "EST", "EDT")}).is_length(1)
+
+    @allure.title("Test the fast /eod loader builds frozen records from FrozenEodResponseSchema")
+    @pytest.mark.regression
+    def test_fast_loader_frozen_records(self, eod_payload):
+        loader = schemas.FastEodResponseLoader(schemas.FrozenEodResponseSchema())
+
+        records = loader.load(eod_payload).data
+        assert_that(records).is_equal_to(schemas.FrozenEodResponseSchema().load(eod_payload).data)
+        assert_that({type(record) for record in records}).is_equal_to({schemas.FrozenEodDataDTO})
+        assert_that(type(loader.load_row(eod_payload["data"][0]))).is_equal_to(schemas.FrozenEodDataDTO)
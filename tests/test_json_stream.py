@@ -0,0 +1,79 @@
+import json
+from collections import Counter
+import pytest
+import allure
+from assertpy import assert_that
+from utils.json_stream import ITEM, MEMBER, JsonObjectStream, iter_json_object
+
+
+def chunked(text, size):
+    """Splits the UTF-8 encoded text into chunks of `size` bytes."""
+    data = text.encode()
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+@allure.feature("Utils")
+@allure.story("Streaming JSON Parser")
+class TestJsonStream:
+    """
+    Contains unit tests of the incremental JSON object parser (no API calls).
+    """
+
+    @allure.title("Test streamed events match json.loads with chunk size {chunk_size}")
+    @pytest.mark.regression
+    @pytest.mark.parametrize("chunk_size", [1, 3, 64, 4096])
+    def test_stream_matches_full_parse(self, chunk_size):
+        payload = {
+            "pagination": {"limit": 3, "offset": 0, "count": 3, "total": 12345},
+            "data": [{"close": 123.456, "name": 'Zürich "Co"', "volume": 1e6}, {"adj_high": None}, {}],
+            "trailer": [1, 2, 3],
+        }
+        events = list(iter_json_object(chunked(json.dumps(payload, indent=1), chunk_size), stream_keys=("data",)))
+
+        assert_that(events).is_equal_to([
+            (MEMBER, "pagination", payload["pagination"]),
+            *[(ITEM, "data", item) for item in payload["data"]],
+            (MEMBER, "trailer", payload["trailer"]),
+        ])
+
+    @allure.title("Test a number split across chunks is decoded whole")
+    @pytest.mark.regression
+    def test_number_split_across_chunks(self):
+        chunks = [b'{"close": 1.', b'5e', b'3, "volume": 2', b'0, "split": tr', b'ue}']
+
+        assert_that(list(iter_json_object(chunks))).is_equal_to(
+            [(MEMBER, "close", 1500.0), (MEMBER, "volume", 20), (MEMBER, "split", True)])
+
+    @allure.title("Test a truncated stream raises a JSON decoding error")
+    @pytest.mark.negative
+    def test_truncated_stream(self):
+        text = json.dumps({"data": [{"close": 1.0}, {"close": 2.0}]})[:-5]
+
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_object(chunked(text, 4), stream_keys=("data",)))
+
+    @allure.title("Test data after the top-level object raises a JSON decoding error")
+    @pytest.mark.negative
+    @pytest.mark.parametrize("trailer", ["x", "{}", ' {"data": []}', "\n]"])
+    def test_trailing_data(self, trailer):
+        text = json.dumps({"data": [{"close": 1.0}], "total": 1})
+
+        assert_that(list(iter_json_object(chunked(text + " \n", 3), stream_keys=("data",)))).is_length(2)
+        with pytest.raises(json.JSONDecodeError, match="Extra data"):
+            list(iter_json_object(chunked(text + trailer, 3), stream_keys=("data",)))
+        with pytest.raises(json.JSONDecodeError, match="Extra data"):
+            list(iter_json_object(chunked("{}" + trailer, 1)))
+
+    @allure.title("Test a value spanning many chunks is not decoded again after every chunk")
+    @pytest.mark.regression
+    def test_value_decoded_once(self, monkeypatch):
+        payload = {"notes": ['a "[quoted]" {text}\\ ' * 500, {"nested": [[1, 2], {"}": "]"}]}], "total": 12345}
+        stream = JsonObjectStream(chunked(json.dumps(payload), 7))
+        calls = []
+        raw_decode = stream._json_decoder.raw_decode
+        monkeypatch.setattr(stream._json_decoder, "raw_decode", lambda *args: calls.append(args[1]) or raw_decode(*args))
+
+        assert_that(list(stream)).is_equal_to([(MEMBER, "notes", payload["notes"]), (MEMBER, "total", 12345)])
+        # An incomplete value is decoded once more when complete, whatever the number of chunks it spans
+        assert_that(max(Counter(calls).values())).is_less_than_or_equal_to(2)
+        assert_that(len(calls)).is_less_than_or_equal_to(8)
@@ -0,0 +1,60 @@
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.client.api_client import APIClient, PoolSettings
+from api_services.market.market_controller import MarketController
+from load_test.__main__ import format_report, parse_args
+from load_test.runner import LoadSettings, LoadTestRunner
+from load_test.scenarios import parse_mix
+from stub_server.server import MarketstackStub, StubSettings
+
+
+@allure.feature("Load Test")
+@allure.story("Load Test Runner")
+class TestLoadTest:
+    """
+    Contains unit tests of the load-test runner (against a local stub server).
+    """
+
+    @allure.title("Test the scenario mix is parsed into weights")
+    @pytest.mark.regression
+    def test_parse_mix(self):
+        assert_that(parse_mix("eod=70, timezones=30")).is_equal_to({"eod": 70.0, "timezones": 30.0})
+        assert_that(parse_mix("timezones")).is_equal_to({"timezones": 1.0})
+        with pytest.raises(ValueError, match="Unknown scenario 'splits'"):
+            parse_mix("eod=1,splits=1")
+        with pytest.raises(ValueError, match="must be positive"):
+            parse_mix("eod=0")
+
+    @allure.title("Test the CLI does not retry failed requests unless asked to, and reports the retries")
+    @pytest.mark.regression
+    def test_cli_retries(self):
+        assert_that(parse_args([]).retries).is_equal_to(0)
+        assert_that(parse_args(["--retries", "2"]).retries).is_equal_to(2)
+        report = {"mode": "open loop, 20 rps", "duration_s": 1.0, "retries": 0}
+        assert_that(format_report(report)[0]).is_equal_to("Load test: open loop, 20 rps for 1.0s, 0 retries")
+
+    @allure.title("Test the {mode} load reports throughput, errors and validated samples")
+    @pytest.mark.regression
+    @pytest.mark.parametrize("mode, concurrency", [("open loop", None), ("closed loop", 2)])
+    def test_run_against_stub(self, mode, concurrency):
+        stub_settings = StubSettings(symbols_count=3, days=50, error_rate=0.2)
+        with MarketstackStub(stub_settings) as stub:
+            # Without retries, so the simulated server errors reach the runner
+            api_client = APIClient(stub.base_url, stub_settings.api_version, stub_settings.access_key,
+                                   pool_settings=PoolSettings(max_retries=0), log_requests=False)
+            settings = LoadSettings(rps=40, concurrency=concurrency, duration=0.5, validate_sample=1.0)
+            runner = LoadTestRunner(MarketController(api_client), settings, list(stub.dataset.symbols)).run()
+            api_client.close()
+
+        report = runner.report()
+        assert_that(report["mode"]).starts_with(mode)
+        assert_that(report).contains_key("all", "eod", "timezones")
+        assert_that(report["all"]["requests"]).is_equal_to(report["eod"]["requests"] + report["timezones"]["requests"])
+        if concurrency is None:
+            assert_that(report["all"]["requests"]).is_equal_to(20)
+        # The simulated server errors are counted, and every successful response was validated
+        assert_that(report["all"]["errors"]).contains_only("HTTP 500")
+        assert_that(report["all"]["validated"]).is_equal_to(
+            report["all"]["requests"] - report["all"]["errors"]["HTTP 500"])
+        assert_that(report["all"]["latency_ms"]).contains_key("p50", "p90", "p95", "p99")
@@ -2,7 +2,7 @@ import pytest
 import allure
 from assertpy import assert_that
 from api_services.market.filters.eod_filters import EodFilters
-from api_services.market.schemas.error_response_schema import ErrorResponseSchema
+from api_services.market import schemas
 from utils.base_assertions import BaseAssertions
 
 
@@ -39,7 +39,7 @@ class TestMarketEodNegative:
         """
         with allure.step(f"Set up invalid filters for case: {test_case_name}"):
             filters = EodFilters(**filters_dict)
-            error_schema = ErrorResponseSchema()
+            error_schema = schemas.ErrorResponseSchema()
 
         with allure.step("Send GET request to /eod endpoint"):
             response = market_controller.get_eod_data(filters)
@@ -64,7 +64,7 @@ class TestMarketEodNegative:
         This test bypasses the EodFilters dataclass to send a raw request without 'symbols'.
         """
         with allure.step("Define expected error schema and messages"):
-            error_schema = ErrorResponseSchema()
+            error_schema = schemas.ErrorResponseSchema()
             expected_error_code = "validation_error"
             expected_err_message = "You have to specify at least one symbol"
 
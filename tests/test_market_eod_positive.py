@@ -1,9 +1,26 @@
+from datetime import datetime, time, timedelta, timezone
 import pytest
 import allure
 from assertpy import assert_that
 from api_services.market.filters.eod_filters import EodFilters
-from api_services.market.schemas.eod_response_schema import EodResponseSchema
+from api_services.market import schemas
 from utils.base_assertions import BaseAssertions
+from utils.snapshots import EOD_SNAPSHOT, Snapshot, diff_snapshots
+
+EOD_SYMBOLS = ["AAPL", "MSFT", "TSLA", "NVDA"]
+# History synced for a symbol not stored yet: enough for the compared days, without downloading the full history
+BASELINE_SYNC_DAYS = 90
+
+
+@pytest.fixture(scope="module")
+def eod_data_by_symbol(async_market_controller, run_concurrently):
+    """
+    Prefetches the /eod data of all EOD_SYMBOLS concurrently, in a single gather. The single-symbol calls are
+    coalesced into one multi-symbol request, whose status code and schema are verified before it is split.
+    """
+    eod_response_dtos = run_concurrently(
+        *(async_market_controller.get_eod_data_batched(EodFilters(symbols=symbol)) for symbol in EOD_SYMBOLS))
+    return dict(zip(EOD_SYMBOLS, eod_response_dtos))
 
 
 @allure.feature("Market API")
@@ -17,28 +34,24 @@ class TestMarketEodPositive:
     @allure.description("Tests the GET /eod endpoint for a single valid symbol. "
                         "It verifies the status code, response schema, and that data is returned.")
     @pytest.mark.smoke
-    @pytest.mark.parametrize("symbol", ["AAPL", "MSFT", "TSLA", "NVDA"])
-    def test_get_eod_data_with_symbols(self, market_controller, symbol):
+    @pytest.mark.parametrize("symbol", EOD_SYMBOLS)
+    def test_get_eod_data_with_symbols(self, eod_data_by_symbol, symbol):
         """
         Tests the GET /eod endpoint for a single valid symbol.
         It verifies the status code, response schema, and that data is returned.
         """
         with allure.step(f"Set up EOD filters for symbol: {symbol}"):
             filters = EodFilters(symbols=symbol)
-            expected_schema = EodResponseSchema()
-
-        with allure.step("Send GET request to /eod endpoint"):
-            response = market_controller.get_eod_data(filters)
-            response_json = response.json()
 
-        with allure.step("Verify status code 200 and deserialize response"):
-            BaseAssertions.assert_status_code(response, 200)
-            eod_response_dto = BaseAssertions.validate_and_deserialize(response_json, expected_schema)
+        with allure.step("Get the prefetched (batched, validated and deserialized) /eod data of the symbol"):
+            eod_response_dto = eod_data_by_symbol[filters.symbols]
 
         with allure.step("Assert response data content"):
             assert_that(eod_response_dto.pagination.total).is_greater_than(0)
             assert_that(eod_response_dto.data).is_not_empty()
             assert_that(eod_response_dto.data[0].symbol).is_equal_to(symbol)
+            assert_that(eod_response_dto.data).is_length(eod_response_dto.pagination.count)
+            assert_that({record.symbol for record in eod_response_dto.data}).is_equal_to({symbol})
 
     @allure.title("Test EOD endpoint with optional filters: {symbol} with {filters}")
     @allure.description("Tests that optional filters like 'limit' and 'sort' work as expected.")
@@ -53,7 +66,7 @@ class TestMarketEodPositive:
         """
         with allure.step(f"Set up EOD filters for {symbol} with filters: {filters}"):
             request_filters = EodFilters(symbols=symbol, **filters)
-            expected_schema = EodResponseSchema()
+            expected_schema = schemas.FastEodResponseLoader()
 
         with allure.step("Send GET request to /eod endpoint"):
             response = market_controller.get_eod_data(request_filters)
@@ -64,3 +77,142 @@ class TestMarketEodPositive:
             eod_response_dto = BaseAssertions.validate_and_deserialize(response_json, expected_schema)
 
             assert_that(eod_response_dto.data).is_length(expected_count)
+
+    @allure.title("Test the /eod records of {symbols} sorted {sort} pass the data-quality rules")
+    @allure.description("Checks the price ranges, volumes, split adjustments, uniqueness and date order of a full "
+                        "/eod page of several symbols, over all its records at once.")
+    @pytest.mark.regression
+    @pytest.mark.parametrize("symbols, sort", [
+        ("AAPL", "DESC"),
+        ("AAPL,MSFT", "ASC")
+    ])
+    def test_eod_data_quality(self, market_controller, symbols, sort):
+        """
+        Checks the data-quality rules over all the records of a full /eod page.
+        """
+        with allure.step(f"Send GET request to /eod for {symbols} with limit=1000 and sort={sort}"):
+            request_filters = EodFilters(symbols=symbols, sort=sort, limit=1000)
+            response = market_controller.get_eod_data(request_filters)
+
+        with allure.step("Verify status code 200 and deserialize response"):
+            BaseAssertions.assert_status_code(response, 200)
+            eod_response_dto = BaseAssertions.validate_and_deserialize(response.json(),
+                                                                       schemas.FastEodResponseLoader(columnar=True))
+
+        with allure.step("Assert the records pass the data-quality rules"):
+            assert_that(eod_response_dto.data).is_not_empty()
+            BaseAssertions.assert_eod_data_quality(eod_response_dto.data, sort=sort)
+
+    @allure.title("Test the /eod records of {symbol} for January 2025 match their golden snapshot")
+    @allure.description("Compares the /eod response for a closed date range with the snapshot recorded with "
+                        "--update-snapshots. The adjusted prices change with later splits and dividends, so they "
+                        "are not compared.")
+    @pytest.mark.regression
+    @pytest.mark.parametrize("symbol", ["AAPL", "MSFT"])
+    def test_eod_data_matches_snapshot(self, market_controller, snapshots, symbol):
+        """
+        Compares the /eod response for a closed date range with its golden snapshot.
+        """
+        with allure.step(f"Send GET request to /eod for {symbol} in January 2025"):
+            request_filters = EodFilters(symbols=symbol, date_from="2025-01-01", date_to="2025-01-31", sort="ASC")
+            response = market_controller.get_eod_data(request_filters)
+
+        with allure.step("Verify status code 200 and deserialize response"):
+            BaseAssertions.assert_status_code(response, 200)
+            eod_response_dto = BaseAssertions.validate_and_deserialize(response.json(),
+                                                                       schemas.FastEodResponseLoader())
+
+        snapshots.assert_match(f"eod/{symbol}_2025-01", eod_response_dto, EOD_SNAPSHOT.with_ignore("data.adj_*"))
+
+    @allure.title("Test the latest /eod records of {symbol} match the stored baseline")
+    @allure.description("Syncs the local /eod history of the symbol (only the days after the last stored one are "
+                        "fetched, or its latest 90 days if none is stored), then compares the records of its last 30 "
+                        "stored days with those the API returns now, so corrections of past days are detected. The "
+                        "adjusted prices change with later splits and dividends, so they are not compared.")
+    @pytest.mark.regression
+    @pytest.mark.parametrize("symbol", ["AAPL", "MSFT"])
+    def test_eod_data_matches_stored_baseline(self, eod_sync, market_controller, symbol):
+        """
+        Compares the latest /eod records of a symbol with its stored history, after syncing it.
+        """
+        with allure.step(f"Sync the stored /eod history of {symbol}"):
+            sync_from = None
+            if eod_sync.store.last_date(symbol) is None:
+                latest = market_controller.load_eod_response(
+                    market_controller.get_eod_data(EodFilters(symbols=symbol, limit=1))).data[0]
+                sync_from = latest.date.date() - timedelta(days=BASELINE_SYNC_DAYS)
+            result = eod_sync.sync([symbol], date_from=sync_from)[symbol]
+            assert_that(result.rows).is_greater_than(0)
+
+        with allure.step("Send GET requests to /eod for the last 30 stored days"):
+            date_to = result.last_date
+            date_from = date_to - timedelta(days=30)
+            request_filters = EodFilters(symbols=symbol, date_from=date_from.isoformat(),
+                                         date_to=date_to.isoformat(), sort="ASC")
+            records = list(market_controller.iter_eod_data(request_filters, page_size=1000))
+            assert_that(records).is_not_empty()
+
+        with allure.step("Assert the records match the stored baseline, except for the adjusted prices"):
+            baseline = eod_sync.store.load(symbol, datetime.combine(date_from, time(), timezone.utc),
+                                           datetime.combine(date_to, time.max, timezone.utc))
+            spec = EOD_SNAPSHOT.with_ignore("data.adj_*")
+            pagination = schemas.PaginationDTO(limit=0, offset=0, count=0, total=0)
+            result = diff_snapshots(Snapshot.from_response(schemas.EodResponseDTO(pagination, baseline), spec),
+                                    Snapshot.from_response(schemas.EodResponseDTO(pagination, records), spec))
+            assert_that(result.unchanged, "\n".join(result.lines(30))).is_equal_to(len(records))
+            assert_that(bool(result)).is_false()
+
+    @allure.title("Test EOD pagination iterator for {symbol} (parallel_pages={parallel_pages})")
+    @allure.description("Tests that iterating over the /eod pages yields consecutive, non-overlapping records "
+                        "in date order, with or without parallel page fetching.")
+    @pytest.mark.regression
+    @pytest.mark.parametrize("symbol, parallel_pages", [
+        ("AAPL", 1),
+        ("AAPL", 3)
+    ])
+    def test_iter_eod_data_pages(self, market_controller, symbol, parallel_pages):
+        """
+        Tests that iterating over the /eod pages yields consecutive, non-overlapping records in date order.
+        """
+        with allure.step(f"Set up EOD filters for {symbol} with 4 pages of 5 records"):
+            filters = EodFilters(symbols=symbol)
+            page_size, max_pages = 5, 4
+
+        with allure.step("Iterate over the /eod pages"):
+            records = list(market_controller.iter_eod_data(filters, page_size=page_size,
+                                                           parallel_pages=parallel_pages, max_pages=max_pages))
+
+        with allure.step("Assert records are complete, unique and sorted by date (newest first)"):
+            dates = [record.date for record in records]
+            assert_that(records).is_length(page_size * max_pages)
+            assert_that(set(dates)).is_length(len(dates))
+            assert_that(dates).is_equal_to(sorted(dates, reverse=True))
+
+    @allure.title("Test streamed /eod response for {symbol} with limit={limit}")
+    @allure.description("Tests that records parsed incrementally from the /eod response stream are the same "
+                        "as the ones of the fully loaded response.")
+    @pytest.mark.regression
+    @pytest.mark.parametrize("symbol, limit", [
+        ("AAPL", 50),
+        ("MSFT", 500)
+    ])
+    def test_stream_eod_data(self, market_controller, symbol, limit):
+        """
+        Tests that records parsed incrementally from the /eod response stream match the fully loaded response.
+        """
+        with allure.step(f"Set up EOD filters for {symbol} with limit={limit}"):
+            filters = EodFilters(symbols=symbol, limit=limit)
+
+        with allure.step("Send streamed GET request to /eod endpoint and collect the records"):
+            eod_stream = market_controller.stream_eod_data(filters, chunk_size=4096)
+            BaseAssertions.assert_status_code(eod_stream.response, 200)
+            streamed_records = list(eod_stream)
+
+        with allure.step("Send regular GET request to /eod endpoint"):
+            response = market_controller.get_eod_data(filters)
+            eod_response_dto = BaseAssertions.validate_and_deserialize(response.json(), schemas.FastEodResponseLoader())
+
+        with allure.step("Assert streamed records and pagination match the regular response"):
+            assert_that(streamed_records).is_length(eod_stream.pagination.count)
+            assert_that(eod_stream.pagination).is_equal_to(eod_response_dto.pagination)
+            assert_that(streamed_records).is_equal_to(eod_response_dto.data)
@@ -2,12 +2,15 @@ import pytest
 import allure
 from assertpy import assert_that, soft_assertions
 from api_services.market.filters.timezone_filters import TimezoneFilters
-from api_services.market.schemas.timezone_response_schema import TimezonesResponseSchema
+from api_services.market import schemas
 from utils.base_assertions import BaseAssertions
+from utils.snapshots import TIMEZONES_SNAPSHOT
 
 
 @allure.feature("Market API")
 @allure.story("Timezones Endpoint - Positive Scenarios")
+# Kept on one worker by --balance-by-cost: test_timezones_latency_percentile asserts on the requests of the others
+@pytest.mark.xdist_group("timezones_positive")
 class TestMarketTimezonesPositive:
     """
     Contains all positive test cases for the /timezones endpoint.
@@ -16,13 +19,13 @@ class TestMarketTimezonesPositive:
     @allure.title("Test GET /timezones endpoint (all timezones)")
     @allure.description("Tests the GET /timezones endpoint without any optional filters.")
     @pytest.mark.smoke
-    def test_get_all_timezones(self, market_controller):
+    def test_get_all_timezones(self, market_controller, slo):
         """
         Tests the GET /timezones endpoint without any optional filters.
         """
         with allure.step("Set up filters and expected schema"):
             filters = TimezoneFilters()
-            expected_schema = TimezonesResponseSchema()
+            expected_schema = schemas.TimezonesResponseSchema()
 
         with allure.step("Send GET request to /timezones"):
             response = market_controller.get_timezones(filters)
@@ -37,6 +40,10 @@ class TestMarketTimezonesPositive:
             assert_that(timezones_dto.data).is_not_empty()
             assert_that([tz.timezone for tz in timezones_dto.data]).contains("America/New_York")
 
+        with allure.step("Assert response time and payload size are within the SLOs"):
+            BaseAssertions.assert_response_time(response, slo.response_ms)
+            BaseAssertions.assert_payload_size(response, slo.payload_kb * 1024)
+
     @allure.title("Test GET /timezones with pagination: limit={limit}, offset={offset}")
     @allure.description("Tests that pagination filters (limit, offset) work as expected for /timezones.")
     @pytest.mark.regression
@@ -50,7 +57,7 @@ class TestMarketTimezonesPositive:
         """
         with allure.step(f"Set up filters: limit={limit}, offset={offset}"):
             filters = TimezoneFilters(limit=limit, offset=offset)
-            expected_schema = TimezonesResponseSchema()
+            expected_schema = schemas.TimezonesResponseSchema()
 
         with allure.step("Send GET request to /timezones"):
             response = market_controller.get_timezones(filters)
@@ -80,7 +87,7 @@ class TestMarketTimezonesPositive:
         """
         with allure.step("Set up filters and expected schema"):
             filters = TimezoneFilters()
-            expected_schema = TimezonesResponseSchema()
+            expected_schema = schemas.TimezonesResponseSchema()
 
         with allure.step("Send GET request to /timezones to fetch all data"):
             response = market_controller.get_timezones(filters)
@@ -100,3 +107,53 @@ class TestMarketTimezonesPositive:
             with soft_assertions():
                 assert_that(found_timezone.abbr).is_equal_to(expected_abbr)
                 assert_that(found_timezone.abbr_dst).is_equal_to(expected_abbr_dst)
+
+    @allure.title("Test /timezones pagination iterator with page size {page_size}")
+    @allure.description("Tests that iterating over all the /timezones pages yields every timezone exactly once.")
+    @pytest.mark.regression
+    @pytest.mark.parametrize("page_size", [7, 10])
+    def test_iter_all_timezones(self, market_controller, page_size):
+        """
+        Tests that iterating over all the /timezones pages yields every timezone exactly once.
+        """
+        with allure.step(f"Iterate over all the /timezones pages of {page_size} records"):
+            pages = list(market_controller.iter_timezones_pages(TimezoneFilters(), page_size=page_size))
+            timezones = [tz.timezone for page in pages for tz in page.data]
+
+        with allure.step("Assert the number of timezones matches pagination.total and they are unique"):
+            assert_that(timezones).is_length(pages[0].pagination.total)
+            assert_that(set(timezones)).is_length(len(timezones))
+            assert_that(timezones).contains("America/New_York")
+
+    @allure.title("Test the /timezones list matches its golden snapshot")
+    @allure.description("Compares every timezone of the /timezones response with the snapshot recorded with "
+                        "--update-snapshots.")
+    @pytest.mark.regression
+    def test_timezones_match_snapshot(self, market_controller, snapshots):
+        """
+        Compares every timezone of the /timezones response with its golden snapshot.
+        """
+        with allure.step("Send GET request to /timezones"):
+            response = market_controller.get_timezones(TimezoneFilters())
+
+        with allure.step("Verify status code 200 and deserialize response"):
+            BaseAssertions.assert_status_code(response, 200)
+            timezones_dto = BaseAssertions.validate_and_deserialize(response.json(),
+                                                                    schemas.TimezonesResponseSchema())
+
+        snapshots.assert_match("timezones/all", timezones_dto, TIMEZONES_SNAPSHOT)
+
+    @allure.title("Test p95 latency of the /timezones requests of this class")
+    @allure.description("Tests that the percentile of the /timezones response times, across all the requests sent "
+                        "by the tests above, is within the SLO.")
+    @pytest.mark.regression
+    def test_timezones_latency_percentile(self, request, api_client, slo):
+        """
+        Tests that the percentile of the /timezones response times, across all the requests sent by the tests
+        above, is within the SLO.
+        """
+        with allure.step("Select the /timezones requests sent by the tests of this class"):
+            node_prefix = request.node.nodeid.rsplit("::", 1)[0] + "::"
+
+        BaseAssertions.assert_latency_percentile(api_client.timings, slo.percentile_ms, pct=slo.percentile,
+                                                 endpoint="/timezones", node_prefix=node_prefix)
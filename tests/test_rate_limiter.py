@@ -0,0 +1,117 @@
+import os
+import time
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.client.api_client import APIClient, PoolSettings
+from api_services.client.rate_limiter import QuotaExceededError, RateLimiter, RateLimitSettings
+from stub_server.server import MarketstackStub, StubSettings
+
+
+class FakeTime:
+    """A clock that only advances when sleeping."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@allure.feature("API Client")
+@allure.story("Rate Limiter")
+class TestRateLimiter:
+    """
+    Contains unit tests of the client-side rate limiter and quota budget (no API calls).
+    """
+
+    @allure.title("Test requests beyond the burst wait for the token refill")
+    @pytest.mark.regression
+    def test_throttles_beyond_burst(self, tmp_path):
+        fake_time = FakeTime()
+        limiter = RateLimiter(RateLimitSettings(enabled=True, requests_per_second=2, burst=2),
+                              tmp_path / "state.json", fake_time.clock, fake_time.sleep)
+
+        waits = [limiter.acquire("/eod") for _ in range(4)]
+
+        assert_that(waits).is_equal_to([0, 0, 0.5, 0.5])
+        assert_that(limiter.stats()).contains_entry({"waits": 2}, {"wait_seconds": 1.0})
+
+    @allure.title("Test the state is shared by limiters using the same state file")
+    @pytest.mark.regression
+    def test_state_is_shared(self, tmp_path):
+        fake_time = FakeTime()
+        settings = RateLimitSettings(enabled=True, requests_per_second=1, burst=1, endpoint_weights={"/eod": 3})
+        first = RateLimiter(settings, tmp_path / "state.json", fake_time.clock, fake_time.sleep)
+        second = RateLimiter(settings, tmp_path / "state.json", fake_time.clock, fake_time.sleep)
+
+        # The /eod request takes the full bucket and leaves a debt of 2 tokens, so the next one waits 3s
+        assert_that(first.acquire("/eod")).is_equal_to(0)
+        assert_that(second.acquire("/timezones")).is_equal_to(3)
+        assert_that(second.stats()["quota_used"]).is_equal_to(4)
+
+    @allure.title("Test the state files of old runs are removed")
+    @pytest.mark.regression
+    def test_stale_state_removed(self, tmp_path):
+        stale_path = tmp_path / "marketstack-rate-limit-old.json"
+        recent_path = tmp_path / "marketstack-rate-limit-new.json"
+        for path in (stale_path, recent_path):
+            path.write_text("{}")
+        os.utime(stale_path, (time.time() - RateLimiter.STALE_AFTER - 60,) * 2)
+
+        RateLimiter(RateLimitSettings(enabled=True, state_dir=str(tmp_path)))
+
+        assert_that(str(stale_path)).does_not_exist()
+        assert_that(str(recent_path)).exists()
+
+    @allure.title("Test a request exceeding the budget fails fast")
+    @pytest.mark.negative
+    def test_budget_exceeded(self, tmp_path):
+        fake_time = FakeTime()
+        limiter = RateLimiter(RateLimitSettings(enabled=True, request_budget=2), tmp_path / "state.json",
+                              fake_time.clock, fake_time.sleep)
+        limiter.acquire("/eod")
+        limiter.acquire("/eod")
+
+        with pytest.raises(QuotaExceededError, match="budget of the run is exhausted: 2 of 2 used"):
+            limiter.acquire("/timezones")
+
+    @allure.title("Test the requests are counted per month across runs, up to the monthly quota")
+    @pytest.mark.negative
+    def test_monthly_quota(self, tmp_path):
+        fake_time = FakeTime()
+        settings = RateLimitSettings(enabled=True, requests_per_second=100, burst=100, monthly_quota=3,
+                                     endpoint_weights={"/eod": 2})
+        usage_path = tmp_path / "quota" / "usage.json"
+
+        first_run = RateLimiter(settings, tmp_path / "run1.json", fake_time.clock, fake_time.sleep, usage_path)
+        first_run.acquire("/eod")
+        second_run = RateLimiter(settings, tmp_path / "run2.json", fake_time.clock, fake_time.sleep, usage_path)
+        second_run.acquire("/timezones")
+        assert_that(second_run.stats()).contains_entry({"monthly_used": 3}, {"quota_used": 1})
+        with pytest.raises(QuotaExceededError, match="monthly quota is exhausted: 3 of 3 used in 1970-01"):
+            second_run.acquire("/timezones")
+
+        with allure.step("Assert the count starts over in the next month"):
+            fake_time.now += 31 * 24 * 3600
+            second_run.acquire("/eod")
+            assert_that(second_run.stats()["monthly_used"]).is_equal_to(2)
+
+    @allure.title("Test the requests retried by the APIClient are charged to the rate limiter")
+    @pytest.mark.regression
+    def test_retries_charged(self, tmp_path):
+        limiter = RateLimiter(RateLimitSettings(enabled=True, requests_per_second=1000, burst=10),
+                              tmp_path / "state.json", usage_path=tmp_path / "usage.json")
+        with MarketstackStub(StubSettings(symbols_count=2, days=5, error_rate=1.0)) as stub:
+            api_client = APIClient(stub.base_url, stub.settings.api_version, stub.settings.access_key,
+                                   pool_settings=PoolSettings(max_retries=2, backoff_factor=0),
+                                   rate_limiter=limiter, log_requests=False)
+            response = api_client.get("/timezones")
+            api_client.close()
+
+        # The first attempt and its 2 retries all reached the API
+        assert_that(response.status_code).is_equal_to(500)
+        assert_that(limiter.stats()).contains_entry({"requests": 3}, {"quota_used": 3}, {"monthly_used": 3})
@@ -0,0 +1,57 @@
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.client.response_cache import CacheSettings, ResponseCache
+
+
+class FakeClock:
+    """A manually advanced clock for TTL checks."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@allure.feature("API Client")
+@allure.story("Response Cache")
+class TestResponseCache:
+    """
+    Contains unit tests for the APIClient response cache (no API calls).
+    """
+
+    @allure.title("Test cache key ignores the access_key and the parameter order")
+    @pytest.mark.regression
+    def test_cache_key_ignores_access_key(self):
+        cache = ResponseCache(CacheSettings(enabled=True))
+        cache.put("/eod", {"symbols": "AAPL", "limit": 5, "access_key": "first"}, "response")
+
+        assert_that(cache.get("/eod", {"limit": 5, "symbols": "AAPL", "access_key": "second"})).is_equal_to("response")
+        assert_that(cache.get("/eod", {"symbols": "MSFT"})).is_none()
+        assert_that(cache.stats()).contains_entry({"hits": 1}, {"misses": 1})
+
+    @allure.title("Test cached responses expire after the endpoint TTL")
+    @pytest.mark.regression
+    def test_cache_entries_expire(self):
+        clock = FakeClock()
+        cache = ResponseCache(CacheSettings(enabled=True, default_ttl=10, endpoint_ttls={"/timezones": 60}), clock)
+        cache.put("/eod", {}, "eod")
+        cache.put("/timezones", {}, "timezones")
+
+        clock.now = 30
+        assert_that(cache.get("/eod", {})).is_none()
+        assert_that(cache.get("/timezones", {})).is_equal_to("timezones")
+
+    @allure.title("Test least recently used entries are evicted above max_entries")
+    @pytest.mark.regression
+    def test_cache_evicts_least_recently_used(self):
+        cache = ResponseCache(CacheSettings(enabled=True, max_entries=2))
+        cache.put("/eod", {"symbols": "AAPL"}, "AAPL")
+        cache.put("/eod", {"symbols": "MSFT"}, "MSFT")
+        cache.get("/eod", {"symbols": "AAPL"})
+        cache.put("/eod", {"symbols": "TSLA"}, "TSLA")
+
+        assert_that(cache.get("/eod", {"symbols": "MSFT"})).is_none()
+        assert_that(cache.get("/eod", {"symbols": "AAPL"})).is_equal_to("AAPL")
+        assert_that(cache.stats()["evictions"]).is_equal_to(1)
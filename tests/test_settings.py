@@ -0,0 +1,92 @@
+import subprocess
+import sys
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.client.response_cache import CacheSettings
+from enums.environment import Env
+from utils.settings import SETTINGS_ENV_VAR, Settings, SettingsError, get_settings
+from utils.startup_profile import import_time_by_package, parse_import_times
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Provides a project directory with .env, config.ini and secrets.ini files for ENV=dev."""
+    monkeypatch.setenv("ENV", "dev")
+    monkeypatch.delenv(SETTINGS_ENV_VAR, raising=False)
+    (tmp_path / ".env").write_text("ENV=dev\n")
+    (tmp_path / "config.ini").write_text("[dev]\nbase_url = http://dev\ncache_enabled = yes\ncache_ttl = 30\n")
+    (tmp_path / "secrets.ini").write_text("[dev]\naccess_key = API_ACCESS_KEY\n")
+    return tmp_path
+
+
+@allure.feature("Framework")
+@allure.story("Settings")
+class TestSettings:
+    """
+    Contains unit tests of the settings resolved once per run, and of the startup profiling helpers.
+    """
+
+    @allure.title("Test settings are read from the files and shared with worker processes")
+    @pytest.mark.regression
+    def test_load_and_share(self, project, monkeypatch):
+        settings = Settings.load(project)
+        assert_that(settings.env).is_equal_to(Env.DEV)
+        assert_that(settings.config["base_url"]).is_equal_to("http://dev")
+        assert_that(CacheSettings.from_config(settings.config)).has_enabled(True).has_default_ttl(30.0)
+        assert_that(settings.config.getint("missing", fallback=7)).is_equal_to(7)
+        with pytest.raises(TypeError):
+            settings.config["base_url"] = "http://other"
+
+        # A worker rebuilds them from the environment, even once the files are gone
+        monkeypatch.setenv(SETTINGS_ENV_VAR, settings.to_json())
+        (project / "config.ini").unlink()
+        assert_that(get_settings(project)).is_equal_to(settings)
+
+    @allure.title("Test invalid settings and secrets are reported")
+    @pytest.mark.negative
+    def test_invalid_settings(self, project, monkeypatch):
+        with pytest.raises(SettingsError, match="still set to the placeholder"):
+            _ = Settings.load(project).access_key
+
+        monkeypatch.setenv("ENV", "nowhere")
+        with pytest.raises(SettingsError, match="Invalid ENV value 'nowhere'"):
+            Settings.load(project)
+
+        (project / ".env").unlink()
+        with pytest.raises(SettingsError, match="The .env file is missing"):
+            Settings.load(project)
+
+    @allure.title("Test the controllers do not import the schemas until they are used")
+    @pytest.mark.regression
+    def test_schemas_imported_lazily(self, project_root):
+        code = ("import sys\n"
+                "import api_services.market.market_controller, load_test.runner\n"
+                "print('marshmallow' in sys.modules)\n"
+                "from api_services.market import schemas\n"
+                "schemas.TimezonesResponseSchema()\n"
+                "print('marshmallow' in sys.modules)\n")
+        output = subprocess.run([sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True,
+                                check=True).stdout
+        assert_that(output.split()).is_equal_to(["False", "True"])
+
+    @allure.title("Test the root conftest does not import the modules its fixtures and hooks import on use")
+    @pytest.mark.regression
+    def test_conftest_imports_lazily(self, project_root):
+        modules = ["sqlite3", "api_services.client.shared_cache", "stub_server.server", "utils.snapshots",
+                   "utils.cost_scheduling", "xdist.scheduler"]
+        code = f"import sys, conftest\nprint([module for module in {modules!r} if module in sys.modules])\n"
+        output = subprocess.run([sys.executable, "-c", code], cwd=project_root, capture_output=True, text=True,
+                                check=True).stdout
+        assert_that(output.strip()).is_equal_to("[]")
+
+    @allure.title("Test the import time output is summed per package")
+    @pytest.mark.regression
+    def test_import_time_by_package(self):
+        output = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |     requests.compat\n"
+                  "import time:       300 |        420 |   requests\n"
+                  "import time:        50 |         50 | json\n")
+        imports = parse_import_times(output)
+        assert_that(imports).contains(("requests", 300, 420))
+        assert_that(import_time_by_package(imports)).is_equal_to({"requests": 420, "json": 50})
@@ -0,0 +1,74 @@
+import multiprocessing
+import pytest
+import allure
+import requests
+from assertpy import assert_that
+from api_services.client.api_client import APIClient
+from api_services.client.response_cache import CacheSettings
+from api_services.client.shared_cache import SharedResponseCache
+from stub_server.server import MarketstackStub, StubSettings
+
+
+def make_response(body):
+    """Builds a read requests.Response as returned by the API."""
+    response = requests.Response()
+    response.status_code = 200
+    response.reason = "OK"
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response.headers["Content-Length"] = str(len(body))
+    response._content = body
+    return response
+
+
+def fetch_timezones_in_worker(base_url, stub_settings, cache_path):
+    """Runs in a separate process, like a pytest-xdist worker: returns the body and the requests it sent."""
+    api_client = APIClient(base_url, stub_settings.api_version, stub_settings.access_key, log_requests=False,
+                           shared_cache=SharedResponseCache(CacheSettings(enabled=True, shared=True), cache_path))
+    body = api_client.get("/timezones", {"limit": 10}).content
+    api_client.close()
+    return body, api_client.pool_stats()["requests_sent"]
+
+
+@allure.feature("API Client")
+@allure.story("Shared Response Cache")
+class TestSharedCache:
+    """
+    Contains unit tests of the response cache shared between processes.
+    """
+
+    @allure.title("Test stored responses are rebuilt until their TTL expires")
+    @pytest.mark.regression
+    def test_store_and_expire(self, tmp_path):
+        now = [1000.0]
+        settings = CacheSettings(enabled=True, shared=True, default_ttl=10, endpoint_ttls={"/timezones": 0})
+        cache = SharedResponseCache(settings, tmp_path / "cache.sqlite", clock=lambda: now[0])
+        cache.put("/eod", {"symbols": "AAPL", "access_key": "secret"}, make_response(b'{"a": 1}'), "http://x/v2/eod")
+        cache.put("/timezones", {}, make_response(b"{}"))
+
+        response = SharedResponseCache(settings, tmp_path / "cache.sqlite", clock=lambda: now[0]).get(
+            "/eod", {"symbols": "AAPL"})
+        assert_that(response.json()).is_equal_to({"a": 1})
+        assert_that(response.url).is_equal_to("http://x/v2/eod")
+        assert_that(response.headers).does_not_contain_key("Content-Length")
+        # A TTL of 0 disables caching the endpoint
+        assert_that(cache.get("/timezones", {})).is_none()
+
+        now[0] += 11
+        assert_that(cache.get("/eod", {"symbols": "AAPL"})).is_none()
+        assert_that(cache.stats()).contains_entry({"hits": 0}, {"misses": 2}, {"stores": 1})
+        cache.close()
+
+    @allure.title("Test only one of several processes fetches a response")
+    @pytest.mark.regression
+    @pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="Needs fork() to start workers")
+    def test_one_fetch_across_processes(self, tmp_path):
+        stub_settings = StubSettings(symbols_count=2, days=10, latency_ms=200)
+        with MarketstackStub(stub_settings) as stub:
+            with multiprocessing.get_context("fork").Pool(4) as pool:
+                results = pool.starmap(fetch_timezones_in_worker,
+                                       [(stub.base_url, stub_settings, tmp_path / "cache.sqlite")] * 4)
+
+        bodies = {body for body, _ in results}
+        assert_that(bodies).is_length(1)
+        assert_that(sum(requests_sent for _, requests_sent in results)).is_equal_to(1)
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import pytest
+import allure
+from concurrent.futures import ThreadPoolExecutor
+from assertpy import assert_that
+from api_services.client.api_client import APIClient
+from api_services.client.async_api_client import AsyncAPIClient
+from api_services.client.single_flight import SingleFlight
+from stub_server.server import MarketstackStub, StubSettings
+
+
+@pytest.fixture
+def client_on_slow_stub():
+    """Provides an APIClient with single-flight, on a stub server answering after 200 ms."""
+    settings = StubSettings(symbols_count=2, days=10, latency_ms=200)
+    with MarketstackStub(settings) as stub:
+        api_client = APIClient(stub.base_url, settings.api_version, settings.access_key,
+                               single_flight=SingleFlight(), log_requests=False)
+        yield api_client
+        api_client.close()
+
+
+@allure.feature("API Client")
+@allure.story("Single-flight")
+class TestSingleFlight:
+    """
+    Contains unit tests of the deduplication of identical in-flight requests.
+    """
+
+    @allure.title("Test concurrent calls for the same key share one call and its error")
+    @pytest.mark.regression
+    def test_shares_result_and_error(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def slow_call(outcome):
+            calls.append(outcome)
+            release.wait(5)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            results = [executor.submit(single_flight.do, "a", lambda: slow_call("result")) for _ in range(3)]
+            errors = [executor.submit(single_flight.do, "b", lambda: slow_call(ValueError("boom"))) for _ in range(3)]
+            while single_flight.stats()["calls"] < 6:
+                release.wait(0.01)
+            release.set()
+
+        assert_that([future.result() for future in results]).is_equal_to(["result"] * 3)
+        for future in errors:
+            assert_that(future.exception()).is_instance_of(ValueError)
+        assert_that(calls).is_length(2)
+        assert_that(single_flight.stats()).is_equal_to({"calls": 6, "shared": 4, "in_flight": 0})
+
+        assert_that(single_flight.do("a", lambda: "again")).is_equal_to("again")
+
+    @allure.title("Test identical threaded requests share one network call")
+    @pytest.mark.regression
+    def test_threaded_requests(self, client_on_slow_stub):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(client_on_slow_stub.get, "/timezones", {"limit": limit})
+                       for limit in (5, 5, 5, 10)]
+        responses = [future.result() for future in futures]
+
+        assert_that(responses[1]).is_same_as(responses[0])
+        assert_that(responses[3].json()["pagination"]["limit"]).is_equal_to(10)
+        assert_that(client_on_slow_stub.pool_stats()["requests_sent"]).is_equal_to(2)
+        assert_that(client_on_slow_stub.single_flight.stats()).contains_entry({"shared": 2})
+
+    @allure.title("Test identical asyncio requests share one network call")
+    @pytest.mark.regression
+    def test_async_requests(self, client_on_slow_stub):
+        async_client = AsyncAPIClient(client_on_slow_stub, max_concurrency=2)
+
+        async def first_cancelled():
+            waiters = [asyncio.ensure_future(async_client.get("/eod", {"symbols": "AAPL"})) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            waiters[0].cancel()
+            return await asyncio.gather(*waiters[1:])
+
+        responses = asyncio.run(first_cancelled())
+        async_client.close()
+
+        assert_that(responses[0]).is_same_as(responses[1])
+        assert_that(responses[0].status_code).is_equal_to(200)
+        assert_that(client_on_slow_stub.pool_stats()["requests_sent"]).is_equal_to(1)
+        assert_that(client_on_slow_stub.single_flight.stats()).contains_entry({"calls": 3}, {"shared": 2})
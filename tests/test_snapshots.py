@@ -0,0 +1,96 @@
+import copy
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.market import schemas
+from stub_server.dataset import SyntheticDataset
+from utils.snapshots import (EOD_SNAPSHOT, TIMEZONES_SNAPSHOT, Snapshot, SnapshotSpec, SnapshotStore,
+                             diff_snapshots)
+
+
+@pytest.fixture(scope="module")
+def eod_payload():
+    """Provides a valid multi-symbol /eod payload from the synthetic dataset (newest first, like the API)."""
+    rows = SyntheticDataset(symbols_count=3, days=100).eod_rows(["AAPL", "MSFT", "TSLA"])
+    return {"pagination": {"limit": 1000, "offset": 0, "count": len(rows), "total": len(rows)}, "data": rows}
+
+
+@pytest.fixture
+def changed_payload(eod_payload):
+    """Provides the /eod payload with one changed, one removed and one added record, and a new total."""
+    payload = copy.deepcopy(eod_payload)
+    payload["data"][5]["close"] = 1.5
+    del payload["data"][7]
+    payload["data"].append(dict(payload["data"][0], date="2025-02-03T00:00:00+0000"))
+    payload["pagination"]["total"] += 10
+    return payload
+
+
+def load_eod(payload):
+    return schemas.FastEodResponseLoader().load(payload)
+
+
+@allure.feature("Assertions")
+@allure.story("Golden Snapshots")
+class TestSnapshots:
+    """
+    Contains unit tests of the golden snapshot comparison of API responses (no API calls).
+    """
+
+    @allure.title("Test a recorded snapshot matches the same response, as DTOs and as columns, and a missing one skips")
+    @pytest.mark.regression
+    def test_snapshot_matches(self, eod_payload, tmp_path):
+        SnapshotStore(tmp_path, update=True).assert_match("eod/all", load_eod(eod_payload), EOD_SNAPSHOT)
+        store = SnapshotStore(tmp_path)
+
+        result = store.assert_match("eod/all", load_eod(eod_payload), EOD_SNAPSHOT)
+        assert_that(result.unchanged).is_equal_to(300)
+        columns = schemas.FastEodResponseLoader().load_columns(eod_payload)
+        assert_that(store.assert_match("eod/all", columns, EOD_SNAPSHOT).unchanged).is_equal_to(300)
+
+        timezones = schemas.TimezonesResponseSchema().load(
+            {"pagination": eod_payload["pagination"], "data": SyntheticDataset().timezones})
+        with pytest.raises(pytest.skip.Exception, match="Run pytest with --update-snapshots to record it"):
+            store.assert_match("timezones", timezones, TIMEZONES_SNAPSHOT)
+
+    @allure.title("Test the diff lists the added, removed and changed records by key")
+    @pytest.mark.regression
+    def test_keyed_diff(self, eod_payload, changed_payload):
+        expected = Snapshot.from_json(Snapshot.from_response(load_eod(eod_payload), EOD_SNAPSHOT).to_json(),
+                                      EOD_SNAPSHOT)
+        rows = eod_payload["data"]
+        result = diff_snapshots(expected, Snapshot.from_response(load_eod(changed_payload), EOD_SNAPSHOT))
+
+        # pagination.total is ignored by EOD_SNAPSHOT
+        assert_that(result.added).is_equal_to(["AAPL|2025-02-03T00:00:00+00:00"])
+        assert_that(result.removed).is_equal_to([f"{rows[7]['symbol']}|{rows[7]['date'][:19]}+00:00"])
+        assert_that(result.changed).is_equal_to(
+            {f"{rows[5]['symbol']}|{rows[5]['date'][:19]}+00:00": {"close": (rows[5]["close"], 1.5)}})
+        assert_that(result.unchanged).is_equal_to(298)
+
+        lenient = EOD_SNAPSHOT.with_ignore("data.close", "data.adj_*")
+        result = diff_snapshots(expected, Snapshot.from_response(load_eod(changed_payload), lenient))
+        assert_that(result.changed).is_empty()
+        assert_that(result.unchanged).is_equal_to(299)
+
+        # A per-record rule only ignores the field in the records whose key matches
+        changed_key = f"{rows[5]['symbol']}|{rows[5]['date'][:10]}*"
+        result = diff_snapshots(expected, Snapshot.from_response(load_eod(changed_payload),
+                                                                 EOD_SNAPSHOT.with_ignore(f"data[{changed_key}].close")))
+        assert_that(result.changed).is_empty()
+        changed_payload["data"][6]["close"] = 2.5
+        result = diff_snapshots(expected, Snapshot.from_response(load_eod(changed_payload),
+                                                                 EOD_SNAPSHOT.with_ignore(f"data[{changed_key}].close")))
+        assert_that(result.changed).is_length(1).contains_key(f"{rows[6]['symbol']}|{rows[6]['date'][:19]}+00:00")
+
+    @allure.title("Test a response differing from its snapshot fails with a compact diff")
+    @pytest.mark.negative
+    def test_snapshot_mismatch_fails(self, eod_payload, changed_payload, tmp_path):
+        SnapshotStore(tmp_path, update=True).assert_match("eod", load_eod(eod_payload), EOD_SNAPSHOT)
+        strict = SnapshotSpec(key_fields=EOD_SNAPSHOT.key_fields)
+
+        with pytest.raises(pytest.fail.Exception) as error:
+            SnapshotStore(tmp_path).assert_match("eod", load_eod(changed_payload), strict)
+        lines = str(error.value).splitlines()
+        assert_that(lines[0]).ends_with("1 added, 1 removed, 2 changed, 298 unchanged")
+        assert_that(lines).contains("~ pagination: total 300 -> 310", "+ AAPL|2025-02-03T00:00:00+00:00")
@@ -0,0 +1,93 @@
+import threading
+import time
+import pytest
+import allure
+import requests
+from assertpy import assert_that
+from api_services.client.api_client import APIClient, PoolSettings
+from api_services.client.tail_latency import TailLatencyPolicy, TailLatencySettings
+from api_services.client.timing import TimingRecorder
+from stub_server.server import MarketstackStub, StubSettings
+
+
+@pytest.fixture
+def stub():
+    """Starts a local stub server."""
+    with MarketstackStub(StubSettings(symbols_count=2, days=10)) as stub:
+        yield stub
+
+
+def make_client(stub, **settings):
+    """Builds an APIClient without retries on the stub, with a tail latency policy of the given settings."""
+    return APIClient(stub.base_url, stub.settings.api_version, stub.settings.access_key,
+                     pool_settings=PoolSettings(max_retries=0), timings=TimingRecorder(),
+                     tail_latency=TailLatencyPolicy(TailLatencySettings(**settings)), log_requests=False)
+
+
+@allure.feature("API Client")
+@allure.story("Timeouts and Hedging")
+class TestTailLatency:
+    """
+    Contains unit tests of the adaptive request timeouts and of the hedged requests.
+    """
+
+    @allure.title("Test timeouts and hedge delays adapt to the observed response times")
+    @pytest.mark.regression
+    def test_policy_adapts(self):
+        policy = TailLatencyPolicy(TailLatencySettings(min_samples=10, min_timeout=0.5, hedge_enabled=True,
+                                                       hedge_max_ratio=0.1))
+        assert_that(policy.timeout_for("/eod")).is_equal_to((5.0, 30.0))
+        assert_that(policy.hedge_delay("/eod")).is_none()
+
+        for number in range(100):
+            policy.observe("/eod", 0.1 if number < 95 else 0.4)
+        assert_that(policy.timeout_for("/eod")[1]).is_close_to(1.2, 0.001)
+        assert_that(policy.hedge_delay("/eod")).is_close_to(0.1, 0.02)
+        assert_that(policy.timeout_for("/timezones")).is_equal_to((5.0, 30.0))
+
+        # At most 10% of the requests are hedged
+        fired = [policy.try_fire_hedge() for _ in range(15)]
+        assert_that(fired.count(True)).is_equal_to(10)
+        assert_that(policy.stats()).contains_entry({"hedges_fired": 10}, {"hedges_skipped": 5})
+
+    @allure.title("Test a stalled request times out instead of hanging")
+    @pytest.mark.negative
+    def test_stalled_request_times_out(self, stub):
+        stub.settings.latency_ms = 2000
+        api_client = make_client(stub, default_timeout=0.2)
+
+        started = time.perf_counter()
+        with pytest.raises(requests.ConnectionError, match="Read timed out"):
+            api_client.get("/timezones")
+        api_client.close()
+
+        assert_that(time.perf_counter() - started).is_less_than(1.5)
+        assert_that(api_client.tail_latency.stats()).contains_entry({"timeouts": 1})
+
+    @allure.title("Test a request slower than usual is hedged and the first response is used")
+    @pytest.mark.regression
+    def test_slow_request_is_hedged(self, stub, monkeypatch):
+        api_client = make_client(stub, min_samples=5, hedge_enabled=True, hedge_min_delay_ms=20,
+                                 hedge_max_ratio=1.0)
+        for _ in range(5):
+            api_client.get("/timezones", {"limit": 5})
+        assert_that(api_client.tail_latency.stats()).contains_entry({"hedges_fired": 0})
+
+        # Only the first request sent from now on is slow: its hedge answers first
+        first_call = threading.Event()
+
+        def slow_once():
+            if not first_call.is_set():
+                first_call.set()
+                time.sleep(1)
+
+        monkeypatch.setattr(stub, "simulate_latency", slow_once)
+        started = time.perf_counter()
+        response = api_client.get("/timezones", {"limit": 5})
+        elapsed = time.perf_counter() - started
+        api_client.close()
+
+        assert_that(response.json()["pagination"]["limit"]).is_equal_to(5)
+        assert_that(elapsed).is_less_than(0.8)
+        assert_that(response.timing.total).is_less_than(0.8)
+        assert_that(api_client.tail_latency.stats()).contains_entry({"hedges_fired": 1}, {"hedges_won": 1})
@@ -0,0 +1,100 @@
+from types import SimpleNamespace
+import pytest
+import allure
+from assertpy import assert_that
+from api_services.client.api_client import APIClient
+from api_services.client.request_log import RequestLog
+from api_services.client.response_cache import CacheSettings, ResponseCache
+from stub_server.server import MarketstackStub, StubSettings
+from utils.test_costs import FINGERPRINTS_PROPERTY, REQUESTS_PROPERTY, CostHistory, CostRecorder, plan_bins
+
+
+def history_of(tmp_path, costs: dict) -> CostHistory:
+    """Returns a history with the given (duration, fingerprints) of every test."""
+    history = CostHistory(tmp_path / "history.json")
+    for node_id, (duration, fingerprints) in costs.items():
+        history.update(node_id, duration, len(fingerprints), fingerprints)
+    return history
+
+
+def report(node_id, when, duration, passed=True, user_properties=(), worker="gw0"):
+    """Returns a test report as received by the main process from an xdist worker."""
+    return SimpleNamespace(nodeid=node_id, when=when, duration=duration, passed=passed,
+                           user_properties=list(user_properties), node=SimpleNamespace(gateway=SimpleNamespace(id=worker)))
+
+
+@allure.feature("Test Scheduling")
+@allure.story("Cost-balanced Scheduling")
+class TestTestCosts:
+    """
+    Contains unit tests of the test cost history and of the cost-balanced bins of the pytest-xdist workers.
+    """
+
+    @allure.title("Test the longest tests are assigned first to the least loaded bin")
+    @pytest.mark.regression
+    def test_longest_first_balancing(self, tmp_path):
+        history = history_of(tmp_path, {"a": (4, []), "b": (3, []), "c": (3, []), "d": (2, []), "e": (2, []),
+                                        "f": (2, [])})
+
+        # 'new' has no history: it is assumed to take the median duration (2.5s)
+        plan = plan_bins(["f", "e", "d", "c", "b", "a", "new"], history, bins=2)
+        assert_that(plan.bins).is_equal_to({"a": 0, "b": 1, "c": 1, "new": 0, "f": 1, "e": 0, "d": 1})
+        assert_that(plan.loads).is_equal_to([8.5, 10.0])
+        assert_that(plan.makespan).is_equal_to(10.0)
+
+    @allure.title("Test tests sharing cacheable requests (or an xdist_group) are kept on the same worker")
+    @pytest.mark.regression
+    def test_shared_requests_grouped(self, tmp_path):
+        history = history_of(tmp_path, {
+            "t1": (1, ["/timezones?"]), "t2": (1, ["/eod?symbols=AAPL"]), "t3": (1, ["/timezones?"]),
+            "t4": (1, ["/eod?symbols=MSFT", "/timezones?"]), "t5": (1, ["/eod?symbols=AAPL"]), "t6": (1, []),
+        })
+
+        plan = plan_bins(["t1", "t2", "t3", "t4", "t5", "t6"], history, bins=3)
+        # t1 and t3 share /timezones, t2 and t5 share /eod; t4 would exceed the 2s share of a worker
+        assert_that(plan.bins["t3"]).is_equal_to(plan.bins["t1"])
+        assert_that(plan.bins["t5"]).is_equal_to(plan.bins["t2"])
+        assert_that(plan.bins["t4"]).is_not_equal_to(plan.bins["t1"])
+        assert_that(plan.loads).is_equal_to([2.0, 2.0, 2.0])
+
+        # Tests of the same xdist_group ('@<group>' suffix) share a bin whatever their duration
+        plan = plan_bins(["t1@slow", "t2", "t3", "t4@slow", "t5", "t6@slow"], history, bins=3)
+        assert_that({plan.bins["t1@slow"], plan.bins["t4@slow"], plan.bins["t6@slow"]}).is_length(1)
+        assert_that(plan.loads).is_equal_to([3.0, 2.0, 1.0])
+
+    @allure.title("Test the durations and requests of the passed tests are recorded across runs")
+    @pytest.mark.regression
+    def test_history_recorded(self, tmp_path):
+        path = tmp_path / "costs" / "history.json"
+        for call_duration in (2.0, 4.0):
+            recorder = CostRecorder(CostHistory(path, smoothing=0.5))
+            for item in (report("t1", "setup", 0.5), report("t1", "call", call_duration),
+                         report("t1", "teardown", 0.5, user_properties=[(REQUESTS_PROPERTY, 3),
+                                                                        (FINGERPRINTS_PROPERTY, ["/timezones?"])]),
+                         report("t2", "setup", 0.1, worker="gw1"), report("t2", "call", 9.0, False, worker="gw1"),
+                         report("t2", "teardown", 0.1, worker="gw1")):
+                recorder.add_report(item)
+            assert_that(recorder.save()).is_equal_to(1)
+
+        history = CostHistory(path)
+        # (3s, then 5s) averaged with smoothing 0.5; the failed test is not recorded
+        assert_that(history.get("t1")).has_duration(4.0).has_requests(3).has_fingerprints(["/timezones?"])
+        assert_that(history).is_length(1)
+        assert_that(recorder.summary_lines()).is_equal_to(["Busy time per worker: gw0 5.0s, gw1 9.2s"])
+
+    @allure.title("Test the APIClient logs the requests of the running test, cached ones included")
+    @pytest.mark.regression
+    def test_requests_logged_per_test(self, request):
+        request_log = RequestLog()
+        with MarketstackStub(StubSettings(symbols_count=2, days=5)) as stub:
+            api_client = APIClient(stub.base_url, stub.settings.api_version, stub.settings.access_key,
+                                   cache=ResponseCache(CacheSettings(enabled=True)), request_log=request_log,
+                                   log_requests=False)
+            api_client.get("/timezones")
+            api_client.get("/timezones")
+            api_client.get("/eod", {"symbols": "AAPL"}, stream=True).close()
+            api_client.close()
+
+        # Streamed responses are never cached, so they are counted but not fingerprinted
+        assert_that(request_log.pop(request.node.nodeid)).is_equal_to((3, ["/timezones?"]))
+        assert_that(request_log.pop(request.node.nodeid)).is_equal_to((0, []))
@@ -0,0 +1,104 @@
+import pytest
+import allure
+import requests
+from assertpy import assert_that
+from api_services.client.api_client import APIClient
+from api_services.client.timing import RequestTiming, TimingRecorder, percentile
+from api_services.market import schemas
+from stub_server.server import MarketstackStub, StubSettings
+from utils.base_assertions import BaseAssertions
+
+
+def make_timed_response(total_ms, node_id="tests/test_x.py::test_slow[1]", body=b"{}"):
+    """Builds a response carrying a recorded timing."""
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.timing = RequestTiming("/eod", node_id, "local", 200, 0.0, 0.0, 0.0, total_ms / 2000, 0.0, None,
+                                    total_ms / 1000)
+    return response
+
+
+@allure.feature("API Client")
+@allure.story("Request Timing")
+class TestTiming:
+    """
+    Contains unit tests of the request phase timings and latency percentiles (against a local stub server).
+    """
+
+    @allure.title("Test percentiles interpolate between the closest ranks")
+    @pytest.mark.regression
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+
+        assert_that(percentile(values, 50)).is_close_to(50.5, 1e-9)
+        assert_that(percentile(values, 99)).is_close_to(99.01, 1e-9)
+        assert_that(percentile([7.0], 95)).is_equal_to(7.0)
+        assert_that(percentile([], 50)).is_equal_to(0.0)
+
+    @allure.title("Test every request is split into phases and tagged with the endpoint, test and environment")
+    @pytest.mark.regression
+    def test_records_request_phases(self, request):
+        settings = StubSettings(symbols_count=2, days=10)
+        with MarketstackStub(settings) as stub:
+            timings = TimingRecorder("local")
+            client = APIClient(stub.base_url, settings.api_version, settings.access_key, timings=timings)
+            with allure.step("Send two requests over the same connection and validate the second one"):
+                client.get("/timezones", {"limit": 5})
+                response = client.get("/timezones", {"limit": 10})
+                BaseAssertions.validate_and_deserialize(response.json(), schemas.TimezonesResponseSchema())
+            client.close()
+
+        first, second = timings.records
+        assert_that(response.timing).is_same_as(second)
+        assert_that(first.node_id).is_equal_to(request.node.nodeid)
+        assert_that(first.env).is_equal_to("local")
+        assert_that(first.new_connection).is_true()
+        assert_that(first.connect).is_greater_than(0)
+        # The second request reuses the open connection
+        assert_that(second.new_connection).is_false()
+        assert_that(first.deserialize).is_none()
+        assert_that(second.deserialize).is_greater_than(0)
+        for timing in timings.records:
+            assert_that(timing.ttfb + timing.download).is_less_than_or_equal_to(timing.total)
+
+        report = timings.report()
+        assert_that(report).contains_only("/timezones")
+        assert_that(report["/timezones"]["count"]).is_equal_to(2)
+        assert_that(report["/timezones"]["connect"]["count"]).is_equal_to(1)
+        assert_that(report["/timezones"]["total"]).contains_key("p50", "p95", "p99")
+        assert_that(timings.to_csv().splitlines()).is_length(3)
+        assert_that(client.summary_lines()).contains("Latency GET /timezones (2 requests, env local):")
+
+    @allure.title("Test the latency and payload size SLO assertions")
+    @pytest.mark.regression
+    def test_slo_assertions(self):
+        fast, slow = make_timed_response(100), make_timed_response(900, node_id="tests/test_x.py::test_slow[2]")
+        timings = TimingRecorder("local")
+        timings.records.extend([fast.timing, slow.timing, make_timed_response(50, node_id="tests/other.py").timing])
+
+        BaseAssertions.assert_response_time(fast, 200)
+        BaseAssertions.assert_response_time(slow, 500, phase="ttfb")
+        with pytest.raises(AssertionError, match="total time"):
+            BaseAssertions.assert_response_time(slow, 500)
+        # Untimed (e.g., replayed) responses are not checked, without skipping the test
+        untimed = make_timed_response(900)
+        untimed.timing = None
+        BaseAssertions.assert_response_time(untimed, 500)
+
+        BaseAssertions.assert_latency_percentile(timings, 100, pct=50, node_prefix="tests/other.py")
+        with pytest.raises(AssertionError, match="p95 total time"):
+            BaseAssertions.assert_latency_percentile(timings, 500, node_prefix="tests/test_x.py::test_slow")
+
+        BaseAssertions.assert_payload_size(fast, 2)
+        with pytest.raises(AssertionError, match="payload size"):
+            BaseAssertions.assert_payload_size(make_timed_response(1, body=b"x" * 100), 99)
+
+        with allure.step("Check the Content-Length of an unread streamed response, without reading its body"):
+            streamed = make_timed_response(1, body=b"x" * 100)
+            streamed.headers["Content-Length"] = "40"
+            BaseAssertions.assert_payload_size(streamed, 50, stream=True)
+            with pytest.raises(AssertionError, match="Content-Length header"):
+                BaseAssertions.assert_payload_size(streamed, 30, stream=True)
+            with pytest.raises(AssertionError, match="decoded body"):
+                BaseAssertions.assert_payload_size(streamed, 50)
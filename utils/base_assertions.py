@@ -1,6 +1,8 @@
-from marshmallow import ValidationError
+import pytest
 from assertpy import assert_that
 import allure
+from api_services.client.timing import TimingRecorder, percentile, timed_deserialize
+from utils.eod_data_quality import DEFAULT_EOD_RULES, evaluate_eod_rules, monotonic_dates_rule
 
 
 class BaseAssertions:
@@ -19,12 +21,103 @@ class BaseAssertions:
     def validate_and_deserialize(json_data, schema_instance):
         """
         Validates the JSON data against a Marshmallow schema and returns the deserialized DTO.
+        Any loader with the same load() contract (e.g., FastEodResponseLoader) can be passed instead of a schema.
         Fails the test if validation fails.
+        The duration of load() is recorded as the deserialize phase of the last request timed in this thread.
         """
+        # Imported on first use (the schemas have imported marshmallow by then), to keep the test collection fast
+        from marshmallow import ValidationError
+
         try:
             # load() validates and deserializes in one step
-            deserialized_data = schema_instance.load(json_data)
+            with timed_deserialize():
+                deserialized_data = schema_instance.load(json_data)
             return deserialized_data
         except ValidationError as err:
             # Fail the test with clear message showing the validation errors
             assert False, f"Schema validation failed: {err.messages}"
+
+    @staticmethod
+    @allure.step("Verify response {phase} time is under {max_ms} ms")
+    def assert_response_time(response, max_ms, phase="total"):
+        """
+        Asserts that a phase (total, ttfb, download, ...) of the request took at most max_ms milliseconds,
+        as recorded by the APIClient timings. The check is left out (with a note in the report) if the response
+        was not timed (e.g., replayed), so the rest of the test still runs.
+        """
+        timing = getattr(response, "timing", None)
+        if timing is None:
+            allure.attach("The response was not timed (served from a cache or a cassette, or timing_enabled is false): "
+                          f"the {phase} time SLO ({max_ms} ms) was not checked.", name="Response time",
+                          attachment_type=allure.attachment_type.TEXT)
+            return
+
+        elapsed_ms = (getattr(timing, phase) or 0.0) * 1000
+        allure.attach(f"{phase}: {elapsed_ms:.2f} ms (SLO {max_ms} ms)", name="Response time",
+                      attachment_type=allure.attachment_type.TEXT)
+        assert_that(elapsed_ms).described_as(
+            f"GET {timing.endpoint} {phase} time (ms)").is_less_than_or_equal_to(max_ms)
+
+    @staticmethod
+    @allure.step("Verify p{pct} {phase} time of the {endpoint} requests is under {max_ms} ms")
+    def assert_latency_percentile(timings: TimingRecorder | None, max_ms, pct=95, endpoint=None, node_prefix=None,
+                                  phase="total"):
+        """
+        Asserts that the pct-th percentile of a phase across a group of recorded requests is at most max_ms
+        milliseconds. The group is selected by endpoint and/or node id prefix (see TimingRecorder.select), so
+        it must be asserted after the requests were sent, e.g., in a test following a parametrized test.
+        Skips the test if no request of the group was timed (e.g., its tests ran on another xdist worker).
+        """
+        selected = timings.select(endpoint, node_prefix) if timings is not None else []
+        values = sorted(getattr(timing, phase) for timing in selected if getattr(timing, phase) is not None)
+        if not values:
+            pytest.skip(f"No timed request matches endpoint={endpoint}, node_prefix={node_prefix}.")
+
+        value_ms = percentile(values, pct) * 1000
+        allure.attach(f"p{pct:g} {phase}: {value_ms:.2f} ms over {len(values)} requests (SLO {max_ms} ms)",
+                      name="Latency percentile", attachment_type=allure.attachment_type.TEXT)
+        assert_that(value_ms).described_as(
+            f"p{pct:g} {phase} time (ms) of {len(values)} requests").is_less_than_or_equal_to(max_ms)
+
+    @staticmethod
+    @allure.step("Verify response payload size is under {max_bytes} bytes")
+    def assert_payload_size(response, max_bytes, stream=False):
+        """
+        Asserts that the response body is at most max_bytes bytes.
+
+        :param response: The response.
+        :param max_bytes: The maximum size, in bytes.
+        :param stream: Whether the response was requested with stream=True and its body is left unread: the
+            Content-Length header (wire size) is then checked, without reading the body. Otherwise, the body is
+            measured (decoded, i.e., after any Content-Encoding).
+        """
+        if stream and response.headers.get("Content-Length"):
+            size, measured = int(response.headers["Content-Length"]), "Content-Length header"
+        else:
+            size, measured = len(response.content), "decoded body"
+        allure.attach(f"{size} bytes ({measured}, SLO {max_bytes} bytes)", name="Payload size",
+                      attachment_type=allure.attachment_type.TEXT)
+        assert_that(size).described_as(f"Response payload size (bytes, {measured})").is_less_than_or_equal_to(max_bytes)
+
+    @staticmethod
+    @allure.step("Verify EOD data quality rules over all records")
+    def assert_eod_data_quality(data, rules=DEFAULT_EOD_RULES, sort=None):
+        """
+        Asserts that EOD records satisfy data-quality rules (by default: low <= open/close <= high, volume >= 0,
+        adj_* consistent with split_factor and no duplicate (symbol, date)), evaluated column by column.
+        All the violating rows are reported at once: the failure message lists the first indices per rule, and
+        the full violation table is attached to the report as CSV.
+
+        :param data: EodResponseDTO.data, as a list of EodDataDTO or an EodColumns container.
+        :param rules: The EodRule to evaluate (see utils/eod_data_quality.py).
+        :param sort: The sort filter of the request ('ASC' or 'DESC'), to also check the dates are monotonic.
+        :return: The DataQualityReport.
+        """
+        if sort is not None:
+            rules = (*rules, monotonic_dates_rule(ascending=sort.upper() == "ASC"))
+        report = evaluate_eod_rules(data, rules)
+        if report.failed:
+            allure.attach(report.to_csv(), name="EOD data quality violations", attachment_type=allure.attachment_type.CSV)
+        assert_that(report.summary()).described_as(
+            f"EOD data quality violations over {len(data)} records").is_empty()
+        return report
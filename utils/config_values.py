@@ -0,0 +1,11 @@
+def parse_endpoint_values(raw: str) -> dict:
+    """
+    Parses a config value of the form "/timezones:3600, /eod:300" into a dictionary of floats per endpoint.
+    """
+    values = {}
+    for item in raw.split(','):
+        if not item.strip():
+            continue
+        endpoint, _, value = item.strip().rpartition(':')
+        values[endpoint.strip()] = float(value)
+    return values
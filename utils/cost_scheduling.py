@@ -0,0 +1,37 @@
+"""
+The pytest-xdist scheduler of the cost-balanced test scheduling (see utils/test_costs.py). Kept apart from the
+cost history, which every run records, as importing the pytest-xdist schedulers is only needed with --balance-by-cost.
+"""
+import os
+from xdist.scheduler import LoadScopeScheduling
+from utils.test_costs import CostHistory, SchedulePlan, plan_bins
+
+
+class CostBalancedScheduling(LoadScopeScheduling):
+    """
+    pytest-xdist scheduler sending every worker one bin of the SchedulePlan, computed from the tests collected by
+    the workers (after -k/-m deselection) and the CostHistory.
+    """
+
+    def __init__(self, config, log=None, history: CostHistory | None = None):
+        """
+        Initializes the CostBalancedScheduling.
+
+        :param config: The pytest config.
+        :param log: The xdist log producer.
+        :param history: The recorded costs of the tests (none recorded if omitted).
+        """
+        super().__init__(config, log)
+        self.history = history if history is not None else CostHistory(os.devnull)
+        self.plan: SchedulePlan | None = None
+
+    def schedule(self):
+        if self.plan is None and self.registered_collections:
+            # The workers collected the same tests (checked by LoadScopeScheduling.schedule)
+            node_ids = next(iter(self.registered_collections.values()))
+            self.plan = plan_bins(node_ids, self.history, len(self.nodes))
+        super().schedule()
+
+    def _split_scope(self, nodeid: str) -> str:
+        """Returns the work unit of a test: its bin."""
+        return f"cost-bin-{self.plan.bins[nodeid]}"
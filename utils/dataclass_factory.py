@@ -1,6 +1,24 @@
+from dataclasses import fields, make_dataclass
+
+
 def as_dict_remove_none(data):
     """
     A custom dict_factory for dataclasses.asdict that removes items where the value is None.
     Useful for creating clean API query parameters.
     """
     return dict((key, value) for key, value in data if value is not None)
+
+
+def frozen_variant(dto_class, name=None):
+    """
+    Creates a frozen (immutable and hashable), slot-based copy of a DTO dataclass, with the same fields.
+    Useful for records kept in sets/dict keys, or shared between threads.
+    """
+    frozen_class = make_dataclass(
+        name or f"Frozen{dto_class.__name__}",
+        [(field.name, field.type) for field in fields(dto_class)],
+        frozen=True,
+        slots=True,
+    )
+    frozen_class.__module__ = dto_class.__module__
+    return frozen_class
@@ -0,0 +1,231 @@
+"""
+Data-quality rules over EOD records, evaluated column by column rather than record by record.
+
+A rule reads whole columns (typed arrays for EodColumns, built once per column for a list of EodDataDTO) and
+combines them with map()/compress() over the operator functions, so the per-row work runs in C. It returns the
+indices of all the violating rows, not only the first one.
+"""
+import csv
+import io
+import math
+import operator
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import partial, reduce
+from itertools import compress, count, islice, repeat
+from typing import Callable
+
+
+class EodColumnSource:
+    """
+    Column access over EOD records given as EodColumns or as a sequence of EodDataDTO (e.g., EodResponseDTO.data).
+    Float columns hold NaN for None, 'date' holds epoch seconds; every column is built at most once.
+    """
+
+    def __init__(self, data):
+        """
+        Initializes the column source.
+
+        :param data: An EodColumns container or a sequence of EodDataDTO records.
+        """
+        self.data = data
+        self._columns = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    def column(self, name):
+        """Returns the values of a column, in row order."""
+        values = self._columns.get(name)
+        if values is None:
+            values = self._columns[name] = self._build(name)
+        return values
+
+    def _build(self, name):
+        # EodColumns already stores the columns (strings as codes, which compare and hash like the strings)
+        if hasattr(self.data, "column"):
+            return self.data.column(name)
+        values = map(operator.attrgetter(name), self.data)
+        if name == "date":
+            return array('d', map(datetime.timestamp, values))
+        if name in ("symbol", "exchange", "name", "exchange_code", "asset_type", "price_currency"):
+            return list(values)
+        return array('d', (math.nan if value is None else value for value in values))
+
+
+@dataclass(frozen=True)
+class EodRule:
+    """
+    A data-quality rule: check(source) returns the indices of the rows violating it.
+    columns are the fields shown for the violating rows in the violation table.
+    """
+    name: str
+    columns: tuple[str, ...]
+    check: Callable[[EodColumnSource], list[int]]
+
+
+def _any_of(*flags):
+    """Combines boolean columns with a row-wise 'or'."""
+    return reduce(partial(map, operator.or_), flags)
+
+
+def _not_close(left, right, rel_tol):
+    """Returns a boolean column, True where left and right differ by more than rel_tol."""
+    return map(operator.not_, map(partial(math.isclose, rel_tol=rel_tol), left, right))
+
+
+def _is_set(values):
+    """Returns a boolean column, True where a float column holds a value (NaN stands for None)."""
+    return map(operator.eq, values, values)
+
+
+def _violations(flags, start=0) -> list[int]:
+    """Returns the indices of the rows flagged True."""
+    return list(compress(count(start), flags))
+
+
+def _price_range(source) -> list[int]:
+    low, open_, close, high = (source.column(name) for name in ("low", "open", "close", "high"))
+    return _violations(_any_of(map(operator.gt, low, open_), map(operator.gt, open_, high),
+                               map(operator.gt, low, close), map(operator.gt, close, high),
+                               map(operator.gt, low, high)))
+
+
+def _non_negative_volume(source) -> list[int]:
+    # A None adj_volume (NaN) compares False, so it is not a violation
+    return _violations(_any_of(map(operator.lt, source.column("volume"), repeat(0.0)),
+                               map(operator.lt, source.column("adj_volume"), repeat(0.0))))
+
+
+def adjusted_prices_rule(rel_tol: float = 0.01) -> EodRule:
+    """
+    Returns the rule checking the adj_* prices against split_factor:
+    - within a row, adj_open/open, adj_high/high, adj_low/low and adj_close/close are the same adjustment factor,
+    - between two consecutive trading days of a symbol, the factor changes by the split_factor of the later day
+      (1.0 when there was no split).
+
+    :param rel_tol: Relative tolerance of the comparisons (rounded prices and dividend adjustments stay within 1%).
+    """
+    def check(source) -> list[int]:
+        close, adj_close = source.column("close"), source.column("adj_close")
+        # a/b == c/d is compared as a*d == c*b, to avoid dividing by zero prices
+        flags = [_not_close(map(operator.mul, source.column(f"adj_{name}"), close),
+                            map(operator.mul, adj_close, source.column(name)), rel_tol)
+                 for name in ("open", "high", "low")]
+        flags[1] = map(operator.and_, flags[1], _is_set(source.column("adj_high")))
+        flags[2] = map(operator.and_, flags[2], _is_set(source.column("adj_low")))
+        violations = set(_violations(_any_of(*flags)))
+
+        if len(source) > 1:
+            keys = list(zip(source.column("symbol"), source.column("date")))
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            ordered = operator.itemgetter(*order)
+            symbols, closes, adj_closes = ordered(source.column("symbol")), ordered(close), ordered(adj_close)
+            splits = ordered(source.column("split_factor"))
+            # Day q after day p: adj_close[p] / close[p] * split_factor[q] == adj_close[q] / close[q]
+            previous = map(operator.mul, map(operator.mul, adj_closes, islice(closes, 1, None)),
+                           islice(splits, 1, None))
+            later = map(operator.mul, islice(adj_closes, 1, None), closes)
+            flags = map(operator.and_, map(operator.eq, symbols, islice(symbols, 1, None)),
+                        _not_close(previous, later, rel_tol))
+            violations.update(order[position] for position in _violations(flags, start=1))
+        return sorted(violations)
+
+    return EodRule("adj_* consistent with split_factor",
+                   ("split_factor", "open", "adj_open", "close", "adj_close"), check)
+
+
+def _unique_symbol_date(source) -> list[int]:
+    keys = list(zip(source.column("symbol"), source.column("date")))
+    if len(set(keys)) == len(keys):
+        return []
+    seen = set()
+    duplicates = []
+    for position, key in enumerate(keys):
+        if key in seen:
+            duplicates.append(position)
+        seen.add(key)
+    return duplicates
+
+
+def monotonic_dates_rule(ascending: bool = True) -> EodRule:
+    """
+    Returns the rule checking the rows are sorted by date (as requested with sort=ASC or sort=DESC).
+    A row is a violation when its date goes backwards compared to the previous row.
+
+    :param ascending: True for sort=ASC (oldest first), False for sort=DESC (newest first).
+    """
+    def check(source) -> list[int]:
+        dates = source.column("date")
+        comparison = operator.lt if ascending else operator.gt
+        return _violations(map(comparison, islice(dates, 1, None), dates), start=1)
+
+    return EodRule(f"date {'non-decreasing (sort=ASC)' if ascending else 'non-increasing (sort=DESC)'}", (), check)
+
+
+PRICE_RANGE_RULE = EodRule("low <= open/close <= high", ("low", "open", "close", "high"), _price_range)
+NON_NEGATIVE_VOLUME_RULE = EodRule("volume >= 0", ("volume", "adj_volume"), _non_negative_volume)
+UNIQUE_SYMBOL_DATE_RULE = EodRule("no duplicate (symbol, date)", (), _unique_symbol_date)
+DEFAULT_EOD_RULES = (PRICE_RANGE_RULE, NON_NEGATIVE_VOLUME_RULE, adjusted_prices_rule(), UNIQUE_SYMBOL_DATE_RULE)
+
+
+@dataclass
+class DataQualityReport:
+    """
+    A data class to hold the result of the data-quality rules: the indices of the violating rows per rule.
+    """
+    data: object
+    rules: tuple[EodRule, ...]
+    violations: dict[str, list[int]] = field(default_factory=dict)
+
+    @property
+    def failed(self) -> bool:
+        return any(self.violations.values())
+
+    def summary(self, max_indices: int = 10) -> dict[str, str]:
+        """Returns, per violated rule, the number of violating rows and the first indices."""
+        summary = {}
+        for name, indices in self.violations.items():
+            if indices:
+                more = ", ..." if len(indices) > max_indices else ""
+                summary[name] = f"{len(indices)} rows: {indices[:max_indices]}{more}"
+        return summary
+
+    def to_csv(self, max_rows: int = 1000) -> str:
+        """
+        Returns the violations as a CSV table: one line per violating row and rule, with the symbol, the date and
+        the fields checked by the rule. At most max_rows lines are written.
+        """
+        output = io.StringIO()
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(["rule", "row", "symbol", "date", "values"])
+        written = 0
+        for rule in self.rules:
+            for index in self.violations.get(rule.name, []):
+                if written == max_rows:
+                    total = sum(len(indices) for indices in self.violations.values())
+                    writer.writerow([f"... {total - written} more", "", "", "", ""])
+                    return output.getvalue()
+                record = self.data[index]
+                values = " ".join(f"{name}={getattr(record, name)}" for name in rule.columns)
+                date = record.date.astimezone(timezone.utc).date().isoformat()
+                writer.writerow([rule.name, index, record.symbol, date, values])
+                written += 1
+        return output.getvalue()
+
+
+def evaluate_eod_rules(data, rules=DEFAULT_EOD_RULES) -> DataQualityReport:
+    """
+    Evaluates data-quality rules over EOD records.
+
+    :param data: An EodColumns container or a sequence of EodDataDTO records (e.g., EodResponseDTO.data).
+    :param rules: The EodRule to evaluate.
+    :return: A DataQualityReport with the indices of the violating rows of every rule.
+    """
+    source = EodColumnSource(data)
+    report = DataQualityReport(data, tuple(rules))
+    if len(source):
+        for rule in rules:
+            report.violations[rule.name] = rule.check(source)
+    return report
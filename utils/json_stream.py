@@ -0,0 +1,178 @@
+import codecs
+import json
+import re
+
+# Events yielded by iter_json_object
+MEMBER, ITEM = "member", "item"
+WHITESPACE = " \t\n\r"
+# Next character changing the nesting of a value, outside and inside a string, and the end of a number or literal
+STRUCTURE = re.compile(r'[\[\]{}"]')
+STRING_SPECIAL = re.compile(r'["\\]')
+SCALAR_END = re.compile(r'[\s,\]}]')
+
+
+class JsonObjectStream:
+    """
+    Incremental parser of a JSON object read from a stream of byte chunks.
+
+    The members of the top-level object are yielded as (MEMBER, key, value) events, except for the arrays listed
+    in `stream_keys`, whose elements are yielded one by one as (ITEM, key, element) events as soon as they are
+    complete. Only the current, not yet parsed part of the stream is buffered. The stream must hold nothing but
+    whitespace after the top-level object.
+    """
+
+    # Consumed text is dropped from the buffer once it exceeds this size
+    COMPACT_AFTER = 1 << 16
+
+    def __init__(self, chunks, stream_keys=(), encoding="utf-8"):
+        """
+        Initializes the JsonObjectStream.
+
+        :param chunks: An iterable of bytes chunks (e.g., response.iter_content(chunk_size)).
+        :param stream_keys: Keys of the top-level arrays whose elements are streamed.
+        :param encoding: Encoding of the bytes.
+        """
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._json_decoder = json.JSONDecoder()
+        self._stream_keys = frozenset(stream_keys)
+        self._buffer = ""
+        self._position = 0
+        self._eof = False
+
+    def __iter__(self):
+        self._expect("{")
+        if self._peek() == "}":
+            self._position += 1
+            self._expect_end()
+            return
+
+        while True:
+            key = self._decode_value()
+            self._expect(":")
+            if key in self._stream_keys and self._peek() == "[":
+                self._position += 1
+                yield from self._iter_array(key)
+            else:
+                yield MEMBER, key, self._decode_value()
+
+            if self._expect(",}") == "}":
+                self._expect_end()
+                return
+
+    def _iter_array(self, key):
+        """Yields the elements of the array whose '[' was just consumed."""
+        if self._peek() == "]":
+            self._position += 1
+            return
+        while True:
+            yield ITEM, key, self._decode_value()
+            if self._expect(",]") == "]":
+                return
+
+    def _fill(self) -> bool:
+        """Reads the next chunk into the buffer. Returns False at the end of the stream."""
+        if self._eof:
+            return False
+        if self._position > self.COMPACT_AFTER:
+            self._buffer = self._buffer[self._position:]
+            self._position = 0
+
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._eof = True
+        return False
+
+    def _peek(self) -> str:
+        """Skips whitespace and returns the next character (without consuming it), or '' at the end."""
+        while True:
+            while self._position < len(self._buffer) and self._buffer[self._position] in WHITESPACE:
+                self._position += 1
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if not self._fill():
+                return ""
+
+    def _expect(self, allowed: str) -> str:
+        """Consumes the next character, which must be one of `allowed`."""
+        char = self._peek()
+        if not char or char not in allowed:
+            found = repr(char) if char else "end of stream"
+            raise json.JSONDecodeError(f"Expecting one of {allowed!r}, found {found}", self._buffer, self._position)
+        self._position += 1
+        return char
+
+    def _expect_end(self):
+        """Checks that only whitespace follows the top-level object (reading the rest of the stream)."""
+        if self._peek():
+            raise json.JSONDecodeError("Extra data after the top-level object", self._buffer, self._position)
+
+    def _decode_value(self):
+        """Decodes the next complete JSON value, reading more chunks until it is complete."""
+        self._peek()
+        try:
+            value, end = self._json_decoder.raw_decode(self._buffer, self._position)
+            # A number or literal is only complete once followed by a delimiter (e.g., '1.' continues as '1.5')
+            if self._eof or self._buffer[self._position] in '[{"' or SCALAR_END.match(self._buffer, end):
+                self._position = end
+                return value
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+        # Incomplete: read chunks until its end is found, then decode it once more (not again after every chunk)
+        self._scan_value()
+        value, self._position = self._json_decoder.raw_decode(self._buffer, self._position)
+        return value
+
+    def _scan_value(self):
+        """
+        Reads chunks until the value at the current position is complete in the buffer (or the stream ends).
+        The value is scanned for its end with the nesting of its brackets and strings, resuming after every chunk
+        where the previous scan stopped, so the cost is linear in the size of the value.
+        """
+        # Offset of the scan from the value start, which stays valid when the buffer is compacted
+        scanned, depth, in_string = 0, 0, False
+        scalar = self._position < len(self._buffer) and self._buffer[self._position] not in '[{"'
+        while True:
+            buffer = self._buffer
+            position = self._position + scanned
+            if scalar:
+                # A number or literal ends at the next delimiter: at the end of the buffer, it may continue
+                if SCALAR_END.search(buffer, position):
+                    return
+                position = len(buffer)
+            else:
+                while match := (STRING_SPECIAL if in_string else STRUCTURE).search(buffer, position):
+                    char, position = match.group(), match.end()
+                    if in_string:
+                        if char == "\\":
+                            if position == len(buffer):
+                                # The escaped character is in the next chunk: rescan from the backslash
+                                position -= 1
+                                break
+                            position += 1
+                        else:
+                            in_string = False
+                    elif char == '"':
+                        in_string = True
+                    else:
+                        depth += 1 if char in "[{" else -1
+                    if depth <= 0 and not in_string:
+                        return
+                else:
+                    position = len(buffer)
+            scanned = position - self._position
+            if not self._fill():
+                return
+
+
+def iter_json_object(chunks, stream_keys=(), encoding="utf-8"):
+    """
+    Parses a JSON object from a stream of byte chunks, yielding (MEMBER, key, value) and (ITEM, key, element) events.
+    See JsonObjectStream.
+    """
+    return iter(JsonObjectStream(chunks, stream_keys, encoding))
@@ -0,0 +1,18 @@
+import os
+import uuid
+
+# Identifier of this run when it is not started by pytest-xdist
+_PROCESS_RUN_ID = uuid.uuid4().hex
+
+
+def run_id() -> str:
+    """
+    Returns an identifier of the current test run, shared by all the pytest-xdist workers of the run
+    (PYTEST_XDIST_TESTRUNUID), or unique to this process otherwise.
+    """
+    return os.environ.get("PYTEST_XDIST_TESTRUNUID") or _PROCESS_RUN_ID
+
+
+def is_xdist_worker() -> bool:
+    """Returns whether this process is a pytest-xdist worker."""
+    return "PYTEST_XDIST_WORKER" in os.environ
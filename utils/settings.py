@@ -0,0 +1,190 @@
+import configparser
+import json
+import os
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from pathlib import Path
+from enums.environment import Env
+
+# Environment variable through which the resolved settings are handed to the pytest-xdist workers of a run
+SETTINGS_ENV_VAR = "MARKETSTACK_SETTINGS"
+
+
+class SettingsError(Exception):
+    """Raised when the .env, config.ini or secrets.ini files are missing or invalid."""
+
+
+class ConfigSection(Mapping):
+    """
+    Immutable section of an ini file, with the typed getters of configparser's SectionProxy
+    (get/getint/getfloat/getboolean with a fallback), so it can be passed to the from_config() of the settings.
+    """
+
+    def __init__(self, values: Mapping):
+        self._values = dict(values)
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return f"ConfigSection({self._values!r})"
+
+    def get(self, key, fallback=None):
+        """Returns the raw value of the key, or the fallback if it is missing."""
+        return self._values.get(key, fallback)
+
+    def getint(self, key, fallback=None):
+        """Returns the value of the key as an int, or the fallback if it is missing."""
+        return self._convert(key, int, fallback)
+
+    def getfloat(self, key, fallback=None):
+        """Returns the value of the key as a float, or the fallback if it is missing."""
+        return self._convert(key, float, fallback)
+
+    def getboolean(self, key, fallback=None):
+        """Returns the value of the key as a bool (1/yes/true/on or 0/no/false/off), or the fallback if it is missing."""
+        return self._convert(key, self._to_boolean, fallback)
+
+    def _convert(self, key, converter, fallback):
+        if key not in self._values:
+            return fallback
+        return converter(self._values[key])
+
+    @staticmethod
+    def _to_boolean(value):
+        if value.lower() not in configparser.ConfigParser.BOOLEAN_STATES:
+            raise ValueError(f"Not a boolean: {value}")
+        return configparser.ConfigParser.BOOLEAN_STATES[value.lower()]
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    The resolved settings of a test run: the environment from .env and its section of config.ini.
+    The access_key from secrets.ini is only read (and validated) when first used, since local and replayed runs
+    do not need it.
+
+    Use get_settings() to get the instance of the process: the files are parsed once per run, and the
+    pytest-xdist workers reuse what the main process resolved instead of parsing them again.
+    """
+
+    project_root: Path
+    env: Env
+    config: ConfigSection
+
+    @classmethod
+    def load(cls, project_root: Path):
+        """
+        Reads the settings from the .env and config.ini files of the project.
+
+        :param project_root: The directory holding the .env, config.ini and secrets.ini files.
+        :raises SettingsError: If the .env file or its ENV variable is missing or invalid.
+        """
+        from dotenv import load_dotenv
+
+        env_path = project_root / ".env"
+        if not env_path.exists():
+            raise SettingsError(f"The .env file is missing at: {env_path}. Please create it and set the ENV variable.")
+
+        load_dotenv(dotenv_path=env_path)
+        env_value = os.getenv("ENV")
+
+        if not env_value:
+            raise SettingsError("The ENV variable is not set in the .env file.")
+
+        try:
+            env = Env(env_value)
+        except ValueError:
+            valid_envs = [e.value for e in Env]
+            raise SettingsError(f"Invalid ENV value '{env_value}' in .env file. Must be one of: {valid_envs}")
+
+        config = configparser.ConfigParser()
+        config.read(project_root / 'config.ini')
+        section = config[env.value] if env.value in config else {}
+        return cls(project_root, env, ConfigSection(section))
+
+    def to_json(self) -> str:
+        """Serializes the settings (without the secrets) for the worker processes."""
+        return json.dumps({"project_root": str(self.project_root), "env": self.env.value,
+                           "config": dict(self.config)})
+
+    @classmethod
+    def from_json(cls, data: str):
+        """Rebuilds the settings serialized by to_json()."""
+        values = json.loads(data)
+        return cls(Path(values["project_root"]), Env(values["env"]), ConfigSection(values["config"]))
+
+    @cached_property
+    def access_key(self) -> str:
+        """
+        The access_key of the environment from secrets.ini.
+
+        :raises SettingsError: If secrets.ini, its section or its access_key is missing, empty or still the placeholder.
+        """
+        secrets = configparser.ConfigParser()
+        secrets_path = self.project_root / 'secrets.ini'
+        read_files = secrets.read(secrets_path)
+
+        if not read_files:
+            raise SettingsError(
+                f"Could not find or read secrets.ini at: {secrets_path}.\n"
+                f"Please create it or copy from secrets.ini.example file and set variables (i.e. API_ACCESS_KEY).")
+        env_name = self.env.value
+        if env_name not in secrets:
+            raise SettingsError(
+                f"\n\n[VALIDATION ERROR]\nThe section [{env_name}] is MISSING from your secrets.ini file."
+                f"\nPlease add this section.\n"
+            )
+
+        env_object = secrets[env_name]
+        # Check if the key is missing entirely
+        if 'access_key' not in env_object:
+            raise SettingsError(
+                f"\n\n[VALIDATION ERROR]"
+                f"\nThe 'access_key' property is MISSING from the [{env_name}] section in your secrets.ini file."
+                f"\nPlease add it: `access_key = YOUR_KEY`\n")
+        access_key_val = env_object['access_key']
+
+        # Check if the value is empty
+        if not access_key_val:
+            raise SettingsError(
+                f"\n\n[VALIDATION ERROR] The 'access_key' property in the [{env_name}] section of secrets.ini is EMPTY."
+                f"\nPlease provide your API key.\n")
+
+        # Check if it's still the placeholder value from your example
+        if access_key_val == 'API_ACCESS_KEY':
+            raise SettingsError(
+                f"\n\n[VALIDATION ERROR] The 'access_key' in the [{env_name}] section of secrets.ini "
+                f"is still set to the placeholder 'API_ACCESS_KEY'.\nPlease replace it with your real API key.\n")
+
+        return access_key_val
+
+
+@lru_cache(maxsize=None)
+def get_settings(project_root: Path) -> Settings:
+    """
+    Returns the settings of the run, resolved once per process.
+    In a pytest-xdist worker (or any process started after export_settings()), they are rebuilt from the
+    SETTINGS_ENV_VAR environment variable instead of reading the .env and config.ini files again.
+
+    :param project_root: The directory holding the .env, config.ini and secrets.ini files.
+    :raises SettingsError: If the files are missing or invalid.
+    """
+    exported = os.environ.get(SETTINGS_ENV_VAR)
+    if exported:
+        settings = Settings.from_json(exported)
+        if settings.project_root == Path(project_root):
+            return settings
+    return Settings.load(Path(project_root))
+
+
+def export_settings(settings: Settings):
+    """Hands the settings down to the processes started from now on (e.g., the pytest-xdist workers)."""
+    os.environ[SETTINGS_ENV_VAR] = settings.to_json()
@@ -0,0 +1,287 @@
+"""
+Golden snapshots of deserialized API responses, compared record by record through per-record hashes.
+
+A snapshot holds the records of a response (normalized by the schemas, e.g., dates as ISO strings and prices as
+floats), keyed by their identity fields (e.g., symbol and date), with a hash of the fields that are not ignored.
+Comparing a response with its snapshot hashes each record once: records with the same key and hash are unchanged
+and skipped, so only the added, removed and changed records are compared field by field.
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field, fields, is_dataclass
+from datetime import datetime
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from operator import attrgetter
+from pathlib import Path
+import allure
+import pytest
+
+
+@dataclass(frozen=True)
+class SnapshotSpec:
+    """
+    A data class to hold how the records of an endpoint are identified and which fields are ignored.
+
+    Ignore rules are glob patterns on the field paths: 'pagination.<field>' for the pagination, 'data.<field>' for
+    the fields of every record (e.g., 'pagination.total', 'data.adj_*'), and 'data[<key>].<field>' for the fields of
+    the records whose key matches (e.g., 'data[*|2025-01-31*].close' for the closing prices of the latest day).
+    """
+    key_fields: tuple[str, ...]
+    ignore: tuple[str, ...] = ()
+
+    def ignores(self, path: str) -> bool:
+        """Returns whether a field path matches one of the ignore rules (other than the per-record ones)."""
+        return any(fnmatchcase(path, pattern) for pattern in _split_rules(self.ignore)[0])
+
+    def record_rules(self) -> tuple[tuple[str, str], ...]:
+        """Returns the per-record ignore rules, as (key pattern, field pattern) pairs."""
+        return _split_rules(self.ignore)[1]
+
+    def with_ignore(self, *patterns) -> "SnapshotSpec":
+        """Returns a copy of the spec ignoring more field paths."""
+        return SnapshotSpec(self.key_fields, self.ignore + tuple(patterns))
+
+
+@lru_cache(maxsize=64)
+def _split_rules(ignore: tuple[str, ...]) -> tuple[tuple[str, ...], tuple[tuple[str, str], ...]]:
+    """Returns the field path patterns and the per-record (key pattern, field pattern) rules of the ignore rules."""
+    patterns, record_rules = [], []
+    for pattern in ignore:
+        if pattern.startswith("data[") and "]." in pattern:
+            record_rules.append(tuple(pattern[len("data["):].rsplit("].", 1)))
+        else:
+            patterns.append(pattern)
+    return tuple(patterns), tuple(record_rules)
+
+
+# The pagination totals grow with the history, so they are ignored by default
+EOD_SNAPSHOT = SnapshotSpec(key_fields=("symbol", "date"), ignore=("pagination.total",))
+TIMEZONES_SNAPSHOT = SnapshotSpec(key_fields=("timezone",), ignore=("pagination.total",))
+
+
+@lru_cache(maxsize=16)
+def _field_reader(dto_class):
+    """
+    Returns the field names of a DTO class, a function returning the values of these fields as a tuple, and the
+    names of its datetime fields.
+    """
+    names = tuple(item.name for item in fields(dto_class))
+    return names, attrgetter(*names), tuple(item.name for item in fields(dto_class) if item.type is datetime)
+
+
+def _record_values(record) -> dict:
+    """
+    Returns the fields of a DTO (or of an EodColumns row) as a dictionary of JSON-compatible values: the schemas
+    already coerced the types (e.g., volumes to float), only the dates are turned into ISO strings.
+    """
+    if not is_dataclass(record):
+        record = record.to_dto()
+    names, read, datetime_names = _field_reader(type(record))
+    values = dict(zip(names, read(record)))
+    for name in datetime_names:
+        values[name] = values[name].isoformat()
+    return values
+
+
+@lru_cache(maxsize=64)
+def _compared_fields(spec: SnapshotSpec, prefix: str, names: tuple[str, ...]) -> tuple[str, ...]:
+    """
+    Returns the field names not ignored by the spec, sorted (as in the snapshot files) so that the hash of a record
+    does not depend on the order of its fields. The records of a response all have the same fields.
+    """
+    return tuple(sorted(name for name in names if not spec.ignores(f"{prefix}.{name}")))
+
+
+def _hash(values) -> str:
+    return hashlib.blake2b(repr(values).encode(), digest_size=12).hexdigest()
+
+
+@dataclass
+class Snapshot:
+    """
+    A data class to hold the normalized pagination and records of a response, with the hash of every record.
+    """
+    spec: SnapshotSpec
+    pagination: dict
+    records: dict[str, dict]
+    hashes: dict[str, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not self.hashes:
+            self.hashes = {key: self.hash_record(key, record) for key, record in self.records.items()}
+
+    def compared_fields(self, key: str, record: dict) -> tuple[str, ...]:
+        """Returns the fields of a record that are not ignored."""
+        compared = _compared_fields(self.spec, "data", tuple(record))
+        rules = [field_pattern for key_pattern, field_pattern in self.spec.record_rules()
+                 if fnmatchcase(key, key_pattern)]
+        if rules:
+            compared = tuple(name for name in compared if not any(fnmatchcase(name, rule) for rule in rules))
+        return compared
+
+    def hash_record(self, key: str, record: dict) -> str:
+        """Returns the hash of the fields of a record that are not ignored."""
+        return _hash(tuple(map(record.__getitem__, self.compared_fields(key, record))))
+
+    @classmethod
+    def from_response(cls, response_dto, spec: SnapshotSpec) -> "Snapshot":
+        """
+        Builds the snapshot of a deserialized response (e.g., the EodResponseDTO returned by validate_and_deserialize).
+
+        :param response_dto: A response DTO with 'pagination' and 'data' (list of DTOs, or EodColumns).
+        :param spec: How the records are identified and which fields are ignored.
+        """
+        records = {}
+        for record in response_dto.data:
+            values = _record_values(record)
+            key = "|".join(str(values[name]) for name in spec.key_fields)
+            if key in records:
+                # Duplicate records keep their own entry, so they show up in the diff
+                key = f"{key}#{sum(1 for existing in records if existing.startswith(f'{key}#')) + 2}"
+            records[key] = values
+        return cls(spec, _record_values(response_dto.pagination), records)
+
+    def to_json(self) -> str:
+        return json.dumps({"key_fields": list(self.spec.key_fields), "ignore": list(self.spec.ignore),
+                           "pagination": self.pagination, "records": self.records, "hashes": self.hashes},
+                          indent=1, sort_keys=True)
+
+    @classmethod
+    def from_json(cls, text: str, spec: SnapshotSpec) -> "Snapshot":
+        """
+        Reads a snapshot written by to_json(). The stored hashes are reused when they were computed with the same
+        ignore rules as the spec, and computed again otherwise.
+        """
+        content = json.loads(text)
+        same_rules = content["ignore"] == list(spec.ignore) and content["key_fields"] == list(spec.key_fields)
+        return cls(spec, content["pagination"], content["records"], content["hashes"] if same_rules else {})
+
+
+@dataclass
+class SnapshotDiff:
+    """
+    A data class to hold the differences between a snapshot (expected) and a response (actual): the keys of the
+    added and removed records and, per changed record, the (expected, actual) values of its changed fields.
+    """
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: dict[str, dict] = field(default_factory=dict)
+    unchanged: int = 0
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed, "
+                f"{self.unchanged} unchanged")
+
+    def lines(self, max_lines: int | None = None) -> list[str]:
+        """Returns the diff as '+ key', '- key' and '~ key: field expected -> actual' lines."""
+        lines = [f"+ {key}" for key in self.added] + [f"- {key}" for key in self.removed]
+        for key, changes in self.changed.items():
+            lines.append(f"~ {key}: " + ", ".join(f"{name} {expected!r} -> {actual!r}"
+                                                  for name, (expected, actual) in changes.items()))
+        if max_lines is not None and len(lines) > max_lines:
+            lines = lines[:max_lines] + [f"... {len(lines) - max_lines} more"]
+        return lines
+
+
+def _changed_fields(expected: dict, actual: dict, compared) -> dict:
+    return {name: (expected.get(name), actual.get(name)) for name in compared
+            if expected.get(name) != actual.get(name)}
+
+
+def diff_snapshots(expected: Snapshot, actual: Snapshot) -> SnapshotDiff:
+    """
+    Compares a response snapshot with the golden one: records whose key and hash match are skipped, the others
+    are reported as added, removed or changed (with their changed fields). The pagination is compared field by
+    field, under the key 'pagination'.
+    """
+    if expected.spec != actual.spec:
+        expected = Snapshot(actual.spec, expected.pagination, expected.records)
+    result = SnapshotDiff()
+    expected_hashes, actual_hashes = expected.hashes, actual.hashes
+    for key, actual_hash in actual_hashes.items():
+        expected_hash = expected_hashes.get(key)
+        if expected_hash is None:
+            result.added.append(key)
+        elif expected_hash == actual_hash:
+            result.unchanged += 1
+        else:
+            record = actual.records[key]
+            result.changed[key] = _changed_fields(expected.records[key], record, actual.compared_fields(key, record))
+    result.removed = [key for key in expected_hashes if key not in actual_hashes]
+
+    compared = _compared_fields(actual.spec, "pagination", tuple({**expected.pagination, **actual.pagination}))
+    pagination_changes = _changed_fields(expected.pagination, actual.pagination, compared)
+    if pagination_changes:
+        result.changed = {"pagination": pagination_changes, **result.changed}
+    return result
+
+
+class SnapshotStore:
+    """
+    Directory of golden snapshots (one JSON file per snapshot name), used by the 'snapshots' fixture.
+    With update=True (pytest --update-snapshots), assert_match() writes the snapshots instead of comparing them.
+    """
+
+    def __init__(self, path, update: bool = False):
+        """
+        Initializes the SnapshotStore.
+
+        :param path: Directory of the snapshot files.
+        :param update: Whether to (re)write the snapshots instead of comparing the responses with them.
+        """
+        self.path = Path(path)
+        self.update = update
+
+    def snapshot_path(self, name) -> Path:
+        return self.path / f"{name}.json"
+
+    def write(self, name, snapshot: Snapshot):
+        """Writes a snapshot (atomically, so concurrent pytest-xdist workers never read a partial file)."""
+        path = self.snapshot_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(snapshot.to_json())
+        os.replace(tmp_path, path)
+
+    def read(self, name, spec: SnapshotSpec) -> Snapshot | None:
+        """Returns the stored snapshot, or None if there is none."""
+        path = self.snapshot_path(name)
+        return Snapshot.from_json(path.read_text(), spec) if path.exists() else None
+
+    @allure.step("Compare the response with the snapshot '{name}'")
+    def assert_match(self, name, response_dto, spec: SnapshotSpec, max_lines: int = 30) -> SnapshotDiff:
+        """
+        Asserts that a deserialized response matches its golden snapshot, ignoring the fields of the spec's
+        ignore rules. The full diff is attached to the report; the failure message shows its first lines. The test is
+        skipped if the snapshot was not recorded yet.
+
+        :param name: The name of the snapshot (its file name, without extension; may contain '/').
+        :param response_dto: The deserialized response (e.g., EodResponseDTO).
+        :param spec: How the records are identified and which fields are ignored (e.g., EOD_SNAPSHOT).
+        :param max_lines: Maximum number of diff lines in the failure message.
+        :return: The SnapshotDiff (empty when the snapshot was written).
+        """
+        actual = Snapshot.from_response(response_dto, spec)
+        if self.update:
+            self.write(name, actual)
+            return SnapshotDiff(unchanged=len(actual.records))
+
+        expected = self.read(name, spec)
+        if expected is None:
+            # Snapshots are committed per environment: one not recorded yet is no regression
+            pytest.skip(f"No snapshot '{name}' at: {self.snapshot_path(name)}. "
+                        f"Run pytest with --update-snapshots to record it.")
+        result = diff_snapshots(expected, actual)
+        if result:
+            allure.attach("\n".join([result.summary(), *result.lines()]), name=f"Snapshot diff: {name}",
+                          attachment_type=allure.attachment_type.TEXT)
+            message = "\n".join([f"Response differs from snapshot '{name}': {result.summary()}",
+                                 *result.lines(max_lines),
+                                 "Run pytest with --update-snapshots to accept the changes."])
+            pytest.fail(message)
+        return result
@@ -0,0 +1,66 @@
+import re
+import time
+from collections import defaultdict
+
+# A line of `python -X importtime` output: "import time:  self [us] | cumulative | imported package"
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+class StartupProfile:
+    """
+    Collects where the startup time of a pytest run goes: the collection, and the setup of every fixture
+    (enabled with --profile-startup, reported in the terminal summary).
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.started = clock()
+        self.collection_seconds = 0.0
+        self.first_test_at = None
+        self.fixtures = defaultdict(lambda: [0, 0.0])
+
+    def record_fixture(self, fixturedef, seconds: float):
+        """
+        Adds the setup time of a fixture. It does not include the setup of the fixtures it requests as arguments
+        (they are set up before it), only of the ones it requests with request.getfixturevalue().
+        """
+        entry = self.fixtures[f"{fixturedef.argname} ({fixturedef.scope})"]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def record_first_test(self):
+        """Marks the start of the first test, if it is not marked yet."""
+        if self.first_test_at is None:
+            self.first_test_at = self.clock()
+
+    def summary_lines(self, top: int = 15) -> list[str]:
+        """Returns the collection time, the time to the first test and the slowest fixture setups."""
+        lines = [f"Collection: {self.collection_seconds * 1000:.0f} ms"]
+        if self.first_test_at is not None:
+            lines.append(f"Time to first test (from configure): {(self.first_test_at - self.started) * 1000:.0f} ms")
+        slowest = sorted(self.fixtures.items(), key=lambda item: item[1][1], reverse=True)[:top]
+        if slowest:
+            lines.append(f"{'fixture setup':<40}{'count':>7}{'total ms':>11}")
+            for name, (count, seconds) in slowest:
+                lines.append(f"{name:<40}{count:>7}{seconds * 1000:>11.1f}")
+        return lines
+
+
+def parse_import_times(output: str) -> list[tuple[str, int, int]]:
+    """
+    Parses the stderr of `python -X importtime` into (module, self_us, cumulative_us) tuples.
+    """
+    imports = []
+    for line in output.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            imports.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return imports
+
+
+def import_time_by_package(imports: list[tuple[str, int, int]]) -> dict[str, int]:
+    """Returns the total self import time (us) of every top-level package, slowest first."""
+    totals = defaultdict(int)
+    for module, self_us, _ in imports:
+        totals[module.split(".")[0]] += self_us
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
@@ -0,0 +1,272 @@
+"""
+Cost-balanced scheduling of the tests across the pytest-xdist workers.
+
+Every run records, per test, its duration (setup + call + teardown), the number of API requests it made and the
+fingerprints of its cacheable requests into a local history file. With --balance-by-cost, the next runs split the
+tests into one bin per worker before they start:
+- tests sharing cacheable requests are kept in the same bin, so the response is fetched once and then served from
+  the worker's cache (a group is not grown beyond the ideal load of a worker, so it cannot unbalance the run),
+- tests marked with the same xdist_group are always kept in the same bin (e.g., a test asserting on the requests
+  of the tests before it),
+- the groups are assigned longest first to the least loaded bin (LPT), which keeps the slowest worker within 4/3 of
+  the best possible split.
+Each worker then runs one bin: CostBalancedScheduling (utils/cost_scheduling.py, so that the pytest-xdist scheduler
+is only imported when used) is the scheduler of -n with --balance-by-cost, and the workers report the xdist_group of
+the tests as a '@<group>' node id suffix, as with --dist loadgroup.
+"""
+import heapq
+import json
+import math
+import os
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# Names of the report user properties carrying the API requests of a test from the xdist workers
+REQUESTS_PROPERTY = "api_requests"
+FINGERPRINTS_PROPERTY = "api_request_fingerprints"
+
+
+@dataclass
+class CostSettings:
+    """
+    A data class to hold the settings of the test cost history used by the cost-balanced scheduling.
+    """
+    # History file, relative to the project root (an empty value disables the recording)
+    history_path: str = ".test_costs/history.json"
+    # Weight of the latest run in the recorded durations (exponential moving average)
+    smoothing: float = 0.5
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds the settings from a config.ini section, falling back to the defaults for missing keys.
+
+        :param config: The config.ini section of the target environment.
+        """
+        return cls(
+            history_path=config.get('test_cost_history_path', fallback=cls.history_path),
+            smoothing=config.getfloat('test_cost_smoothing', fallback=cls.smoothing),
+        )
+
+
+@dataclass(slots=True)
+class RecordedCost:
+    """A data class to hold the recorded cost of a test: duration in seconds, API requests and their fingerprints."""
+    duration: float
+    requests: int = 0
+    fingerprints: list[str] = field(default_factory=list)
+
+
+class CostHistory:
+    """
+    The recorded costs of the tests, by node id, kept in a JSON file across runs. It is read and written by the main
+    pytest process only: it plans the bins at the start of the session and records the run at the end of it.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, smoothing: float = 0.5):
+        """
+        Initializes the CostHistory, reading the file if it exists.
+
+        :param path: The history file.
+        :param smoothing: Weight of a new duration in the recorded one (1 keeps only the latest run).
+        """
+        self.path = Path(path)
+        self.smoothing = smoothing
+        self.costs: dict[str, RecordedCost] = self._read()
+
+    def __len__(self):
+        return len(self.costs)
+
+    def get(self, node_id) -> RecordedCost | None:
+        return self.costs.get(node_id)
+
+    def update(self, node_id, duration: float, requests: int = 0, fingerprints=()):
+        """
+        Records a run of a test: its duration is averaged with the recorded one, its requests replace them.
+
+        :param node_id: The node id of the test.
+        :param duration: The duration of the run (setup + call + teardown), in seconds.
+        :param requests: The number of API requests of the run.
+        :param fingerprints: The fingerprints of the cacheable API requests of the run.
+        """
+        recorded = self.costs.get(node_id)
+        if recorded is not None:
+            duration = self.smoothing * duration + (1 - self.smoothing) * recorded.duration
+        self.costs[node_id] = RecordedCost(duration, requests, sorted(fingerprints))
+
+    def default_duration(self) -> float:
+        """Returns the duration assumed for a test without history: the median recorded one (1s if none)."""
+        return statistics.median(cost.duration for cost in self.costs.values()) if self.costs else 1.0
+
+    def save(self):
+        """Writes the history (atomically, so a run starting meanwhile never reads a partial file)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({
+            "version": self.VERSION,
+            "tests": {node_id: {"duration": round(cost.duration, 6), "requests": cost.requests,
+                                "fingerprints": cost.fingerprints}
+                      for node_id, cost in sorted(self.costs.items())},
+        }, indent=1))
+        os.replace(tmp_path, self.path)
+
+    def _read(self) -> dict:
+        if not self.path.is_file():
+            return {}
+        content = json.loads(self.path.read_text())
+        # The history is only a scheduling hint: one of another version is started over
+        if content.get("version") != self.VERSION:
+            return {}
+        return {node_id: RecordedCost(**cost) for node_id, cost in content["tests"].items()}
+
+
+@dataclass
+class SchedulePlan:
+    """A data class to hold the bin of every test and the predicted load of every bin, in seconds."""
+    bins: dict[str, int]
+    loads: list[float]
+
+    @property
+    def makespan(self) -> float:
+        """Returns the predicted duration of the run: the load of the busiest bin."""
+        return max(self.loads, default=0.0)
+
+
+def xdist_group(node_id: str) -> str | None:
+    """Returns the xdist_group of a test from its node id ('<node id>@<group>'), if any."""
+    # Same rule as pytest-xdist: an '@' inside the parameters of a test is not a group suffix
+    return node_id.rsplit("@", 1)[1] if node_id.rfind("@") > node_id.rfind("]") else None
+
+
+def base_node_id(node_id: str) -> str:
+    """Returns the node id without its '@<group>' suffix, the key of the test in the CostHistory."""
+    return node_id if xdist_group(node_id) is None else node_id.rsplit("@", 1)[0]
+
+
+def _shared_request_groups(node_ids, history: CostHistory, durations: dict, max_cost: float) -> list[list[str]]:
+    """
+    Returns the tests grouped by xdist_group, then by shared cacheable requests (union-find over the fingerprints),
+    in collection order. Groups sharing requests are only merged if their total duration stays within max_cost.
+    """
+    parent = {node_id: node_id for node_id in node_ids}
+    group_cost = dict(durations)
+
+    def find(node_id):
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+
+    marked = defaultdict(list)
+    sharing = defaultdict(list)
+    for node_id in node_ids:
+        if (group := xdist_group(node_id)) is not None:
+            marked[group].append(node_id)
+        recorded = history.get(base_node_id(node_id))
+        for fingerprint in recorded.fingerprints if recorded else ():
+            sharing[fingerprint].append(node_id)
+
+    def union(node_id, other, max_cost=math.inf):
+        root, other_root = find(node_id), find(other)
+        if root != other_root and group_cost[root] + group_cost[other_root] <= max_cost:
+            parent[other_root] = root
+            group_cost[root] += group_cost[other_root]
+
+    for first, *others in marked.values():
+        for other in others:
+            union(first, other)
+    for fingerprint in sorted(sharing):
+        first, *others = sharing[fingerprint]
+        for other in others:
+            union(first, other, max_cost)
+
+    groups = defaultdict(list)
+    for node_id in node_ids:
+        groups[find(node_id)].append(node_id)
+    return list(groups.values())
+
+
+def plan_bins(node_ids, history: CostHistory, bins: int) -> SchedulePlan:
+    """
+    Splits the tests into bins of balanced predicted duration: the groups of tests sharing cacheable requests are
+    assigned longest first to the least loaded bin (tests marked with the same xdist_group are one group, whatever
+    its duration). Tests without history are assumed to take the median duration.
+
+    :param node_ids: The node ids of the tests, in collection order.
+    :param history: The recorded costs of the tests.
+    :param bins: The number of bins (xdist workers).
+    :return: The SchedulePlan.
+    """
+    node_ids = list(dict.fromkeys(node_ids))
+    default = history.default_duration()
+    durations = {node_id: recorded.duration if (recorded := history.get(base_node_id(node_id))) else default
+                 for node_id in node_ids}
+    max_cost = sum(durations.values()) / max(bins, 1)
+    groups = _shared_request_groups(node_ids, history, durations, max_cost)
+
+    loads = [(0.0, index) for index in range(max(bins, 1))]
+    plan = SchedulePlan(bins={}, loads=[0.0] * len(loads))
+    # Ties are broken by collection order, so the plan is deterministic
+    for group in sorted(groups, key=lambda group: -sum(durations[node_id] for node_id in group)):
+        load, index = heapq.heappop(loads)
+        load += sum(durations[node_id] for node_id in group)
+        plan.bins.update(dict.fromkeys(group, index))
+        plan.loads[index] = load
+        heapq.heappush(loads, (load, index))
+    return plan
+
+
+class CostRecorder:
+    """
+    Aggregates the test reports of a run (from every xdist worker) into the CostHistory: the duration of the
+    setup, call and teardown phases, and the API requests reported in the teardown report's user properties.
+    Only the tests that passed are recorded, as failures and skips do not take their usual time.
+    """
+
+    def __init__(self, history: CostHistory):
+        """
+        Initializes the CostRecorder.
+
+        :param history: The history to update.
+        """
+        self.history = history
+        self.worker_loads = defaultdict(float)
+        self._durations = defaultdict(float)
+        self._requests = {}
+        self._passed = set()
+
+    def add_report(self, report):
+        """Adds a setup, call or teardown report (pytest_runtest_logreport)."""
+        node_id = base_node_id(report.nodeid)
+        self._durations[node_id] += report.duration
+        # Reports coming from an xdist worker carry it as 'node'
+        worker = getattr(report, "node", None)
+        self.worker_loads[worker.gateway.id if worker is not None else "main"] += report.duration
+        if report.when == "call" and report.passed:
+            self._passed.add(node_id)
+        elif report.when == "teardown":
+            properties = dict(report.user_properties)
+            self._requests[node_id] = (properties.get(REQUESTS_PROPERTY, 0),
+                                       properties.get(FINGERPRINTS_PROPERTY, []))
+
+    def pytest_runtest_logreport(self, report):
+        """pytest hook (the recorder is registered as a plugin by the root conftest)."""
+        self.add_report(report)
+
+    def save(self) -> int:
+        """Updates and writes the history with the tests that passed. Returns how many were recorded."""
+        for node_id in self._passed:
+            requests, fingerprints = self._requests.get(node_id, (0, []))
+            self.history.update(node_id, self._durations[node_id], requests, fingerprints)
+        if self._passed:
+            self.history.save()
+        return len(self._passed)
+
+    def summary_lines(self) -> list[str]:
+        """Returns the busy time of every worker (how well the run was balanced)."""
+        loads = ", ".join(f"{worker} {seconds:.1f}s" for worker, seconds in sorted(self.worker_loads.items()))
+        return [f"Busy time per worker: {loads}"] if self.worker_loads else []